@@ -7,6 +7,8 @@ LLM_API_BASE = "http://127.0.0.1:1234/v1"
 LLM_MODEL = "qwen/qwen3-30b-a3b-2507"
 LLM_TEMPERATURE = 0.3  # Reduziert für maximale Konsistenz
 LLM_MAX_TOKENS = 25000  # Erhöhtes Token-Limit für vollständige Berichte
+LLM_DRAFT_MODEL = None  # Optionales Draft-Modell für Speculative Decoding (z.B. "qwen/qwen3-0.6b"), None = deaktiviert
+LLM_SEMANTIC_CACHE = False  # Semantischer Frage-Cache (lädt beim Start ein Embedding-Modell, benötigt sentence-transformers)
 
 # Analyse Einstellungen
 DEFAULT_PERIOD = "1y"  # Standard Zeitraum für Datenabfrage
@@ -7,6 +7,7 @@ import pandas as pd
 import plotly.graph_objects as go
 from datetime import datetime
 import json
+import html
 from typing import Dict, Any, Optional
 import base64
 from io import BytesIO
@@ -20,6 +21,169 @@ from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 import xlsxwriter
 
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+# Eingebettetes Stylesheet des HTML-Berichts (einmalig beim Import erzeugt)
+_CSS_BLOCK = """<style>
+    body {
+        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: #333;
+        margin: 0;
+        padding: 20px;
+    }
+    .container {
+        max-width: 1200px;
+        margin: 0 auto;
+        background: white;
+        border-radius: 10px;
+        box-shadow: 0 10px 30px rgba(0,0,0,0.2);
+        padding: 30px;
+    }
+    h1 {
+        color: #2c3e50;
+        border-bottom: 3px solid #3498db;
+        padding-bottom: 10px;
+    }
+    h2 {
+        color: #34495e;
+        margin-top: 30px;
+    }
+    .metric-grid {
+        display: grid;
+        grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+        gap: 20px;
+        margin: 20px 0;
+    }
+    .metric-card {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        padding: 20px;
+        border-radius: 10px;
+        text-align: center;
+    }
+    .metric-value {
+        font-size: 2em;
+        font-weight: bold;
+    }
+    .metric-label {
+        font-size: 0.9em;
+        opacity: 0.9;
+        margin-top: 5px;
+    }
+    table {
+        width: 100%;
+        border-collapse: collapse;
+        margin: 20px 0;
+    }
+    th, td {
+        padding: 12px;
+        text-align: left;
+        border-bottom: 1px solid #ddd;
+    }
+    th {
+        background-color: #3498db;
+        color: white;
+    }
+    tr:hover {
+        background-color: #f5f5f5;
+    }
+    .bullish {
+        color: #27ae60;
+        font-weight: bold;
+    }
+    .bearish {
+        color: #e74c3c;
+        font-weight: bold;
+    }
+    .targets-bullish td:last-child {
+        color: #27ae60;
+        font-weight: bold;
+    }
+    .targets-bearish td:last-child {
+        color: #e74c3c;
+        font-weight: bold;
+    }
+    .timestamp {
+        text-align: right;
+        color: #7f8c8d;
+        font-size: 0.9em;
+        margin-top: 20px;
+    }
+</style>"""
+
+
+def _autosize(writer, sheet_name: str, df: pd.DataFrame, index: bool = False) -> None:
+    """
+    Passt die Spaltenbreiten eines Excel-Blatts an den Inhalt des DataFrames an
+    
+    Args:
+        writer: Aktiver pd.ExcelWriter (xlsxwriter Engine)
+        sheet_name: Name des bereits geschriebenen Blatts
+        df: DataFrame, der in das Blatt geschrieben wurde
+        index: True wenn der Index als erste Spalte mitgeschrieben wurde
+    """
+    sheet = writer.sheets[sheet_name]
+    offset = 0
+    if index:
+        index_width = max((len(str(value)) for value in df.index), default=10)
+        sheet.set_column(0, 0, min(index_width, 40))
+        offset = 1
+    
+    for i, col in enumerate(df.columns):
+        content_width = df[col].astype(str).map(len).max() if len(df) else 10
+        sheet.set_column(i + offset, i + offset, min(max(len(str(col)), content_width), 40))
+
+
+def _style_header(writer, sheet_name: str, df: pd.DataFrame, header_format, index: bool = False) -> None:
+    """
+    Überschreibt die von pandas geschriebene Kopfzeile mit dem Header-Format
+    
+    pandas setzt für Kopfzellen ein eigenes Format, daher reicht set_row()
+    nicht aus - die Zellen werden mit demselben Inhalt neu geschrieben.
+    
+    Args:
+        writer: Aktiver pd.ExcelWriter (xlsxwriter Engine)
+        sheet_name: Name des bereits geschriebenen Blatts
+        df: DataFrame, der in das Blatt geschrieben wurde
+        header_format: xlsxwriter Format für die Kopfzeile
+        index: True wenn der Index als erste Spalte mitgeschrieben wurde
+    """
+    sheet = writer.sheets[sheet_name]
+    offset = 1 if index else 0
+    if index:
+        sheet.write(0, 0, df.index.name or '', header_format)
+    for i, col in enumerate(df.columns):
+        sheet.write(0, i + offset, str(col), header_format)
+
+
+def _signal_class(text: str) -> str:
+    """CSS-Klasse für ein Signal: 'bullish', 'bearish' oder leer"""
+    if 'Bullish' in text:
+        return 'bullish'
+    if 'Bearish' in text:
+        return 'bearish'
+    return ''
+
+
+def _colored_table_html(df: pd.DataFrame, signal_column: str, classes: str) -> str:
+    """
+    Rendert eine Tabelle als HTML und färbt die Zellen der Signal-Spalte über .bullish/.bearish
+    Alle Zellen werden vorab escaped, damit die eingefügten <span>-Tags unverändert bleiben
+    """
+    cells = df.astype(object).where(df.notna(), 'N/A').astype(str).apply(lambda column: column.map(html.escape))
+    cells[signal_column] = [
+        f'<span class="{css}">{text}</span>' if css else text
+        for text, css in zip(cells[signal_column], df[signal_column].fillna('').astype(str).map(_signal_class))
+    ]
+    return cells.to_html(index=False, classes=classes, border=0, escape=False)
+
+
 class ReportExporter:
     """
     Klasse zum Exportieren von Analyseberichten in verschiedene Formate
@@ -35,7 +199,9 @@ class ReportExporter:
         """
         self.data = analysis_data
         self.language = language
-        self.timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        now = datetime.now()
+        self.timestamp = now.strftime('%Y%m%d_%H%M%S')
+        self.timestamp_display = now.strftime('%Y-%m-%d %H:%M:%S')
         
     def export_to_excel(self, filename: Optional[str] = None) -> str:
         """
@@ -64,16 +230,6 @@ class ReportExporter:
                 'border': 1
             })
             
-            number_format = workbook.add_format({
-                'num_format': '#,##0.00',
-                'border': 1
-            })
-            
-            percent_format = workbook.add_format({
-                'num_format': '0.00%',
-                'border': 1
-            })
-            
             # 1. Übersichtsblatt
             overview_data = {
                 'Metric': ['Current Price', 'Daily Change', 'Volume', 'RSI', 'Market Sentiment'],
@@ -87,11 +243,15 @@ class ReportExporter:
             }
             overview_df = pd.DataFrame(overview_data)
             overview_df.to_excel(writer, sheet_name='Overview', index=False)
+            _style_header(writer, 'Overview', overview_df, header_format)
+            _autosize(writer, 'Overview', overview_df)
             
             # 2. Kursdaten
             if 'data' in self.data:
                 price_df = pd.DataFrame(self.data['data'])
                 price_df.to_excel(writer, sheet_name='Price Data')
+                _style_header(writer, 'Price Data', price_df, header_format, index=True)
+                _autosize(writer, 'Price Data', price_df, index=True)
             
             # 3. Technische Indikatoren
             if 'indicators' in self.data:
@@ -111,31 +271,42 @@ class ReportExporter:
                 
                 indicators_df = pd.DataFrame(indicators_list)
                 indicators_df.to_excel(writer, sheet_name='Indicators', index=False)
+                _style_header(writer, 'Indicators', indicators_df, header_format)
+                _autosize(writer, 'Indicators', indicators_df)
             
             # 4. Wahrscheinlichkeiten
             if 'probabilities' in self.data:
-                prob_df = pd.DataFrame([self.data['probabilities']])
-                prob_df.to_excel(writer, sheet_name='Probabilities', index=False)
+                # Eine einzelne Zeile - direkt schreiben statt über einen DataFrame
+                prob_sheet = workbook.add_worksheet('Probabilities')
+                for col, (key, value) in enumerate(self.data['probabilities'].items()):
+                    prob_sheet.write(0, col, key, header_format)
+                    prob_sheet.write(1, col, value, cell_format)
+                    prob_sheet.set_column(col, col, min(max(len(str(key)), len(str(value))), 40))
             
             # 5. Kursziele
             if 'targets' in self.data:
-                bullish_df = pd.DataFrame(self.data['targets'].get('bullish', []))
-                bearish_df = pd.DataFrame(self.data['targets'].get('bearish', []))
+                bullish = self.data['targets'].get('bullish')
+                bearish = self.data['targets'].get('bearish')
                 
-                if not bullish_df.empty:
+                if bullish:
+                    bullish_df = pd.DataFrame(bullish)
                     bullish_df.to_excel(writer, sheet_name='Bullish Targets', index=False)
-                if not bearish_df.empty:
+                    _style_header(writer, 'Bullish Targets', bullish_df, header_format)
+                    _autosize(writer, 'Bullish Targets', bullish_df)
+                if bearish:
+                    bearish_df = pd.DataFrame(bearish)
                     bearish_df.to_excel(writer, sheet_name='Bearish Targets', index=False)
+                    _style_header(writer, 'Bearish Targets', bearish_df, header_format)
+                    _autosize(writer, 'Bearish Targets', bearish_df)
             
             # 6. Candlestick Patterns
             if 'patterns' in self.data:
-                patterns_df = pd.DataFrame(self.data['patterns'])
-                if not patterns_df.empty:
+                patterns = self.data['patterns']
+                if patterns:
+                    patterns_df = pd.DataFrame(patterns)
                     patterns_df.to_excel(writer, sheet_name='Candlestick Patterns', index=False)
-            
-            # Formatierung anpassen
-            for sheet in writer.sheets.values():
-                sheet.set_column('A:Z', 15)
+                    _style_header(writer, 'Candlestick Patterns', patterns_df, header_format)
+                    _autosize(writer, 'Candlestick Patterns', patterns_df)
         
         return filename
     
@@ -146,97 +317,19 @@ class ReportExporter:
         if filename is None:
             filename = f"{self.data['ticker']}_analysis_{self.timestamp}.html"
         
-        html_content = f"""
+        html_parts = [f"""
         <!DOCTYPE html>
         <html lang="{self.language}">
         <head>
             <meta charset="UTF-8">
             <meta name="viewport" content="width=device-width, initial-scale=1.0">
             <title>{self.data['ticker']} Analysis Report</title>
-            <style>
-                body {{
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: #333;
-                    margin: 0;
-                    padding: 20px;
-                }}
-                .container {{
-                    max-width: 1200px;
-                    margin: 0 auto;
-                    background: white;
-                    border-radius: 10px;
-                    box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-                    padding: 30px;
-                }}
-                h1 {{
-                    color: #2c3e50;
-                    border-bottom: 3px solid #3498db;
-                    padding-bottom: 10px;
-                }}
-                h2 {{
-                    color: #34495e;
-                    margin-top: 30px;
-                }}
-                .metric-grid {{
-                    display: grid;
-                    grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                    gap: 20px;
-                    margin: 20px 0;
-                }}
-                .metric-card {{
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    padding: 20px;
-                    border-radius: 10px;
-                    text-align: center;
-                }}
-                .metric-value {{
-                    font-size: 2em;
-                    font-weight: bold;
-                }}
-                .metric-label {{
-                    font-size: 0.9em;
-                    opacity: 0.9;
-                    margin-top: 5px;
-                }}
-                table {{
-                    width: 100%;
-                    border-collapse: collapse;
-                    margin: 20px 0;
-                }}
-                th, td {{
-                    padding: 12px;
-                    text-align: left;
-                    border-bottom: 1px solid #ddd;
-                }}
-                th {{
-                    background-color: #3498db;
-                    color: white;
-                }}
-                tr:hover {{
-                    background-color: #f5f5f5;
-                }}
-                .bullish {{
-                    color: #27ae60;
-                    font-weight: bold;
-                }}
-                .bearish {{
-                    color: #e74c3c;
-                    font-weight: bold;
-                }}
-                .timestamp {{
-                    text-align: right;
-                    color: #7f8c8d;
-                    font-size: 0.9em;
-                    margin-top: 20px;
-                }}
-            </style>
+            {_CSS_BLOCK}
         </head>
         <body>
             <div class="container">
                 <h1>📈 {self.data['ticker']} Technical Analysis Report</h1>
-                <p class="timestamp">Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+                <p class="timestamp">Generated: {self.timestamp_display}</p>
                 
                 <h2>📊 Overview</h2>
                 <div class="metric-grid">
@@ -259,101 +352,44 @@ class ReportExporter:
                 </div>
                 
                 <h2>🎯 Probabilities</h2>
-                <table>
-                    <tr>
-                        <th>Scenario</th>
-                        <th>Probability</th>
-                        <th>Signals</th>
-                    </tr>
-                    <tr>
-                        <td class="bullish">Bullish</td>
-                        <td>{self.data.get('probabilities', {}).get('bullish_probability', 'N/A')}%</td>
-                        <td>{self.data.get('probabilities', {}).get('bullish_signals', 'N/A')}</td>
-                    </tr>
-                    <tr>
-                        <td class="bearish">Bearish</td>
-                        <td>{self.data.get('probabilities', {}).get('bearish_probability', 'N/A')}%</td>
-                        <td>{self.data.get('probabilities', {}).get('bearish_signals', 'N/A')}</td>
-                    </tr>
-                </table>
-                
-                <h2>📍 Price Targets</h2>
-                <h3>Bullish Targets</h3>
-                <table>
-                    <tr>
-                        <th>Level</th>
-                        <th>Price</th>
-                        <th>Distance</th>
-                    </tr>
-        """
+        """]
         
-        # Bullische Ziele hinzufügen
-        if 'targets' in self.data and 'bullish' in self.data['targets']:
-            for target in self.data['targets']['bullish'][:5]:
-                html_content += f"""
-                    <tr>
-                        <td>{target.get('level', 'N/A')}</td>
-                        <td>${target.get('price', 'N/A')}</td>
-                        <td class="bullish">+{target.get('distance', 'N/A')}%</td>
-                    </tr>
-                """
+        # Tabellen über pandas rendern (inkl. HTML-Escaping der Zellinhalte)
+        probabilities = self.data.get('probabilities', {})
+        prob_df = pd.DataFrame({
+            'Scenario': ['Bullish', 'Bearish'],
+            'Probability': [f"{probabilities.get('bullish_probability', 'N/A')}%",
+                            f"{probabilities.get('bearish_probability', 'N/A')}%"],
+            'Signals': [probabilities.get('bullish_signals', 'N/A'),
+                        probabilities.get('bearish_signals', 'N/A')]
+        })
+        html_parts.append(_colored_table_html(prob_df, 'Scenario', classes='probabilities'))
         
-        html_content += """
-                </table>
-                
+        # Kursziele
+        targets = self.data.get('targets') or {}
+        html_parts.append("""
+                <h2>📍 Price Targets</h2>
+                <h3>Bullish Targets</h3>
+        """)
+        html_parts.append(self._targets_to_html(targets.get('bullish', []), 'targets-bullish', '+'))
+        html_parts.append("""
                 <h3>Bearish Targets</h3>
-                <table>
-                    <tr>
-                        <th>Level</th>
-                        <th>Price</th>
-                        <th>Distance</th>
-                    </tr>
-        """
+        """)
+        html_parts.append(self._targets_to_html(targets.get('bearish', []), 'targets-bearish'))
         
-        # Bearische Ziele hinzufügen
-        if 'targets' in self.data and 'bearish' in self.data['targets']:
-            for target in self.data['targets']['bearish'][:5]:
-                html_content += f"""
-                    <tr>
-                        <td>{target.get('level', 'N/A')}</td>
-                        <td>${target.get('price', 'N/A')}</td>
-                        <td class="bearish">{target.get('distance', 'N/A')}%</td>
-                    </tr>
-                """
-        
-        html_content += """
-                </table>
-                
+        html_parts.append("""
                 <h2>🕯️ Candlestick Patterns</h2>
-        """
+        """)
         
         if 'patterns' in self.data and self.data['patterns']:
-            html_content += """
-                <table>
-                    <tr>
-                        <th>Date</th>
-                        <th>Pattern</th>
-                        <th>Signal</th>
-                        <th>Reliability</th>
-                    </tr>
-            """
-            
-            for pattern in self.data['patterns'][-10:]:  # Letzte 10 Muster
-                signal_class = 'bullish' if 'Bullish' in pattern.get('signal', '') else 'bearish' if 'Bearish' in pattern.get('signal', '') else ''
-                html_content += f"""
-                    <tr>
-                        <td>{pattern.get('date', 'N/A')}</td>
-                        <td>{pattern.get('pattern', 'N/A')}</td>
-                        <td class="{signal_class}">{pattern.get('signal', 'N/A')}</td>
-                        <td>{pattern.get('reliability', 'N/A')}</td>
-                    </tr>
-                """
-            
-            html_content += "</table>"
+            patterns_df = pd.DataFrame(self.data['patterns'][-10:])  # Letzte 10 Muster
+            patterns_df = patterns_df.reindex(columns=['date', 'pattern', 'signal', 'reliability'])
+            patterns_df.columns = ['Date', 'Pattern', 'Signal', 'Reliability']
+            html_parts.append(_colored_table_html(patterns_df, 'Signal', classes='patterns'))
         else:
-            html_content += "<p>No patterns detected</p>"
+            html_parts.append("<p>No patterns detected</p>")
         
-        html_content += """
+        html_parts.append("""
                 <div class="timestamp">
                     <p>Report generated by Advanced Index Analyser with AI</p>
                     <p>Disclaimer: This analysis is for informational purposes only and does not constitute investment advice.</p>
@@ -361,14 +397,39 @@ class ReportExporter:
             </div>
         </body>
         </html>
-        """
+        """)
         
         # HTML-Datei speichern
         with open(filename, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            f.write(''.join(html_parts))
         
         return filename
     
+    def _targets_to_html(self, targets: list, css_class: str, sign: str = '') -> str:
+        """
+        Rendert bis zu fünf Kursziele als HTML-Tabelle
+        
+        Args:
+            targets: Liste von Kurszielen mit 'level', 'price' und 'distance'
+            css_class: CSS-Klasse der Tabelle
+            sign: Vorzeichen, das der Distanz vorangestellt wird
+        """
+        if not targets:
+            return "<p>No targets available</p>"
+        
+        targets_df = pd.DataFrame(targets[:5]).reindex(columns=['level', 'price', 'distance'])
+        targets_df.columns = ['Level', 'Price', 'Distance']
+        return targets_df.to_html(
+            index=False,
+            classes=css_class,
+            border=0,
+            na_rep='N/A',
+            formatters={
+                'Price': lambda v: 'N/A' if pd.isna(v) else f"${v}",
+                'Distance': lambda v: 'N/A' if pd.isna(v) else f"{sign}{v}%"
+            }
+        )
+    
     def export_to_json(self, filename: Optional[str] = None) -> str:
         """
         Exportiert die Analyse als JSON
@@ -384,6 +445,34 @@ class ReportExporter:
         
         return filename
     
+    def _frame_to_records(self, df: pd.DataFrame) -> list:
+        """
+        Wandelt einen DataFrame in JSON-serialisierbare Zeilen um
+        Zeitstempel und NaN werden spaltenweise umgewandelt statt Zelle für Zelle
+        """
+        import numpy as np
+        
+        columns = {}
+        for name, column in df.items():
+            if pd.api.types.is_datetime64_any_dtype(column):
+                if getattr(column.dt, 'tz', None) is None:
+                    text = np.datetime_as_string(column.to_numpy(), unit='s')
+                    column = pd.Series(text, index=column.index, dtype=object).where(column.notna(), None)
+                else:
+                    column = column.map(pd.Timestamp.isoformat, na_action='ignore').astype(object).where(column.notna(), None)
+            elif pd.api.types.is_float_dtype(column):
+                column = column.astype(object).where(column.notna(), None)
+            columns[name] = column
+        frame = pd.DataFrame(columns, index=df.index, copy=False)
+        
+        # PyArrow wandelt spaltenweise in C++ um; bei gemischten Objektspalten zurück auf to_dict
+        if PYARROW_AVAILABLE:
+            try:
+                return pa.Table.from_pandas(frame, preserve_index=False).to_pylist()
+            except pa.ArrowException:
+                pass
+        return frame.to_dict('records')
+
     def _convert_to_serializable(self, obj: Any) -> Any:
         """
         Konvertiert Objekte in JSON-serialisierbare Formate
@@ -401,7 +490,7 @@ class ReportExporter:
         elif isinstance(obj, np.ndarray):
             return obj.tolist()
         elif isinstance(obj, pd.DataFrame):
-            return obj.to_dict('records')
+            return self._frame_to_records(obj)
         elif isinstance(obj, pd.Series):
             return obj.to_dict()
         elif isinstance(obj, (pd.Timestamp, datetime)):
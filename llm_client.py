@@ -2,9 +2,17 @@
 Enhanced LLM Client für strukturierte und konsistente Berichtsgenerierung
 """
 
+import asyncio
+import hashlib
+import itertools
 import json
+import math
+import string
+import threading
 import warnings
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional
 from datetime import datetime
 import httpx
 import pandas as pd
@@ -13,28 +21,843 @@ import numpy as np
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
 try:
-    from openai import OpenAI
+    from openai import OpenAI, AsyncOpenAI
     OPENAI_V1 = True
 except ImportError:
     import openai
     OPENAI_V1 = False
 
-from config import LLM_API_BASE, LLM_MODEL, LLM_TEMPERATURE, LLM_MAX_TOKENS
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Ersatz ohne numba: gibt die Funktion unverändert zurück"""
+        def decorator(func):
+            return func
+        return decorator
+
+try:
+    import h2  # noqa: F401 - wird von httpx für HTTP/2 benötigt
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+from config import LLM_API_BASE, LLM_MODEL, LLM_TEMPERATURE, LLM_MAX_TOKENS, LLM_DRAFT_MODEL, LLM_SEMANTIC_CACHE
+
+# Antwort-Cache: Anzahl gespeicherter Antworten und maximale Temperatur für gecachte Anfragen
+_RESPONSE_CACHE_SIZE = 64
+_RESPONSE_CACHE_MAX_TEMPERATURE = 0.5
+
+# Semantischer Cache für Fragen: Embedding-Modell, Mindest-Ähnlichkeit und Größenbegrenzung
+_SEMANTIC_CACHE_MODEL = 'all-MiniLM-L6-v2'
+_SEMANTIC_CACHE_THRESHOLD = 0.95
+_SEMANTIC_CACHE_CONTEXTS = 16
+_SEMANTIC_CACHE_ENTRIES = 32
+
+# Gemeinsame Verbindungs-Einstellungen für den synchronen und den asynchronen HTTP-Client
+_HTTP_TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+_HTTP_MAX_CONNECTIONS = 16
+_HTTP_KEEPALIVE_CONNECTIONS = 8
+_HTTP_KEEPALIVE_EXPIRY = 300
+
+# Felder der Analyse, die tatsächlich in den Bericht-Prompt einfließen
+_REPORT_KEYS = ('ticker', 'current_price', 'indicators', 'probabilities', 'price_targets', 'support_resistance')
+
+# System-Nachrichten und Prompt-Vorlagen für den Marktbericht (einmalig beim Import erstellt)
+_REPORT_SYSTEM_MESSAGES = {
+    'de': "Du bist ein professioneller Finanzanalyst. Erstelle konsistente, datenbasierte Berichte ohne Widersprüche. Verwende IMMER die bereitgestellten Daten.",
+    'en': "You are a professional financial analyst. Create consistent, data-driven reports without contradictions. ALWAYS use the provided data."
+}
+
+_REPORT_PROMPT_TEMPLATES = {
+    'de': """
+            Erstelle einen professionellen, technischen Analysebericht für {ticker}.
+            
+            WICHTIG - Verwende NUR diese validierten Daten:
+            
+            Ticker: {ticker}
+            Aktueller Kurs: ${current_price:.2f}
+            
+            VALIDIERTE INDIKATOREN (nutze exakt diese Werte):
+            {indicators}
+            
+            WAHRSCHEINLICHKEITEN:
+            {probabilities}
+            
+            KURSZIELE:
+            {price_targets}
+            
+            SUPPORT/RESISTANCE:
+            {support_resistance}
+            
+            MARKTRICHTUNG (konsistent verwenden):
+            - Primäre Richtung: {primary}
+            - Empfehlung: {recommendation}
+            - Stärke: {strength}/10
+            
+            ANFORDERUNGEN:
+            1. Verwende EXAKT die oben genannten Indikatorwerte - keine eigenen Berechnungen
+            2. Sei KONSISTENT - wenn die Marktrichtung {primary} ist, 
+               müssen alle Abschnitte diese Einschätzung unterstützen
+            3. Keine Widersprüche zwischen verschiedenen Abschnitten
+            4. Formatiere Zahlen korrekt: $23,415.42 (mit Komma als Tausendertrennzeichen)
+            5. ATR für Stop-Loss verwenden: {atr}
+            6. Nutze die tatsächlichen Support/Resistance Levels aus den Daten
+            7. Strukturiere den Bericht mit klaren Überschriften
+            8. Gib konkrete, umsetzbare Trading-Empfehlungen
+            9. Vermeide Spekulationen - basiere alles auf den gegebenen Daten
+            10. Erwähne explizit, dass alle Werte aus der technischen Analyse stammen
+            
+            STRUKTUR:
+            1. Executive Summary (Marktübersicht, konsistente Einschätzung)
+            2. Technische Indikatoren (mit den exakten Werten)
+            3. Trading-Setup (Entry, Stop-Loss mit ATR, Targets)
+            4. Risikomanagement 
+            5. Handlungsempfehlungen
+            6. Zusammenfassung
+            
+            Erstelle einen professionellen Bericht in deutscher Sprache.
+            """,
+    'en': """
+            Create a professional, technical analysis report for {ticker}.
+            
+            IMPORTANT - Use ONLY these validated data:
+            
+            Ticker: {ticker}
+            Current Price: ${current_price:.2f}
+            
+            VALIDATED INDICATORS (use exactly these values):
+            {indicators}
+            
+            PROBABILITIES:
+            {probabilities}
+            
+            PRICE TARGETS:
+            {price_targets}
+            
+            SUPPORT/RESISTANCE:
+            {support_resistance}
+            
+            MARKET DIRECTION (use consistently):
+            - Primary Direction: {primary}
+            - Recommendation: {recommendation}
+            - Strength: {strength}/10
+            
+            REQUIREMENTS:
+            1. Use EXACTLY the indicator values mentioned above - no custom calculations
+            2. Be CONSISTENT - if market direction is {primary}, 
+               all sections must support this assessment
+            3. No contradictions between different sections
+            4. Format numbers correctly: $23,415.42 (with comma as thousands separator)
+            5. Use ATR for Stop-Loss: {atr}
+            6. Use actual Support/Resistance levels from the data
+            7. Structure the report with clear headings
+            8. Provide specific, actionable trading recommendations
+            9. Avoid speculation - base everything on given data
+            10. Explicitly mention that all values come from technical analysis
+            
+            STRUCTURE:
+            1. Executive Summary (Market overview, consistent assessment)
+            2. Technical Indicators (with exact values)
+            3. Trading Setup (Entry, Stop-Loss with ATR, Targets)
+            4. Risk Management
+            5. Action Items
+            6. Summary
+            
+            Create a professional report in English.
+            """
+}
+
+# Regeln für die Indikator-Validierung (Reihenfolge bestimmt die Reihenfolge im Prompt)
+_SCALAR_RULES = {
+    'RSI': (2, lambda v: 0 <= v <= 100),
+    'ATR': (2, lambda v: v > 0)
+}
+
+_NESTED_ROUNDING = {
+    'MACD': (('macd', 4), ('signal', 4), ('histogram', 4)),
+    'Stochastic': (('K', 2), ('D', 2)),
+    'Bollinger': (('upper', 2), ('middle', 2), ('lower', 2), ('width', 2))
+}
+
+_VALIDATION_ORDER = (
+    'RSI', 'MACD', 'ATR', 'moving_averages', 'Stochastic',
+    'ADX', 'CCI', 'MFI', 'OBV', 'VWAP', 'Williams_R', 'CMF', 'ROC',
+    'Bollinger', 'Pivots'
+)
+
+
+def _round_or_none(value: Any, digits: int) -> Any:
+    """Rundet einen Wert, None bleibt None"""
+    return round(value, digits) if value is not None else None
+
+
+@njit(cache=True)
+def _direction_score(rsi: float, macd_hist: float, bullish_prob: float, bearish_prob: float) -> int:
+    """Berechnet den Richtungs-Score aus RSI, MACD-Histogramm und Wahrscheinlichkeiten (NaN = nicht vorhanden)"""
+    score = 0
+    
+    if rsi == rsi:
+        if rsi > 70:
+            score -= 2
+        elif rsi > 50:
+            score += 1
+        elif rsi < 30:
+            score += 2
+        else:
+            score -= 1
+    
+    if macd_hist == macd_hist:
+        if macd_hist > 0:
+            score += 2
+        else:
+            score -= 2
+    
+    if bullish_prob > bearish_prob * 1.5:
+        score += 2
+    elif bearish_prob > bullish_prob * 1.5:
+        score -= 2
+    
+    return score
+
+
+@njit(cache=True)
+def _classify_probabilities(bullish: np.ndarray, bearish: np.ndarray, neutral: np.ndarray) -> np.ndarray:
+    """Klassifiziert Wahrscheinlichkeits-Tripel (0 = Konsolidierung, 1 = bullisch, 2 = bearisch, 3 = ausgewogen)"""
+    codes = np.empty(bullish.shape[0], dtype=np.int8)
+    for i in range(bullish.shape[0]):
+        if neutral[i] > 50:
+            codes[i] = 0
+        elif bullish[i] > bearish[i] * 1.5:
+            codes[i] = 1
+        elif bearish[i] > bullish[i] * 1.5:
+            codes[i] = 2
+        else:
+            codes[i] = 3
+    return codes
+
+
+@njit(cache=True)
+def _recommend_probabilities(bullish: np.ndarray, bearish: np.ndarray, neutral: np.ndarray) -> np.ndarray:
+    """Empfehlungscode je Wahrscheinlichkeits-Tripel (0 = abwarten, 1 = kaufen, 2 = verkaufen, 3 = vorsichtig)"""
+    codes = np.empty(bullish.shape[0], dtype=np.int8)
+    for i in range(bullish.shape[0]):
+        if neutral[i] > 50:
+            codes[i] = 0
+        elif bullish[i] > 60:
+            codes[i] = 1
+        elif bearish[i] > 60:
+            codes[i] = 2
+        else:
+            codes[i] = 3
+    return codes
+
+
+def warmup_kernels() -> None:
+    """Kompiliert die JIT-Kernel vorab mit kleinen Testdaten (ohne Numba wirkungslos)"""
+    if not NUMBA_AVAILABLE:
+        return
+    sample = np.array([40.0], dtype=np.float64)
+    _direction_score(55.0, 0.1, 40.0, 30.0)
+    _direction_score(np.nan, np.nan, 40.0, 30.0)
+    _classify_probabilities(sample, sample, sample)
+    _recommend_probabilities(sample, sample, sample)
+
+
+_PROBABILITY_INTERPRETATIONS = (
+    "Die hohe Neutralität deutet auf eine Konsolidierungsphase hin. Der Markt zeigt keine klare Richtung.",
+    "Bullische Signale dominieren deutlich. Der Markt zeigt Aufwärtspotential.",
+    "Bearische Signale dominieren. Vorsicht ist geboten.",
+    "Die Signale sind ausgewogen. Keine klare Tendenz erkennbar."
+)
+
+_PROBABILITY_RECOMMENDATIONS = (
+    "**ABWARTEN** und beobachten",
+    "**KAUFEN** - Bullische Signale überwiegen",
+    "**VERKAUFEN** - Bearische Signale überwiegen",
+    "**VORSICHTIG AGIEREN** - Keine eindeutige Richtung"
+)
+
+
+def _truncate_for_prompt(obj: Any, max_items: int = 10) -> Any:
+    """Kürzt Listen und Dicts (auch verschachtelt) auf die ersten max_items Einträge"""
+    if isinstance(obj, dict):
+        return {k: _truncate_for_prompt(v, max_items) for k, v in list(obj.items())[:max_items]}
+    if isinstance(obj, (list, tuple)):
+        return [_truncate_for_prompt(item, max_items) for item in obj[:max_items]]
+    return obj
+
+
+def _format_levels(levels: Any, max_items: int = 5) -> str:
+    """Formatiert die ersten max_items Kursmarken kompakt für den Prompt"""
+    return ', '.join(f"{level:.2f}" for level in itertools.islice(() if levels is None else levels, max_items))
+
+
+def _dumps_bytes(obj: Any, indent: bool = True) -> bytes:
+    """Serialisiert Daten als UTF-8-JSON für Prompts (orjson wenn verfügbar)"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=str, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, default=str).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def _dumps(obj: Any, indent: bool = True) -> str:
+    """Serialisiert Daten als JSON für Prompts; ohne Einrückung für kompakte Datenblöcke"""
+    return _dumps_bytes(obj, indent).decode('utf-8')
+
+
+def _compile_template(template: str) -> tuple:
+    """Zerlegt eine str.format-Vorlage in vorab kodierte Textstücke und Platzhalter"""
+    return tuple((literal.encode('utf-8'), field, spec)
+                 for literal, field, spec, _ in string.Formatter().parse(template))
+
+
+def _render_prompt(chunks: tuple, values: Dict[str, Any]) -> str:
+    """Setzt einen Prompt in einem Puffer zusammen; bytes-Werte (z.B. JSON) werden direkt übernommen"""
+    buf = bytearray()
+    for literal, field, spec in chunks:
+        buf += literal
+        if field is None:
+            continue
+        value = values[field]
+        if isinstance(value, (bytes, bytearray)):
+            buf += value
+        else:
+            buf += format(value, spec).encode('utf-8')
+    return buf.decode('utf-8')
+
+
+_REPORT_PROMPT_CHUNKS = {language: _compile_template(template) for language, template in _REPORT_PROMPT_TEMPLATES.items()}
+
+
+# Statische Anweisungen der Einzelanalysen. Sie stehen vor den variablen Daten,
+# damit der Prompt-Anfang bei jedem Aufruf identisch ist und der Server ihn wiederverwenden kann.
+_INDICATOR_SYSTEM = {
+    'de': "Du bist ein technischer Analyst. Verwende IMMER die exakten Werte aus den Daten.",
+    'en': "You are a technical analyst. ALWAYS use the exact values from the data."
+}
+
+_INDICATOR_INSTRUCTIONS = {
+    'de': """Analysiere die unten stehenden technischen Indikatoren für eine professionelle Trading-Entscheidung.
+
+Erstelle eine strukturierte Analyse mit:
+1. Marktrichtung und Trend (basierend auf den Daten)
+2. Konkrete Entry/Exit Punkte mit Preisen
+3. Stop-Loss Empfehlung mit ATR-Begründung (ATR siehe Daten)
+4. Risk/Reward Verhältnis
+
+WICHTIG:
+- Verwende NUR die gegebenen Indikatorwerte
+- Sei konsistent in deiner Einschätzung
+- Keine erfundenen Zahlen
+- Formatiere Preise als $X,XXX.XX""",
+    'en': """Analyze the technical indicators below for a professional trading decision.
+
+Create a structured analysis with:
+1. Market direction and trend (based on the data)
+2. Specific entry/exit points with prices
+3. Stop-loss recommendation with ATR reasoning (ATR see data)
+4. Risk/Reward ratio
+
+IMPORTANT:
+- Use ONLY the given indicator values
+- Be consistent in your assessment
+- No invented numbers
+- Format prices as $X,XXX.XX"""
+}
+
+_PROBABILITY_SYSTEM = {
+    'de': "Du bist ein Risikoanalyst. Basiere deine Empfehlungen auf den gegebenen Wahrscheinlichkeiten.",
+    'en': "You are a risk analyst. Base your recommendations on the given probabilities."
+}
+
+_PROBABILITY_INSTRUCTIONS = {
+    'de': """Analysiere die unten stehenden Wahrscheinlichkeiten für eine Trading-Strategie.
+
+Gib konkrete Handelsempfehlungen mit:
+1. Positionierung (Long/Short/Neutral) basierend auf den Wahrscheinlichkeiten
+2. Einstiegsstrategie
+3. Gewinnmitnahme-Plan mit den gegebenen Kurszielen
+4. Risikomanagement
+
+WICHTIG:
+- Interpretiere die Wahrscheinlichkeiten korrekt
+- Nutze die tatsächlichen Kursziele aus den Daten
+- Sei konsistent mit dem Sentiment""",
+    'en': """Analyze the probabilities below for a trading strategy.
+
+Provide specific trading recommendations with:
+1. Positioning (Long/Short/Neutral) based on probabilities
+2. Entry strategy
+3. Profit-taking plan with the given price targets
+4. Risk management
+
+IMPORTANT:
+- Interpret probabilities correctly
+- Use actual price targets from the data
+- Be consistent with the sentiment"""
+}
+
+_LEVELS_SYSTEM = {
+    'de': "Du bist ein technischer Analyst spezialisiert auf Fibonacci und Support/Resistance. Verwende IMMER die exakten Level aus den Daten.",
+    'en': "You are a technical analyst specialized in Fibonacci and Support/Resistance. ALWAYS use the exact levels from the data."
+}
+
+_LEVELS_INSTRUCTIONS = {
+    'de': """Analysiere die unten stehenden technischen Level für präzises Trading.
+
+Identifiziere:
+1. Kritische Support/Resistance Zonen mit exakten Preisen aus den Daten
+2. Confluence-Bereiche (wo mehrere Level zusammentreffen)
+3. Trading-Strategien für jede Zone
+4. Entry/Exit/Stop-Loss Punkte mit konkreten Preisen
+5. Breakout/Breakdown Szenarien
+
+WICHTIG:
+- Verwende NUR die gegebenen Level
+- Keine erfundenen Preise
+- Formatiere als $X,XXX.XX
+- Beziehe dich auf die tatsächlichen Support/Resistance aus den Daten""",
+    'en': """Analyze the technical levels below for precise trading.
+
+Identify:
+1. Critical Support/Resistance zones with exact prices from the data
+2. Confluence areas (where multiple levels converge)
+3. Trading strategies for each zone
+4. Entry/Exit/Stop-Loss points with specific prices
+5. Breakout/Breakdown scenarios
+
+IMPORTANT:
+- Use ONLY the given levels
+- No invented prices
+- Format as $X,XXX.XX
+- Reference actual Support/Resistance from the data"""
+}
+
+_QUESTION_SYSTEM = {
+    'de': "Du bist ein hilfreicher Trading-Assistent. Beantworte Fragen basierend auf den technischen Daten.",
+    'en': "You are a helpful trading assistant. Answer questions based on the technical data."
+}
+
+_QUESTION_INSTRUCTIONS = {
+    'de': """Beantworte die unten stehende Frage basierend auf der technischen Analyse.
+
+ANWEISUNGEN:
+- Gib eine kurze, präzise Antwort basierend auf den Daten
+- Verwende die tatsächlichen Werte aus der Analyse
+- Sei ehrlich wenn die Daten keine klare Antwort erlauben
+- Formatiere Preise als $X,XXX.XX""",
+    'en': """Answer the question below based on the technical analysis.
+
+INSTRUCTIONS:
+- Give a brief, precise answer based on the data
+- Use actual values from the analysis
+- Be honest if the data doesn't allow a clear answer
+- Format prices as $X,XXX.XX"""
+}
+
+
+_INDICATOR_PAYLOAD = {
+    'de': """Aktueller Kurs: ${current_price:.2f}
+ATR: {atr}
+
+VALIDIERTE INDIKATOREN (verwende EXAKT diese Werte):
+{indicators}""",
+    'en': """Current Price: ${current_price:.2f}
+ATR: {atr}
+
+VALIDATED INDICATORS (use EXACTLY these values):
+{indicators}"""
+}
+
+_PROBABILITY_PAYLOAD = {
+    'de': """WAHRSCHEINLICHKEITEN:
+- Bullisch: {bullish:.1f}% ({bullish_signals} Signale)
+- Bearisch: {bearish:.1f}% ({bearish_signals} Signale)
+- Neutral: {neutral:.1f}% ({neutral_signals} Signale)
+- Sentiment: {sentiment}
+
+KURSZIELE:
+{targets}""",
+    'en': """PROBABILITIES:
+- Bullish: {bullish:.1f}% ({bullish_signals} signals)
+- Bearish: {bearish:.1f}% ({bearish_signals} signals)
+- Neutral: {neutral:.1f}% ({neutral_signals} signals)
+- Sentiment: {sentiment}
+
+PRICE TARGETS:
+{targets}"""
+}
+
+_LEVELS_PAYLOAD = {
+    'de': """Aktueller Kurs: ${current_price:.2f}
+
+FIBONACCI LEVELS:
+{fibonacci}
+
+SUPPORT & RESISTANCE:
+Support: {support}
+Resistance: {resistance}""",
+    'en': """Current Price: ${current_price:.2f}
+
+FIBONACCI LEVELS:
+{fibonacci}
+
+SUPPORT & RESISTANCE:
+Support: {support}
+Resistance: {resistance}"""
+}
+
+_QUESTION_PAYLOAD = {
+    'de': """KONTEXT DER ANALYSE:
+
+Indikatoren:
+{indicators}
+
+Wahrscheinlichkeiten:
+{probabilities}
+
+Sentiment:
+{sentiment}
+
+Patterns (falls vorhanden):
+{patterns}
+
+FRAGE: {question}""",
+    'en': """ANALYSIS CONTEXT:
+
+Indicators:
+{indicators}
+
+Probabilities:
+{probabilities}
+
+Sentiment:
+{sentiment}
+
+Patterns (if available):
+{patterns}
+
+QUESTION: {question}"""
+}
+
+
+_INDICATOR_BATCH_INSTRUCTIONS = {
+    'de': """Analysiere die technischen Indikatoren ALLER unten stehenden Symbole für eine Trading-Entscheidung.
+
+Antworte AUSSCHLIESSLICH mit einem JSON-Objekt der Form
+{"analyses": [{"symbol": ..., "direction": ..., "entry": ..., "stop": ..., "target": ..., "rr": ..., "comment": ...}]}
+mit genau einem Eintrag pro Symbol in der gegebenen Reihenfolge.
+
+WICHTIG:
+- Verwende NUR die gegebenen Indikatorwerte
+- entry, stop und target als Zahlen, rr als Zahl (Reward pro 1 Risiko)
+- Stop-Loss mit ATR begründen, comment höchstens zwei Sätze""",
+    'en': """Analyze the technical indicators of ALL symbols below for a trading decision.
+
+Answer ONLY with a JSON object of the form
+{"analyses": [{"symbol": ..., "direction": ..., "entry": ..., "stop": ..., "target": ..., "rr": ..., "comment": ...}]}
+with exactly one entry per symbol in the given order.
+
+IMPORTANT:
+- Use ONLY the given indicator values
+- entry, stop and target as numbers, rr as a number (reward per 1 risk)
+- Justify the stop-loss with ATR, comment at most two sentences"""
+}
+
+_INDICATOR_BATCH_PAYLOAD = {
+    'de': """SYMBOLE ({count}, verwende EXAKT diese Werte):
+{symbols}""",
+    'en': """SYMBOLS ({count}, use EXACTLY these values):
+{symbols}"""
+}
+
+# Darstellung eines Batch-Eintrags als Markdown
+_INDICATOR_BATCH_REPORT = {
+    'de': """### {symbol}
+**Richtung:** {direction}  
+**Entry:** {entry}  
+**Stop-Loss:** {stop}  
+**Ziel:** {target}  
+**Risk/Reward:** 1:{rr}
+
+{comment}""",
+    'en': """### {symbol}
+**Direction:** {direction}  
+**Entry:** {entry}  
+**Stop-Loss:** {stop}  
+**Target:** {target}  
+**Risk/Reward:** 1:{rr}
+
+{comment}"""
+}
+
+
+def _format_price(value: Any) -> str:
+    """Formatiert Zahlen als Preis, andere Werte unverändert"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f"${value:,.2f}"
+    return str(value) if value is not None else 'N/A'
+
+
+def _parse_batch_analyses(content: str, count: int) -> Optional[List[Dict]]:
+    """Liest die JSON-Antwort einer Batch-Analyse; None wenn sie nicht zur Anzahl der Symbole passt"""
+    if not content:
+        return None
+    start, end = content.find('{'), content.rfind('}')
+    if start < 0 or end <= start:
+        return None
+    try:
+        parsed = json.loads(content[start:end + 1])
+    except ValueError:
+        return None
+    analyses = parsed.get('analyses') if isinstance(parsed, dict) else None
+    if not isinstance(analyses, list) or len(analyses) != count or not all(isinstance(a, dict) for a in analyses):
+        return None
+    return analyses
+
+
+# Indikatoren, die die Prompts tatsächlich benötigen (Projektion statt Abschneiden des JSON-Strings)
+_PROMPT_KEYS = {
+    'indicator': ('RSI', 'MACD', 'ATR', 'Bollinger', 'moving_averages', 'ADX', 'Stochastic', 'Pivots'),
+    'question': ('RSI', 'MACD', 'ATR', 'Bollinger', 'moving_averages', 'ADX', 'Stochastic', 'MFI')
+}
+
+
+def _project(data: Dict, kind: str) -> Dict:
+    """Reduziert ein Indikator-Dict auf die für den Prompt benötigten Schlüssel"""
+    return {k: data[k] for k in _PROMPT_KEYS[kind] if k in data}
+
+
+# Registry der Einzelanalysen: System-Nachricht, feste Anweisungen und Datenvorlage je Sprache
+_ANALYSIS_PROMPTS = {
+    'indicator': (_INDICATOR_SYSTEM, _INDICATOR_INSTRUCTIONS, _INDICATOR_PAYLOAD),
+    'probability': (_PROBABILITY_SYSTEM, _PROBABILITY_INSTRUCTIONS, _PROBABILITY_PAYLOAD),
+    'levels': (_LEVELS_SYSTEM, _LEVELS_INSTRUCTIONS, _LEVELS_PAYLOAD),
+    'question': (_QUESTION_SYSTEM, _QUESTION_INSTRUCTIONS, _QUESTION_PAYLOAD),
+    'indicator_batch': (_INDICATOR_SYSTEM, _INDICATOR_BATCH_INSTRUCTIONS, _INDICATOR_BATCH_PAYLOAD)
+}
+
+# Platzhalter für fehlende Daten in den Vorlagen
+_NO_DATA = {'de': 'Keine', 'en': 'None'}
+
+
+def _analysis_messages(kind: str, language: str, **values: Any) -> list:
+    """Baut die Nachrichten einer Einzelanalyse: feste Anweisungen zuerst, variable Daten zuletzt"""
+    system, instructions, payload = _ANALYSIS_PROMPTS[kind]
+    language = language if language in system else 'de'
+    return [
+        {"role": "system", "content": system[language]},
+        {"role": "user", "content": f"{instructions[language]}\n\n{payload[language].format(**values)}"}
+    ]
+
+
+# Textbausteine für den regelbasierten Fallback-Bericht
+_TREND_DESCRIPTIONS = {
+    'bullish': "Die technischen Indikatoren zeigen eine bullische Tendenz.",
+    'bearish': "Die technischen Indikatoren zeigen eine bearische Tendenz.",
+    'neutral': "Der Markt befindet sich in einer neutralen Phase ohne klare Richtung."
+}
+
+_NO_TRADE_SETUP = """### KEIN TRADE ⏸️
+• **Grund:** Keine klare Marktrichtung
+• **Empfehlung:** Warten auf eindeutige Signale
+• **Beobachten:** RSI-Divergenzen, MACD-Kreuzungen, Volumen-Spikes"""
+
+_RISK_MANAGEMENT_TEMPLATE = """### Position Sizing
+• **Risiko pro Trade:** Max. 2% des Portfolios
+• **ATR-basierter Stop:** ${atr:.2f} (1x ATR)
+• **Erweiteter Stop:** ${extended_atr:.2f} (1.5x ATR)
+• **Max. Positionsgröße:** Bei $100,000 Kapital = $2,000 Risiko
+
+### Stop-Loss Regeln
+• **Initial Stop:** 1.5x ATR vom Entry
+• **Trailing Stop:** Aktivieren bei +1R Gewinn
+• **Break-Even:** Nachziehen bei +2R Gewinn
+
+### Warnsignale für Exit
+• RSI-Divergenz zum Preis
+• MACD-Kreuzung gegen Position
+• Volumen-Spike gegen Trend
+• Durchbruch wichtiger Support/Resistance"""
+
+_ACTION_ITEMS = {
+    'bullish': """### ✅ Sofort-Aktionen
+1. **Long-Position vorbereiten** (noch nicht ausführen)
+2. **Stop-Loss berechnen** (1.5x ATR)
+3. **Position Size festlegen** (2% Risiko)
+
+### 📊 Monitoring
+• RSI auf Überkauf achten (>70)
+• MACD-Momentum beobachten
+• Volumen bei Ausbrüchen prüfen
+
+### ⚠️ Exit-Signale
+• RSI > 80 (Teilgewinn)
+• MACD dreht negativ (Vollständiger Exit)
+• Durchbruch unter wichtigen Support""",
+    'bearish': """### ✅ Sofort-Aktionen
+1. **Long-Positionen reduzieren**
+2. **Short-Setup vorbereiten**
+3. **Defensive Stops setzen**
+
+### 📊 Monitoring
+• RSI auf Überverkauf achten (<30)
+• MACD-Divergenzen suchen
+• Support-Level beobachten
+
+### ⚠️ Exit-Signale
+• RSI < 20 (Teilgewinn bei Shorts)
+• MACD dreht positiv
+• Durchbruch über Resistance""",
+    'neutral': """### ✅ Sofort-Aktionen
+1. **Keine neuen Positionen**
+2. **Bestehende Positionen halten**
+3. **Auf klare Signale warten**
+
+### 📊 Monitoring
+• Ausbruch aus Range beobachten
+• Volumen-Anstieg abwarten
+• Trend-Bestätigung suchen
+
+### ⚠️ Trigger für Action
+• RSI verlässt 40-60 Range
+• MACD-Kreuzung
+• Ausbruch mit Volumen"""
+}
+
+
+# Fallback-Bericht wenn das LLM nicht erreichbar ist
+_FALLBACK_REPORTS = {
+    'de': """
+# 📊 MARKTANALYSE-BERICHT
+## Status: Basis-Analyse (LLM nicht verfügbar)
+
+Die technischen Indikatoren wurden erfolgreich berechnet.
+Bitte prüfen Sie die Charts und Indikatoren-Tabs für Details.
+
+⚠️ Für erweiterte AI-Analyse stellen Sie sicher, dass der LLM-Server läuft.
+""",
+    'en': """
+# 📊 MARKET ANALYSIS REPORT
+## Status: Basic Analysis (LLM not available)
+
+Technical indicators have been successfully calculated.
+Please check the Charts and Indicators tabs for details.
+
+⚠️ For advanced AI analysis, make sure the LLM server is running.
+"""
+}
+
+
+# Kopf- und Fußzeilen der LLM-Berichte; Datumsformate je Sprache (Kopfzeile, Fußzeile)
+_METADATA_DATE_FORMATS = {
+    'de': ('%d.%m.%Y %H:%M', '%d.%m.%Y um %H:%M:%S Uhr'),
+    'en': ('%Y-%m-%d %H:%M', '%Y-%m-%d at %H:%M:%S')
+}
+
+_METADATA_HEADERS = {
+    'de': """
+# 📊 TECHNISCHE ANALYSE - {ticker}
+
+**Analysedatum:** {date} Uhr  
+**Aktueller Kurs:** {price}  
+**Marktrichtung:** {primary}  
+**Empfehlung:** {recommendation}
+
+---
+
+""",
+    'en': """
+# 📊 TECHNICAL ANALYSIS - {ticker}
+
+**Analysis Date:** {date}  
+**Current Price:** {price}  
+**Market Direction:** {primary}  
+**Recommendation:** {recommendation}
+
+---
+
+"""
+}
+
+_METADATA_FOOTERS = {
+    'de': """
+
+---
+
+*Analyse erstellt am {timestamp}*  
+*Alle Werte stammen aus der technischen Analyse von yfinance.*  
+*Disclaimer: Diese Analyse dient nur zu Informationszwecken und stellt keine Anlageberatung dar.*
+""",
+    'en': """
+
+---
+
+*Analysis created on {timestamp}*  
+*All values are from technical analysis via yfinance.*  
+*Disclaimer: This analysis is for informational purposes only and does not constitute investment advice.*
+"""
+}
+
 
 class LLMClient:
-    def __init__(self):
-        """Initialisiert den OpenAI Client"""
+    def __init__(self, warmup: bool = False, semantic_cache: bool = LLM_SEMANTIC_CACHE):
+        """
+        Initialisiert den OpenAI Client; warmup kompiliert die Numba-Kernel vorab,
+        semantic_cache lädt das Embedding-Modell für den Frage-Cache gleich hier statt bei der ersten Frage
+        """
+        if warmup:
+            warmup_kernels()
+        self._http = None
+        self._default_temperature = LLM_TEMPERATURE
+        self._max_tokens_cap = min(LLM_MAX_TOKENS, 25000)
+        self._response_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._question_cache = OrderedDict()
+        self._encoder = self._load_encoder() if semantic_cache else None
+        # Zusätzliche Server-Parameter: Draft-Modell für Speculative Decoding, falls konfiguriert
+        self._extra_body = {'draft_model': LLM_DRAFT_MODEL} if LLM_DRAFT_MODEL else {}
+        # SDK-Variante einmalig festlegen statt bei jeder Anfrage zu prüfen
+        self._invoke = self._invoke_v1 if OPENAI_V1 else self._invoke_v0
         try:
             if OPENAI_V1:
-                timeout_settings = httpx.Timeout(600.0)
+                # Ein gemeinsamer Client mit Keep-Alive-Pool, damit Folgeanfragen die Verbindung wiederverwenden
+                self._http = httpx.Client(
+                    http2=HTTP2_AVAILABLE,
+                    limits=httpx.Limits(
+                        max_connections=_HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=_HTTP_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=_HTTP_KEEPALIVE_EXPIRY
+                    ),
+                    timeout=_HTTP_TIMEOUT
+                )
                 self.client = OpenAI(
                     base_url=LLM_API_BASE,
                     api_key="not-needed",
-                    http_client=httpx.Client(timeout=timeout_settings),
+                    http_client=self._http,
                     timeout=600.0
                 )
             else:
-                import openai
                 openai.api_base = LLM_API_BASE
                 openai.api_key = "not-needed"
                 self.client = None
@@ -48,49 +871,201 @@ class LLMClient:
             self.model = LLM_MODEL
             self.is_available = False
 
+    def close(self):
+        """Schließt den HTTP-Client und gibt offene Verbindungen frei"""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
     def _make_request(self, messages: list, temperature: float = None, max_tokens: int = None) -> str:
         """Führt eine Anfrage an das LLM aus"""
         if not self.is_available:
             return self._generate_fallback_report()
 
-        temperature = temperature or LLM_TEMPERATURE
-        max_tokens = min(max_tokens or LLM_MAX_TOKENS, 25000)
+        temperature = self._default_temperature if temperature is None else temperature
+        max_tokens = self._max_tokens_cap if max_tokens is None else min(max_tokens, 25000)
+
+        # Identische Anfragen mit niedriger Temperatur aus dem Cache beantworten
+        cache_key = None
+        if temperature <= _RESPONSE_CACHE_MAX_TEMPERATURE:
+            cache_key = self._cache_key(messages, temperature, max_tokens)
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                return cached
 
         try:
-            if OPENAI_V1 and self.client:
-                response = self.client.chat.completions.create(
+            content = self._invoke(messages, temperature, max_tokens)
+        except Exception as e:
+            return self._generate_fallback_report()
+
+        if cache_key is not None and content:
+            self._store_response(cache_key, content)
+        return content
+
+    def _cached_response(self, cache_key: bytes) -> Optional[str]:
+        """Liefert eine gecachte Antwort oder None"""
+        with self._cache_lock:
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                self._response_cache.move_to_end(cache_key)
+            return cached
+
+    def _store_response(self, cache_key: bytes, content: str):
+        """Speichert eine Antwort im Antwort-Cache (älteste Einträge fallen heraus)"""
+        with self._cache_lock:
+            self._response_cache[cache_key] = content
+            if len(self._response_cache) > _RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+
+    def _make_request_stream(self, messages: list, temperature: float = None, max_tokens: int = None) -> Iterator[str]:
+        """Führt eine Anfrage an das LLM aus und liefert die Antwort stückweise"""
+        if not self.is_available:
+            yield self._generate_fallback_report()
+            return
+
+        temperature = self._default_temperature if temperature is None else temperature
+        max_tokens = self._max_tokens_cap if max_tokens is None else min(max_tokens, 25000)
+
+        try:
+            if OPENAI_V1:
+                stream = self.client.chat.completions.create(
                     model=self.model,
                     messages=messages,
                     temperature=temperature,
                     max_tokens=max_tokens,
-                    timeout=600.0
+                    timeout=600.0,
+                    stream=True,
+                    extra_body=self._extra_body
                 )
-                return response.choices[0].message.content
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
             else:
-                import openai
-                response = openai.ChatCompletion.create(
+                stream = openai.ChatCompletion.create(
                     model=self.model,
                     messages=messages,
                     temperature=temperature,
                     max_tokens=max_tokens,
-                    timeout=600
+                    timeout=600,
+                    stream=True,
+                    **self._extra_body
                 )
-                return response['choices'][0]['message']['content']
+                for chunk in stream:
+                    content = chunk['choices'][0]['delta'].get('content')
+                    if content:
+                        yield content
         except Exception as e:
-            return self._generate_fallback_report()
+            yield self._generate_fallback_report()
+
+    def _cache_key(self, messages: list, temperature: float, max_tokens: int) -> bytes:
+        """Bildet einen Hash aus Nachrichten, Modell und Parametern"""
+        payload = [self.model, messages, temperature, max_tokens]
+        if ORJSON_AVAILABLE:
+            raw = orjson.dumps(payload)
+        else:
+            raw = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        return hashlib.blake2b(raw, digest_size=16).digest()
+
+    @staticmethod
+    def _load_encoder():
+        """Lädt das Embedding-Modell für den semantischen Cache oder None, wenn es nicht verfügbar ist"""
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            return None
+        try:
+            return SentenceTransformer(_SEMANTIC_CACHE_MODEL)
+        except Exception as e:
+            print(f"⚠️ Semantischer Cache deaktiviert: {str(e)}")
+            return None
+
+    def _embed_question(self, question: str) -> Optional[np.ndarray]:
+        """Normiertes Embedding einer Frage oder None, wenn der semantische Cache nicht aktiv ist"""
+        if self._encoder is None:
+            return None
+        try:
+            return self._encoder.encode(question, normalize_embeddings=True)
+        except Exception as e:
+            print(f"⚠️ Semantischer Cache deaktiviert: {str(e)}")
+            self._encoder = None
+            return None
+
+    def _lookup_similar_answer(self, context_key: bytes, embedding: np.ndarray) -> Optional[str]:
+        """Sucht eine Antwort auf eine ähnliche Frage zum selben Analyse-Kontext"""
+        with self._cache_lock:
+            entries = self._question_cache.get(context_key)
+            if not entries:
+                return None
+            self._question_cache.move_to_end(context_key)
+            entries = list(entries)
+        similarities = np.stack([cached_embedding for cached_embedding, _ in entries]) @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] >= _SEMANTIC_CACHE_THRESHOLD:
+            return entries[best][1]
+        return None
+
+    def _store_answer(self, context_key: bytes, embedding: np.ndarray, answer: str):
+        """Speichert eine Antwort im semantischen Cache (begrenzt je Kontext und insgesamt)"""
+        with self._cache_lock:
+            entries = self._question_cache.setdefault(context_key, [])
+            entries.append((embedding, answer))
+            del entries[:-_SEMANTIC_CACHE_ENTRIES]
+            self._question_cache.move_to_end(context_key)
+            if len(self._question_cache) > _SEMANTIC_CACHE_CONTEXTS:
+                self._question_cache.popitem(last=False)
+
+    def _invoke_v1(self, messages: list, temperature: float, max_tokens: int) -> str:
+        """Anfrage über das OpenAI SDK ab Version 1.0"""
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=600.0,
+            extra_body=self._extra_body
+        )
+        return response.choices[0].message.content
+
+    def _invoke_v0(self, messages: list, temperature: float, max_tokens: int) -> str:
+        """Anfrage über das alte OpenAI SDK (< 1.0)"""
+        response = openai.ChatCompletion.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=600,
+            **self._extra_body
+        )
+        return response['choices'][0]['message']['content']
 
     def _prepare_data_for_json(self, data: Any) -> Any:
         """Bereitet Daten für JSON vor und entfernt NaN/Inf Werte"""
-        import numpy as np
-        import pandas as pd
+        # Schneller Pfad für Python-Primitive (häufigste Blattwerte)
+        if data is None or isinstance(data, (str, bool, int)):
+            return data
+        if isinstance(data, float):
+            return float(data) if math.isfinite(data) else None
         
         if isinstance(data, (np.integer, np.floating)):
             if np.isnan(data) or np.isinf(data):
                 return None
             return float(data)
         elif isinstance(data, np.ndarray):
+            # Numerische Arrays in einem Schritt filtern, nur Object-Arrays rekursiv
+            if np.issubdtype(data.dtype, np.number):
+                return data[np.isfinite(data)].tolist()
+            if data.dtype != object:
+                return data.tolist()
             return [self._prepare_data_for_json(x) for x in data if not (isinstance(x, float) and (np.isnan(x) or np.isinf(x)))]
         elif isinstance(data, pd.Series):
+            if pd.api.types.is_numeric_dtype(data.dtype):
+                # Alle Schlüssel behalten, NaN/Inf werden zu None
+                finite = np.isfinite(data.to_numpy(dtype=float, na_value=np.nan))
+                return data.astype(object).where(finite, None).to_dict()
             return {k: self._prepare_data_for_json(v) for k, v in data.to_dict().items() if v is not None}
         elif isinstance(data, pd.DataFrame):
             return data.replace([np.inf, -np.inf], np.nan).dropna().to_dict('records')
@@ -109,71 +1084,28 @@ class LLMClient:
         """Validiert und bereinigt Indikator-Werte"""
         validated = {}
         
-        # RSI - sollte zwischen 0 und 100 sein
-        if 'RSI' in indicators:
-            rsi = indicators.get('RSI')
-            if rsi is not None and 0 <= rsi <= 100:
-                validated['RSI'] = round(rsi, 2)
-        
-        # MACD
-        if 'MACD' in indicators:
-            macd = indicators.get('MACD', {})
-            if isinstance(macd, dict):
-                validated['MACD'] = {
-                    'macd': round(macd.get('macd', 0), 4) if macd.get('macd') is not None else None,
-                    'signal': round(macd.get('signal', 0), 4) if macd.get('signal') is not None else None,
-                    'histogram': round(macd.get('histogram', 0), 4) if macd.get('histogram') is not None else None
-                }
-        
-        # ATR - sollte positiv sein
-        if 'ATR' in indicators:
-            atr = indicators.get('ATR')
-            if atr is not None and atr > 0:
-                validated['ATR'] = round(atr, 2)
-        
-        # Moving Averages
-        if 'moving_averages' in indicators:
-            ma = indicators.get('moving_averages', {})
-            validated['moving_averages'] = {
-                'ema': {k: round(v, 2) for k, v in ma.get('ema', {}).items() if v is not None},
-                'sma': {k: round(v, 2) for k, v in ma.get('sma', {}).items() if v is not None}
-            }
-        
-        # Stochastic
-        if 'Stochastic' in indicators:
-            stoch = indicators.get('Stochastic', {})
-            if isinstance(stoch, dict):
-                validated['Stochastic'] = {
-                    'K': round(stoch.get('K', 0), 2) if stoch.get('K') is not None else None,
-                    'D': round(stoch.get('D', 0), 2) if stoch.get('D') is not None else None
-                }
-        
-        # Weitere Indikatoren
-        for key in ['ADX', 'CCI', 'MFI', 'OBV', 'VWAP', 'Williams_R', 'CMF', 'ROC']:
-            if key in indicators and indicators[key] is not None:
-                if isinstance(indicators[key], dict):
-                    validated[key] = {k: round(v, 2) if v is not None else None 
-                                    for k, v in indicators[key].items()}
-                else:
-                    validated[key] = round(indicators[key], 2)
-        
-        # Bollinger Bands
-        if 'Bollinger' in indicators:
-            bb = indicators.get('Bollinger', {})
-            if isinstance(bb, dict):
-                validated['Bollinger'] = {
-                    'upper': round(bb.get('upper', 0), 2) if bb.get('upper') is not None else None,
-                    'middle': round(bb.get('middle', 0), 2) if bb.get('middle') is not None else None,
-                    'lower': round(bb.get('lower', 0), 2) if bb.get('lower') is not None else None,
-                    'width': round(bb.get('width', 0), 2) if bb.get('width') is not None else None
-                }
-        
-        # Pivots
-        if 'Pivots' in indicators:
-            pivots = indicators.get('Pivots', {})
-            if isinstance(pivots, dict):
-                validated['Pivots'] = {k: round(v, 2) if v is not None else None 
-                                     for k, v in pivots.items()}
+        for key in _VALIDATION_ORDER:
+            if key not in indicators:
+                continue
+            value = indicators[key]
+            
+            if key in _SCALAR_RULES:
+                # RSI zwischen 0 und 100, ATR positiv
+                digits, is_valid = _SCALAR_RULES[key]
+                if value is not None and is_valid(value):
+                    validated[key] = round(value, digits)
+            elif key in _NESTED_ROUNDING:
+                if isinstance(value, dict):
+                    validated[key] = {name: _round_or_none(value.get(name), digits)
+                                      for name, digits in _NESTED_ROUNDING[key]}
+            elif key == 'moving_averages':
+                ma = value or {}
+                validated[key] = {group: {k: round(v, 2) for k, v in (ma.get(group) or {}).items() if v is not None}
+                                  for group in ('ema', 'sma')}
+            elif isinstance(value, dict):
+                validated[key] = {k: _round_or_none(v, 2) for k, v in value.items()}
+            elif value is not None and key != 'Pivots':
+                validated[key] = round(value, 2)
         
         return validated
 
@@ -186,132 +1118,30 @@ class LLMClient:
             max_tokens: Maximale Token-Anzahl
             language: Sprache des Berichts ('de' oder 'en')
         """
+        # Ein Zeitpunkt für den gesamten Bericht
+        now = datetime.now()
+        
         try:
-            # Bereite und validiere Daten vor
-            clean_analysis = self._prepare_data_for_json(full_analysis)
-            ticker = clean_analysis.get('ticker', 'INDEX')
-            current_price = clean_analysis.get('current_price', 0)
-            
-            # Validiere Indikatoren für konsistente Werte
-            indicators = self._validate_indicators(clean_analysis.get('indicators', {}))
-            
-            # Bestimme konsistente Marktrichtung für den Bericht
-            market_direction = self._determine_market_direction(
-                indicators, 
-                clean_analysis.get('probabilities', {}),
-                language
-            )
-            
-            # Erstelle strukturierten Prompt für das LLM basierend auf Sprache
-            if language == 'en':
-                prompt = f"""
-            Create a professional, technical analysis report for {ticker}.
-            
-            IMPORTANT - Use ONLY these validated data:
-            
-            Ticker: {ticker}
-            Current Price: ${current_price:.2f}
-            
-            VALIDATED INDICATORS (use exactly these values):
-            {json.dumps(indicators, indent=2, default=str)}
-            
-            PROBABILITIES:
-            {json.dumps(clean_analysis.get('probabilities', {}), indent=2)}
-            
-            PRICE TARGETS:
-            {json.dumps(clean_analysis.get('price_targets', {}), indent=2, default=str)[:1000]}
-            
-            SUPPORT/RESISTANCE:
-            {json.dumps(clean_analysis.get('support_resistance', {}), indent=2, default=str)[:1000]}
-            
-            MARKET DIRECTION (use consistently):
-            - Primary Direction: {market_direction['primary']}
-            - Recommendation: {market_direction['recommendation']}
-            - Strength: {market_direction['strength']}/10
-            
-            REQUIREMENTS:
-            1. Use EXACTLY the indicator values mentioned above - no custom calculations
-            2. Be CONSISTENT - if market direction is {market_direction['primary']}, 
-               all sections must support this assessment
-            3. No contradictions between different sections
-            4. Format numbers correctly: $23,415.42 (with comma as thousands separator)
-            5. Use ATR for Stop-Loss: {indicators.get('ATR', 'N/A')}
-            6. Use actual Support/Resistance levels from the data
-            7. Structure the report with clear headings
-            8. Provide specific, actionable trading recommendations
-            9. Avoid speculation - base everything on given data
-            10. Explicitly mention that all values come from technical analysis
-            
-            STRUCTURE:
-            1. Executive Summary (Market overview, consistent assessment)
-            2. Technical Indicators (with exact values)
-            3. Trading Setup (Entry, Stop-Loss with ATR, Targets)
-            4. Risk Management
-            5. Action Items
-            6. Summary
-            
-            Create a professional report in English.
-            """
-            else:
-                prompt = f"""
-            Erstelle einen professionellen, technischen Analysebericht für {ticker}.
-            
-            WICHTIG - Verwende NUR diese validierten Daten:
-            
-            Ticker: {ticker}
-            Aktueller Kurs: ${current_price:.2f}
-            
-            VALIDIERTE INDIKATOREN (nutze exakt diese Werte):
-            {json.dumps(indicators, indent=2, default=str)}
-            
-            WAHRSCHEINLICHKEITEN:
-            {json.dumps(clean_analysis.get('probabilities', {}), indent=2)}
-            
-            KURSZIELE:
-            {json.dumps(clean_analysis.get('price_targets', {}), indent=2, default=str)[:1000]}
-            
-            SUPPORT/RESISTANCE:
-            {json.dumps(clean_analysis.get('support_resistance', {}), indent=2, default=str)[:1000]}
-            
-            MARKTRICHTUNG (konsistent verwenden):
-            - Primäre Richtung: {market_direction['primary']}
-            - Empfehlung: {market_direction['recommendation']}
-            - Stärke: {market_direction['strength']}/10
-            
-            ANFORDERUNGEN:
-            1. Verwende EXAKT die oben genannten Indikatorwerte - keine eigenen Berechnungen
-            2. Sei KONSISTENT - wenn die Marktrichtung {market_direction['primary']} ist, 
-               müssen alle Abschnitte diese Einschätzung unterstützen
-            3. Keine Widersprüche zwischen verschiedenen Abschnitten
-            4. Formatiere Zahlen korrekt: $23,415.42 (mit Komma als Tausendertrennzeichen)
-            5. ATR für Stop-Loss verwenden: {indicators.get('ATR', 'N/A')}
-            6. Nutze die tatsächlichen Support/Resistance Levels aus den Daten
-            7. Strukturiere den Bericht mit klaren Überschriften
-            8. Gib konkrete, umsetzbare Trading-Empfehlungen
-            9. Vermeide Spekulationen - basiere alles auf den gegebenen Daten
-            10. Erwähne explizit, dass alle Werte aus der technischen Analyse stammen
-            
-            STRUKTUR:
-            1. Executive Summary (Marktübersicht, konsistente Einschätzung)
-            2. Technische Indikatoren (mit den exakten Werten)
-            3. Trading-Setup (Entry, Stop-Loss mit ATR, Targets)
-            4. Risikomanagement 
-            5. Handlungsempfehlungen
-            6. Zusammenfassung
-            
-            Erstelle einen professionellen Bericht in deutscher Sprache.
-            """
-            
-            messages = [
-                {"role": "system", "content": "You are a professional financial analyst. Create consistent, data-driven reports without contradictions. ALWAYS use the provided data." if language == 'en' else "Du bist ein professioneller Finanzanalyst. Erstelle konsistente, datenbasierte Berichte ohne Widersprüche. Verwende IMMER die bereitgestellten Daten."},
-                {"role": "user", "content": prompt}
-            ]
+            if not self.is_available:
+                # Ohne LLM keinen Prompt aufbauen, sondern direkt den regelbasierten Bericht erstellen
+                if language != 'de':
+                    return self._generate_fallback_report(language)
+                clean_analysis = self._prepare_data_for_json({key: full_analysis.get(key) for key in _REPORT_KEYS})
+                return self._generate_consistent_report({
+                    'ticker': clean_analysis.get('ticker') or 'INDEX',
+                    'current_price': clean_analysis.get('current_price') or 0,
+                    'indicators': self._validate_indicators(clean_analysis.get('indicators') or {}),
+                    'probabilities': clean_analysis.get('probabilities') or {},
+                    'targets': clean_analysis.get('price_targets') or {}
+                }, language, now=now)
+            
+            messages, ticker, current_price, market_direction = self._build_report_request(full_analysis, language)
             
             # Generiere Bericht mit LLM
             report = self._make_request(messages, temperature=0.3, max_tokens=max_tokens)
             
             # Füge Metadaten hinzu
-            report = self._add_report_metadata(report, ticker, current_price, market_direction, language)
+            report = self._add_report_metadata(report, ticker, current_price, market_direction, language, now=now)
             
             return report
             
@@ -319,182 +1149,355 @@ class LLMClient:
             print(f"⚠️ Fehler bei Berichtsgenerierung: {str(e)}")
             return self._generate_fallback_report(language)
 
-    def _add_report_metadata(self, report: str, ticker: str, price: float, market_direction: Dict, language: str = 'de') -> str:
+    def _build_report_request(self, full_analysis: Dict, language: str = 'de') -> tuple:
+        """Erstellt die Nachrichten für den Marktbericht samt Ticker, Kurs und Marktrichtung"""
+        # Bereite und validiere nur die Daten vor, die der Prompt verwendet
+        clean_analysis = self._prepare_data_for_json({key: full_analysis.get(key) for key in _REPORT_KEYS})
+        ticker = clean_analysis.get('ticker', 'INDEX')
+        current_price = clean_analysis.get('current_price', 0)
+        
+        # Validiere Indikatoren für konsistente Werte
+        indicators = self._validate_indicators(clean_analysis.get('indicators', {}))
+        
+        # Bestimme konsistente Marktrichtung für den Bericht
+        market_direction = self._determine_market_direction(
+            indicators, 
+            clean_analysis.get('probabilities', {}),
+            language
+        )
+        
+        # Erstelle strukturierten Prompt für das LLM basierend auf Sprache
+        prompt = _render_prompt(_REPORT_PROMPT_CHUNKS.get(language, _REPORT_PROMPT_CHUNKS['de']), {
+            'ticker': ticker,
+            'current_price': current_price,
+            'indicators': _dumps_bytes(indicators),
+            'probabilities': _dumps_bytes(clean_analysis.get('probabilities', {})),
+            'price_targets': _dumps_bytes(_truncate_for_prompt(clean_analysis.get('price_targets', {}))),
+            'support_resistance': _dumps_bytes(_truncate_for_prompt(clean_analysis.get('support_resistance', {}))),
+            'primary': market_direction['primary'],
+            'recommendation': market_direction['recommendation'],
+            'strength': market_direction['strength'],
+            'atr': indicators.get('ATR', 'N/A')
+        })
+        
+        messages = [
+            {"role": "system", "content": _REPORT_SYSTEM_MESSAGES.get(language, _REPORT_SYSTEM_MESSAGES['de'])},
+            {"role": "user", "content": prompt}
+        ]
+        
+        return messages, ticker, current_price, market_direction
+
+    async def _amake_request(self, aclient: Any, messages: list, temperature: float = None, max_tokens: int = None) -> str:
+        """Führt eine asynchrone Anfrage an das LLM aus"""
+        temperature = self._default_temperature if temperature is None else temperature
+        max_tokens = self._max_tokens_cap if max_tokens is None else min(max_tokens, 25000)
+        
+        try:
+            response = await aclient.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=600.0,
+                extra_body=self._extra_body
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            return self._generate_fallback_report()
+
+    async def generate_many(self, analyses: List[Dict], max_tokens: int = None, language: str = 'de',
+                            concurrency: int = 4) -> List[str]:
+        """
+        Generiert Marktberichte für mehrere Analysen parallel
+        
+        Args:
+            analyses: Liste vollständiger Analysedaten (z.B. mehrere Ticker)
+            max_tokens: Maximale Token-Anzahl pro Bericht
+            language: Sprache der Berichte ('de' oder 'en')
+            concurrency: Maximale Anzahl gleichzeitiger LLM-Anfragen
+        """
+        if not self.is_available or not OPENAI_V1:
+            return [self.generate_comprehensive_report(analysis, max_tokens, language) for analysis in analyses]
+        
+        # Prompts im Threadpool aufbauen, Fehler pro Analyse abfangen
+        prepared = await asyncio.gather(
+            *[asyncio.to_thread(self._build_report_request, analysis, language) for analysis in analyses],
+            return_exceptions=True
+        )
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        # Eigener AsyncClient pro Batch, da er an die laufende Event-Loop gebunden ist
+        async with httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=concurrency,
+                max_keepalive_connections=concurrency,
+                keepalive_expiry=_HTTP_KEEPALIVE_EXPIRY
+            ),
+            timeout=_HTTP_TIMEOUT
+        ) as http_client:
+            aclient = AsyncOpenAI(base_url=LLM_API_BASE, api_key="not-needed", http_client=http_client, timeout=600.0)
+            
+            async def run(request):
+                if isinstance(request, Exception):
+                    print(f"⚠️ Fehler bei Berichtsgenerierung: {str(request)}")
+                    return self._generate_fallback_report(language)
+                messages, ticker, current_price, market_direction = request
+                async with semaphore:
+                    report = await self._amake_request(aclient, messages, temperature=0.3, max_tokens=max_tokens)
+                return self._add_report_metadata(report, ticker, current_price, market_direction, language)
+            
+            return list(await asyncio.gather(*[run(request) for request in prepared]))
+
+    def _add_report_metadata(self, report: str, ticker: str, price: float, market_direction: Dict, language: str = 'de',
+                             now: Optional[datetime] = None) -> str:
         """
         Fügt Metadaten zum Bericht hinzu
         """
         if not report:
             return self._generate_fallback_report(language)
         
+        # Ein Zeitpunkt für Header und Footer
+        now = now or datetime.now()
+        parts = []
+        
+        # Ein Sprachschlüssel für Header, Footer und Datumsformate
+        key = 'en' if language == 'en' else 'de'
+        header_format, footer_format = _METADATA_DATE_FORMATS[key]
+        
         # Füge Header hinzu wenn nicht vorhanden
         if not report.startswith('#'):
-            if language == 'en':
-                header = f"""
-# 📊 TECHNICAL ANALYSIS - {ticker}
-
-**Analysis Date:** {datetime.now().strftime('%Y-%m-%d %H:%M')}  
-**Current Price:** ${price:,.2f}  
-**Market Direction:** {market_direction['primary']}  
-**Recommendation:** {market_direction['recommendation']}
-
----
-
-"""
-            else:
-                header = f"""
-# 📊 TECHNISCHE ANALYSE - {ticker}
-
-**Analysedatum:** {datetime.now().strftime('%d.%m.%Y %H:%M')} Uhr  
-**Aktueller Kurs:** ${price:,.2f}  
-**Marktrichtung:** {market_direction['primary']}  
-**Empfehlung:** {market_direction['recommendation']}
-
----
-
-"""
-            report = header + report
+            parts.append(_METADATA_HEADERS[key].format(
+                ticker=ticker,
+                date=now.strftime(header_format),
+                price=f"${price:,.2f}",
+                primary=market_direction['primary'],
+                recommendation=market_direction['recommendation']
+            ))
+        parts.append(report)
         
-        # Füge Footer hinzu wenn nicht vorhanden
+        # Füge Footer hinzu wenn nicht vorhanden (Header enthält keines der Stichwörter)
         if 'Disclaimer' not in report and 'Anlageberatung' not in report:
-            if language == 'en':
-                footer = f"""
-
----
-
-*Analysis created on {datetime.now().strftime('%Y-%m-%d at %H:%M:%S')}*  
-*All values are from technical analysis via yfinance.*  
-*Disclaimer: This analysis is for informational purposes only and does not constitute investment advice.*
-"""
-            else:
-                footer = f"""
-
----
-
-*Analyse erstellt am {datetime.now().strftime('%d.%m.%Y um %H:%M:%S Uhr')}*  
-*Alle Werte stammen aus der technischen Analyse von yfinance.*  
-*Disclaimer: Diese Analyse dient nur zu Informationszwecken und stellt keine Anlageberatung dar.*
-"""
-            report += footer
+            parts.append(_METADATA_FOOTERS[key].format(timestamp=now.strftime(footer_format)))
         
-        return report
+        return ''.join(parts)
 
-    def _generate_consistent_report(self, data: Dict, language: str = 'de') -> str:
-        """Generiert einen konsistenten Fallback-Bericht ohne LLM"""
+    def _generate_consistent_report(self, data: Dict, language: str = 'de', now: Optional[datetime] = None) -> str:
+        """Generiert einen konsistenten Fallback-Bericht ohne LLM in einem Durchlauf"""
         
         ticker = data['ticker']
         price = data['current_price']
+        # Kurs einmal formatieren, wird im Bericht mehrfach verwendet
+        price_str = f"${price:,.2f}"
         indicators = data['indicators']
         probabilities = data['probabilities']
         targets = data['targets']
         
         # Bestimme konsistente Marktrichtung basierend auf tatsächlichen Daten
         market_direction = self._determine_market_direction(indicators, probabilities, language)
+        primary = market_direction['primary']
+        strength = market_direction['strength']
+        factors = market_direction['factors']
+        
+        code = market_direction['code']
+        if code > 0:
+            direction = 'bullish'
+        elif code < 0:
+            direction = 'bearish'
+        else:
+            direction = 'neutral'
+        
+        # Indikatoren einmal durchlaufen und auf die drei Abschnitte verteilen
+        trend_lines = []
+        momentum_lines = []
+        volatility_lines = []
+        
+        ma = indicators.get('moving_averages') or {}
+        for period, value in sorted((ma.get('ema') or {}).items()):
+            if value:
+                trend_lines.append(f"• **EMA {period}:** ${value:,.2f}")
+        
+        adx = indicators.get('ADX')
+        if isinstance(adx, dict) and adx.get('adx'):
+            trend_strength = "Starker Trend" if adx['adx'] > 25 else "Schwacher Trend"
+            trend_lines.append(f"• **ADX:** {adx['adx']:.2f} ({trend_strength})")
+        
+        if indicators.get('VWAP'):
+            trend_lines.append(f"• **VWAP:** ${indicators['VWAP']:,.2f}")
+        
+        rsi = indicators.get('RSI')
+        if rsi:
+            status = "Überkauft" if rsi > 70 else "Überverkauft" if rsi < 30 else "Neutral"
+            momentum_lines.append(f"• **RSI (14):** {rsi:.2f} ({status})")
+        
+        macd = indicators.get('MACD')
+        if isinstance(macd, dict):
+            if macd.get('histogram') is not None:
+                signal = "Bullisch" if macd['histogram'] > 0 else "Bearisch"
+                momentum_lines.append(f"• **MACD Histogram:** {macd['histogram']:.4f} ({signal})")
+            if macd.get('macd') is not None and macd.get('signal') is not None:
+                momentum_lines.append(f"  - MACD: {macd['macd']:.4f}")
+                momentum_lines.append(f"  - Signal: {macd['signal']:.4f}")
+        
+        stoch = indicators.get('Stochastic')
+        if isinstance(stoch, dict) and stoch.get('K') is not None and stoch.get('D') is not None:
+            momentum_lines.append(f"• **Stochastic K/D:** {stoch['K']:.2f} / {stoch['D']:.2f}")
+        
+        if indicators.get('ATR'):
+            volatility_lines.append(f"• **ATR (14):** ${indicators['ATR']:.2f}")
+        
+        bb = indicators.get('Bollinger')
+        if isinstance(bb, dict) and bb.get('upper') and bb.get('lower'):
+            volatility_lines.append("• **Bollinger Bands:**")
+            volatility_lines.append(f"  - Upper: ${bb['upper']:,.2f}")
+            volatility_lines.append(f"  - Middle: ${bb.get('middle') or 0:,.2f}")
+            volatility_lines.append(f"  - Lower: ${bb['lower']:,.2f}")
+            if bb.get('width'):
+                volatility_lines.append(f"  - Width: {bb['width']:.2f}")
+        
+        # Trendbeschreibung mit den wichtigsten Faktoren
+        trend_description = _TREND_DESCRIPTIONS[direction]
+        if factors:
+            trend_description += f" Hauptfaktoren: {', '.join(factors[:2])}."
         
-        report = f"""
+        # Trading-Setup mit ATR-basiertem Stop und tatsächlichen Targets
+        atr = indicators.get('ATR', price * 0.01)
+        if direction == 'neutral':
+            setup = _NO_TRADE_SETUP
+        else:
+            entry = price
+            if direction == 'bullish':
+                stop_loss = price - (atr * 1.5)
+                direction_targets = targets.get('bullish', [])
+                defaults = (price * 1.02, price * 1.04)
+            else:
+                stop_loss = price + (atr * 1.5)
+                direction_targets = targets.get('bearish', [])
+                defaults = (price * 0.98, price * 0.96)
+            target1 = direction_targets[0]['price'] if len(direction_targets) > 0 else defaults[0]
+            target2 = direction_targets[1]['price'] if len(direction_targets) > 1 else defaults[1]
+            risk_reward = (target1 - entry) / (entry - stop_loss)
+            if direction == 'bearish':
+                risk_reward = abs(risk_reward)
+            setup = (f"### {'LONG Setup 📈' if direction == 'bullish' else 'SHORT Setup 📉'}\n"
+                     f"• **Entry:** {price_str} (aktueller Kurs)\n"
+                     f"• **Stop-Loss:** ${stop_loss:,.2f} (1.5x ATR)\n"
+                     f"• **Target 1:** ${target1:,.2f} (50% Position)\n"
+                     f"• **Target 2:** ${target2:,.2f} (50% Position)\n"
+                     f"• **Risk/Reward:** 1:{risk_reward:.1f}")
+        
+        risk_reward_rating = 'günstiges' if strength >= 6 else 'ungünstiges' if strength <= 4 else 'neutrales'
+        
+        parts = [
+            f"""
 # 📊 TECHNISCHE ANALYSE - {ticker}
 
-**Analysedatum:** {datetime.now().strftime('%d.%m.%Y %H:%M')} Uhr  
-**Aktueller Kurs:** ${price:,.2f}
-
----
-
-## 🎯 EXECUTIVE SUMMARY
-
-### Marktübersicht
-Der {ticker} notiert bei **${price:,.2f}**. {self._get_trend_description(indicators, market_direction)}
-
-### Konsistente Markteinschätzung
-**Primäre Richtung:** {market_direction['primary']}  
-**Trend-Stärke:** {market_direction['strength']}/10  
-**Empfehlung:** {market_direction['recommendation']}
-
----
-
-## 📈 TECHNISCHE INDIKATOREN
-
-### Trend-Indikatoren
-{self._format_trend_indicators(indicators)}
-
-### Momentum-Indikatoren
-{self._format_momentum_indicators(indicators)}
-
-### Volatilität
-{self._format_volatility_indicators(indicators)}
-
----
-
-## 💼 TRADING-SETUP
-
-{self._generate_trading_setup(data, market_direction)}
+**Analysedatum:** {(now or datetime.now()).strftime('%d.%m.%Y %H:%M')} Uhr  
+**Aktueller Kurs:** {price_str}
 
 ---
 
-## ⚖️ RISIKOMANAGEMENT
+## 🎯 EXECUTIVE SUMMARY
+
+### Marktübersicht
+Der {ticker} notiert bei **{price_str}**. {trend_description}
 
-{self._generate_risk_management(data, indicators)}
+### Konsistente Markteinschätzung
+**Primäre Richtung:** {primary}  
+**Trend-Stärke:** {strength}/10  
+**Empfehlung:** {market_direction['recommendation']}
 
 ---
 
-## 🎯 HANDLUNGSEMPFEHLUNGEN
+## 📈 TECHNISCHE INDIKATOREN
 
-{self._generate_action_items(data, market_direction)}
+### Trend-Indikatoren
+""",
+            '\n'.join(trend_lines) if trend_lines else "Keine Trend-Indikatoren verfügbar",
+            "\n\n### Momentum-Indikatoren\n",
+            '\n'.join(momentum_lines) if momentum_lines else "Keine Momentum-Indikatoren verfügbar",
+            "\n\n### Volatilität\n",
+            '\n'.join(volatility_lines) if volatility_lines else "Keine Volatilitäts-Indikatoren verfügbar",
+            "\n\n---\n\n## 💼 TRADING-SETUP\n\n",
+            setup,
+            "\n\n---\n\n## ⚖️ RISIKOMANAGEMENT\n\n",
+            _RISK_MANAGEMENT_TEMPLATE.format(atr=atr, extended_atr=atr * 1.5),
+            "\n\n---\n\n## 🎯 HANDLUNGSEMPFEHLUNGEN\n\n",
+            _ACTION_ITEMS[direction],
+            "\n\n---\n\n## 📊 ZUSAMMENFASSUNG\n\n",
+            f"""**Marktrichtung:** {primary}  
+**Trend-Stärke:** {strength}/10  
+**Primäre Empfehlung:** {market_direction['recommendation']}
 
----
+**Wichtigste Faktoren:**
+""",
+            '• ' + '\n• '.join(factors[:3]) if factors else '',
+            f"""
 
-## 📊 ZUSAMMENFASSUNG
+**Risk/Reward Einschätzung:**
+Der aktuelle Setup bietet ein {risk_reward_rating} Risk/Reward Verhältnis.
 
-{self._generate_summary(data, market_direction)}
+⚠️ **Disclaimer:** Diese Analyse basiert auf technischen Indikatoren und stellt keine Anlageberatung dar.
 
 ---
 *Dieser Bericht basiert auf den tatsächlichen Marktdaten und technischen Indikatoren.*  
 *Alle Werte wurden direkt aus der yfinance-Analyse übernommen.*
 """
-        return report
+        ]
+        return ''.join(parts)
 
     def _determine_market_direction(self, indicators: Dict, probabilities: Dict, language: str = 'de') -> Dict:
         """Bestimmt konsistent die Marktrichtung basierend auf echten Daten"""
         
-        score = 0
-        factors = []
-        
-        # RSI Bewertung
         rsi = indicators.get('RSI')
-        if rsi:
+        macd = indicators.get('MACD') or {}
+        hist = macd.get('histogram')
+        bullish_prob = probabilities.get('bullish_probability', 33)
+        bearish_prob = probabilities.get('bearish_probability', 33)
+        
+        # Numerischer Score im (optional JIT-kompilierten) Kernel
+        score = int(_direction_score(
+            float(rsi) if rsi else np.nan,
+            float(hist) if hist is not None else np.nan,
+            float(bullish_prob),
+            float(bearish_prob)
+        ))
+        
+        # Begründungen für den Bericht
+        factors = []
+        if rsi and rsi == rsi:
             if rsi > 70:
-                score -= 2
                 factors.append(f"RSI überkauft ({rsi:.2f})")
             elif rsi > 50:
-                score += 1
                 factors.append(f"RSI bullisch ({rsi:.2f})")
             elif rsi < 30:
-                score += 2
                 factors.append(f"RSI überverkauft ({rsi:.2f})")
             else:
-                score -= 1
                 factors.append(f"RSI bearisch ({rsi:.2f})")
         
-        # MACD Bewertung
-        macd = indicators.get('MACD', {})
-        if macd and macd.get('histogram') is not None:
-            hist = macd['histogram']
+        if hist is not None and hist == hist:
             if hist > 0:
-                score += 2
                 factors.append(f"MACD positiv ({hist:.4f})")
             else:
-                score -= 2
                 factors.append(f"MACD negativ ({hist:.4f})")
         
-        # Wahrscheinlichkeiten
-        bullish_prob = probabilities.get('bullish_probability', 33)
-        bearish_prob = probabilities.get('bearish_probability', 33)
-        
         if bullish_prob > bearish_prob * 1.5:
-            score += 2
             factors.append(f"Bullische Signale dominieren ({bullish_prob:.1f}%)")
         elif bearish_prob > bullish_prob * 1.5:
-            score -= 2
             factors.append(f"Bearische Signale dominieren ({bearish_prob:.1f}%)")
         
+        # Sprachunabhängiger Richtungscode: 2 = stark bullisch ... -2 = stark bearisch
+        if score >= 3:
+            code = 2
+        elif score >= 1:
+            code = 1
+        elif score >= -1:
+            code = 0
+        elif score >= -3:
+            code = -1
+        else:
+            code = -2
+        
         # Bestimme finale Richtung basierend auf Sprache
         if language == 'en':
             if score >= 3:
@@ -544,396 +1547,104 @@ Der {ticker} notiert bei **${price:,.2f}**. {self._get_trend_description(indicat
             'recommendation': recommendation,
             'strength': strength,
             'score': score,
+            'code': code,
             'factors': factors
         }
 
-    def _get_trend_description(self, indicators: Dict, market_direction: Dict) -> str:
-        """Generiert konsistente Trendbeschreibung"""
-        
-        direction = market_direction['primary']
-        factors = market_direction['factors']
-        
-        if 'BULLISCH' in direction:
-            base = "Die technischen Indikatoren zeigen eine bullische Tendenz."
-        elif 'BEARISCH' in direction:
-            base = "Die technischen Indikatoren zeigen eine bearische Tendenz."
-        else:
-            base = "Der Markt befindet sich in einer neutralen Phase ohne klare Richtung."
-        
-        # Füge wichtigste Faktoren hinzu
-        if factors:
-            base += f" Hauptfaktoren: {', '.join(factors[:2])}."
-        
-        return base
-
-    def _format_trend_indicators(self, indicators: Dict) -> str:
-        """Formatiert Trend-Indikatoren"""
-        lines = []
-        
-        # Moving Averages
-        if 'moving_averages' in indicators:
-            ma = indicators['moving_averages']
-            if 'ema' in ma:
-                for period, value in sorted(ma['ema'].items()):
-                    if value:
-                        lines.append(f"• **EMA {period}:** ${value:,.2f}")
-        
-        # ADX
-        if 'ADX' in indicators:
-            adx = indicators['ADX']
-            if isinstance(adx, dict) and adx.get('adx'):
-                trend_strength = "Starker Trend" if adx['adx'] > 25 else "Schwacher Trend"
-                lines.append(f"• **ADX:** {adx['adx']:.2f} ({trend_strength})")
-        
-        # VWAP (nur wenn vorhanden)
-        if 'VWAP' in indicators and indicators['VWAP']:
-            lines.append(f"• **VWAP:** ${indicators['VWAP']:,.2f}")
-        
-        return '\n'.join(lines) if lines else "Keine Trend-Indikatoren verfügbar"
-
-    def _format_momentum_indicators(self, indicators: Dict) -> str:
-        """Formatiert Momentum-Indikatoren"""
-        lines = []
-        
-        # RSI
-        if 'RSI' in indicators and indicators['RSI']:
-            rsi = indicators['RSI']
-            status = "Überkauft" if rsi > 70 else "Überverkauft" if rsi < 30 else "Neutral"
-            lines.append(f"• **RSI (14):** {rsi:.2f} ({status})")
-        
-        # MACD
-        if 'MACD' in indicators:
-            macd = indicators['MACD']
-            if isinstance(macd, dict):
-                if macd.get('histogram') is not None:
-                    signal = "Bullisch" if macd['histogram'] > 0 else "Bearisch"
-                    lines.append(f"• **MACD Histogram:** {macd['histogram']:.4f} ({signal})")
-                if macd.get('macd') is not None and macd.get('signal') is not None:
-                    lines.append(f"  - MACD: {macd['macd']:.4f}")
-                    lines.append(f"  - Signal: {macd['signal']:.4f}")
-        
-        # Stochastic
-        if 'Stochastic' in indicators:
-            stoch = indicators['Stochastic']
-            if isinstance(stoch, dict):
-                if stoch.get('K') is not None and stoch.get('D') is not None:
-                    lines.append(f"• **Stochastic K/D:** {stoch['K']:.2f} / {stoch['D']:.2f}")
-        
-        return '\n'.join(lines) if lines else "Keine Momentum-Indikatoren verfügbar"
-
-    def _format_volatility_indicators(self, indicators: Dict) -> str:
-        """Formatiert Volatilitäts-Indikatoren"""
-        lines = []
-        
-        # ATR
-        if 'ATR' in indicators and indicators['ATR']:
-            atr = indicators['ATR']
-            lines.append(f"• **ATR (14):** ${atr:.2f}")
-        
-        # Bollinger Bands
-        if 'Bollinger' in indicators:
-            bb = indicators['Bollinger']
-            if isinstance(bb, dict):
-                if bb.get('upper') and bb.get('lower'):
-                    lines.append(f"• **Bollinger Bands:**")
-                    lines.append(f"  - Upper: ${bb['upper']:,.2f}")
-                    lines.append(f"  - Middle: ${bb.get('middle', 0):,.2f}")
-                    lines.append(f"  - Lower: ${bb['lower']:,.2f}")
-                    if bb.get('width'):
-                        lines.append(f"  - Width: {bb['width']:.2f}")
-        
-        return '\n'.join(lines) if lines else "Keine Volatilitäts-Indikatoren verfügbar"
-
-    def _generate_trading_setup(self, data: Dict, market_direction: Dict) -> str:
-        """Generiert konsistentes Trading-Setup"""
-        
-        price = data['current_price']
-        indicators = data['indicators']
-        targets = data['targets']
-        
-        # Bestimme Entry basierend auf Marktrichtung
-        if 'BULLISCH' in market_direction['primary']:
-            # Long Setup
-            atr = indicators.get('ATR', price * 0.01)
-            entry = price
-            stop_loss = price - (atr * 1.5)
-            
-            # Verwende tatsächliche Targets aus Daten
-            bullish_targets = targets.get('bullish', [])
-            if bullish_targets:
-                target1 = bullish_targets[0]['price'] if len(bullish_targets) > 0 else price * 1.02
-                target2 = bullish_targets[1]['price'] if len(bullish_targets) > 1 else price * 1.04
-            else:
-                target1 = price * 1.02
-                target2 = price * 1.04
-            
-            setup = f"""### LONG Setup 📈
-• **Entry:** ${entry:,.2f} (aktueller Kurs)
-• **Stop-Loss:** ${stop_loss:,.2f} (1.5x ATR)
-• **Target 1:** ${target1:,.2f} (50% Position)
-• **Target 2:** ${target2:,.2f} (50% Position)
-• **Risk/Reward:** 1:{((target1 - entry) / (entry - stop_loss)):.1f}"""
-            
-        elif 'BEARISCH' in market_direction['primary']:
-            # Short Setup
-            atr = indicators.get('ATR', price * 0.01)
-            entry = price
-            stop_loss = price + (atr * 1.5)
-            
-            # Verwende tatsächliche Targets aus Daten
-            bearish_targets = targets.get('bearish', [])
-            if bearish_targets:
-                target1 = bearish_targets[0]['price'] if len(bearish_targets) > 0 else price * 0.98
-                target2 = bearish_targets[1]['price'] if len(bearish_targets) > 1 else price * 0.96
-            else:
-                target1 = price * 0.98
-                target2 = price * 0.96
-            
-            setup = f"""### SHORT Setup 📉
-• **Entry:** ${entry:,.2f} (aktueller Kurs)
-• **Stop-Loss:** ${stop_loss:,.2f} (1.5x ATR)
-• **Target 1:** ${target1:,.2f} (50% Position)
-• **Target 2:** ${target2:,.2f} (50% Position)
-• **Risk/Reward:** 1:{abs((entry - target1) / (stop_loss - entry)):.1f}"""
-            
-        else:
-            # Neutral - kein Trade
-            setup = """### KEIN TRADE ⏸️
-• **Grund:** Keine klare Marktrichtung
-• **Empfehlung:** Warten auf eindeutige Signale
-• **Beobachten:** RSI-Divergenzen, MACD-Kreuzungen, Volumen-Spikes"""
-        
-        return setup
-
-    def _generate_risk_management(self, data: Dict, indicators: Dict) -> str:
-        """Generiert Risikomanagement-Empfehlungen"""
-        
-        atr = indicators.get('ATR', data['current_price'] * 0.01)
-        
-        return f"""### Position Sizing
-• **Risiko pro Trade:** Max. 2% des Portfolios
-• **ATR-basierter Stop:** ${atr:.2f} (1x ATR)
-• **Erweiteter Stop:** ${atr * 1.5:.2f} (1.5x ATR)
-• **Max. Positionsgröße:** Bei $100,000 Kapital = $2,000 Risiko
-
-### Stop-Loss Regeln
-• **Initial Stop:** 1.5x ATR vom Entry
-• **Trailing Stop:** Aktivieren bei +1R Gewinn
-• **Break-Even:** Nachziehen bei +2R Gewinn
-
-### Warnsignale für Exit
-• RSI-Divergenz zum Preis
-• MACD-Kreuzung gegen Position
-• Volumen-Spike gegen Trend
-• Durchbruch wichtiger Support/Resistance"""
-
-    def _generate_action_items(self, data: Dict, market_direction: Dict) -> str:
-        """Generiert konkrete Handlungsempfehlungen"""
-        
-        if 'BULLISCH' in market_direction['primary']:
-            actions = """### ✅ Sofort-Aktionen
-1. **Long-Position vorbereiten** (noch nicht ausführen)
-2. **Stop-Loss berechnen** (1.5x ATR)
-3. **Position Size festlegen** (2% Risiko)
-
-### 📊 Monitoring
-• RSI auf Überkauf achten (>70)
-• MACD-Momentum beobachten
-• Volumen bei Ausbrüchen prüfen
-
-### ⚠️ Exit-Signale
-• RSI > 80 (Teilgewinn)
-• MACD dreht negativ (Vollständiger Exit)
-• Durchbruch unter wichtigen Support"""
-            
-        elif 'BEARISCH' in market_direction['primary']:
-            actions = """### ✅ Sofort-Aktionen
-1. **Long-Positionen reduzieren**
-2. **Short-Setup vorbereiten**
-3. **Defensive Stops setzen**
-
-### 📊 Monitoring
-• RSI auf Überverkauf achten (<30)
-• MACD-Divergenzen suchen
-• Support-Level beobachten
-
-### ⚠️ Exit-Signale
-• RSI < 20 (Teilgewinn bei Shorts)
-• MACD dreht positiv
-• Durchbruch über Resistance"""
-            
-        else:
-            actions = """### ✅ Sofort-Aktionen
-1. **Keine neuen Positionen**
-2. **Bestehende Positionen halten**
-3. **Auf klare Signale warten**
-
-### 📊 Monitoring
-• Ausbruch aus Range beobachten
-• Volumen-Anstieg abwarten
-• Trend-Bestätigung suchen
-
-### ⚠️ Trigger für Action
-• RSI verlässt 40-60 Range
-• MACD-Kreuzung
-• Ausbruch mit Volumen"""
-        
-        return actions
-
-    def _generate_summary(self, data: Dict, market_direction: Dict) -> str:
-        """Generiert konsistente Zusammenfassung"""
-        
-        return f"""**Marktrichtung:** {market_direction['primary']}  
-**Trend-Stärke:** {market_direction['strength']}/10  
-**Primäre Empfehlung:** {market_direction['recommendation']}
-
-**Wichtigste Faktoren:**
-{chr(10).join(f"• {factor}" for factor in market_direction['factors'][:3])}
-
-**Risk/Reward Einschätzung:**
-Der aktuelle Setup bietet ein {'günstiges' if market_direction['strength'] >= 6 else 'ungünstiges' if market_direction['strength'] <= 4 else 'neutrales'} Risk/Reward Verhältnis.
-
-⚠️ **Disclaimer:** Diese Analyse basiert auf technischen Indikatoren und stellt keine Anlageberatung dar."""
-
     def _generate_fallback_report(self, language: str = 'de') -> str:
         """Generiert einen Fallback-Bericht wenn LLM nicht verfügbar"""
-        if language == 'en':
-            return """
-# 📊 MARKET ANALYSIS REPORT
-## Status: Basic Analysis (LLM not available)
-
-Technical indicators have been successfully calculated.
-Please check the Charts and Indicators tabs for details.
-
-⚠️ For advanced AI analysis, make sure the LLM server is running.
-"""
-        else:
-            return """
-# 📊 MARKTANALYSE-BERICHT
-## Status: Basis-Analyse (LLM nicht verfügbar)
-
-Die technischen Indikatoren wurden erfolgreich berechnet.
-Bitte prüfen Sie die Charts und Indikatoren-Tabs für Details.
-
-⚠️ Für erweiterte AI-Analyse stellen Sie sicher, dass der LLM-Server läuft.
-"""
+        return _FALLBACK_REPORTS['en' if language == 'en' else 'de']
 
     # Kompatibilitäts-Methoden
+    def _indicator_messages(self, indicators: Dict, data_summary: Dict, language: str = 'de') -> list:
+        """Baut die Nachrichten für die Indikator-Analyse"""
+        validated_indicators = self._validate_indicators(indicators)
+        current_price = data_summary.get('current_price', 0)
+        
+        return _analysis_messages(
+            'indicator', language,
+            current_price=current_price,
+            atr=validated_indicators.get('ATR', 'N/A'),
+            indicators=_dumps(_project(validated_indicators, 'indicator'), indent=False)
+        )
+
     def analyze_indicators(self, indicators: Dict, data_summary: Dict, max_tokens: int = None, language: str = 'de') -> str:
         """Analysiert technische Indikatoren mit LLM"""
         try:
-            validated_indicators = self._validate_indicators(indicators)
-            current_price = data_summary.get('current_price', 0)
-            
-            if language == 'en':
-                prompt = f"""
-            Analyze these technical indicators for a professional trading decision.
-            
-            Current Price: ${current_price:.2f}
-            
-            VALIDATED INDICATORS (use EXACTLY these values):
-            {json.dumps(validated_indicators, indent=2, default=str)[:2000]}
-            
-            Create a structured analysis with:
-            1. Market direction and trend (based on the data)
-            2. Specific entry/exit points with prices
-            3. Stop-loss recommendation with ATR reasoning (ATR: {validated_indicators.get('ATR', 'N/A')})
-            4. Risk/Reward ratio
-            
-            IMPORTANT:
-            - Use ONLY the given indicator values
-            - Be consistent in your assessment
-            - No invented numbers
-            - Format prices as $X,XXX.XX
-            """
-            else:
-                prompt = f"""
-            Analysiere diese technischen Indikatoren für eine professionelle Trading-Entscheidung.
-            
-            Aktueller Kurs: ${current_price:.2f}
-            
-            VALIDIERTE INDIKATOREN (verwende EXAKT diese Werte):
-            {json.dumps(validated_indicators, indent=2, default=str)[:2000]}
-            
-            Erstelle eine strukturierte Analyse mit:
-            1. Marktrichtung und Trend (basierend auf den Daten)
-            2. Konkrete Entry/Exit Punkte mit Preisen
-            3. Stop-Loss Empfehlung mit ATR-Begründung (ATR: {validated_indicators.get('ATR', 'N/A')})
-            4. Risk/Reward Verhältnis
-            
-            WICHTIG:
-            - Verwende NUR die gegebenen Indikatorwerte
-            - Sei konsistent in deiner Einschätzung
-            - Keine erfundenen Zahlen
-            - Formatiere Preise als $X,XXX.XX
-            """
-            
-            messages = [
-                {"role": "system", "content": "You are a technical analyst. ALWAYS use the exact values from the data." if language == 'en' else "Du bist ein technischer Analyst. Verwende IMMER die exakten Werte aus den Daten."},
-                {"role": "user", "content": prompt}
-            ]
-            
+            messages = self._indicator_messages(indicators, data_summary, language)
             return self._make_request(messages, temperature=0.3, max_tokens=max_tokens or 1500)
             
         except Exception as e:
             return f"⚠️ Indikator-Analyse-Fehler: {str(e)}"
 
+    def analyze_indicators_stream(self, indicators: Dict, data_summary: Dict, max_tokens: int = None,
+                                  language: str = 'de') -> Iterator[str]:
+        """Wie analyze_indicators, liefert die Antwort aber stückweise während der Generierung"""
+        try:
+            messages = self._indicator_messages(indicators, data_summary, language)
+        except Exception as e:
+            yield f"⚠️ Indikator-Analyse-Fehler: {str(e)}"
+            return
+        yield from self._make_request_stream(messages, temperature=0.3, max_tokens=max_tokens or 1500)
+
+    def analyze_indicators_batch(self, batch: List[Dict], max_tokens: int = None, language: str = 'de') -> List[str]:
+        """
+        Analysiert die Indikatoren mehrerer Symbole in einer einzigen LLM-Anfrage
+        
+        batch: Liste von Dicts mit 'ticker', 'indicators' und 'data_summary'
+        Liefert einen Bericht pro Symbol in derselben Reihenfolge; passt die Antwort
+        nicht zum erwarteten JSON, wird jedes Symbol einzeln analysiert.
+        """
+        if not batch:
+            return []
+        
+        key = 'en' if language == 'en' else 'de'
+        try:
+            symbols = [{
+                'symbol': item.get('ticker', f'#{i + 1}'),
+                'current_price': round(float((item.get('data_summary') or {}).get('current_price', 0)), 2),
+                'indicators': _project(self._validate_indicators(item.get('indicators') or {}), 'indicator')
+            } for i, item in enumerate(batch)]
+            messages = _analysis_messages(
+                'indicator_batch', language,
+                count=len(symbols),
+                symbols=_dumps(symbols, indent=False)
+            )
+            content = self._make_request(messages, temperature=0.3,
+                                         max_tokens=max_tokens or min(400 * len(batch) + 200, self._max_tokens_cap))
+            analyses = _parse_batch_analyses(content, len(batch))
+        except Exception as e:
+            print(f"⚠️ Batch-Analyse-Fehler: {str(e)}")
+            analyses = None
+        
+        if analyses is None:
+            return [self.analyze_indicators(item.get('indicators') or {}, item.get('data_summary') or {},
+                                            language=language) for item in batch]
+        
+        return [_INDICATOR_BATCH_REPORT[key].format(
+            symbol=symbol['symbol'],
+            direction=analysis.get('direction', 'N/A'),
+            entry=_format_price(analysis.get('entry')),
+            stop=_format_price(analysis.get('stop')),
+            target=_format_price(analysis.get('target')),
+            rr=f"{analysis['rr']:.1f}" if isinstance(analysis.get('rr'), (int, float)) else analysis.get('rr', 'N/A'),
+            comment=analysis.get('comment', '')
+        ).rstrip() for symbol, analysis in zip(symbols, analyses)]
+
     def analyze_probabilities(self, probabilities: Dict, targets: Dict, sentiment: str, max_tokens: int = None, language: str = 'de') -> str:
         """Analysiert Wahrscheinlichkeiten und Kursziele mit LLM"""
         try:
-            if language == 'en':
-                prompt = f"""
-            Analyze these probabilities for a trading strategy.
-            
-            PROBABILITIES:
-            - Bullish: {probabilities.get('bullish_probability', 0):.1f}% ({probabilities.get('bullish_signals', 0)} signals)
-            - Bearish: {probabilities.get('bearish_probability', 0):.1f}% ({probabilities.get('bearish_signals', 0)} signals)
-            - Neutral: {probabilities.get('neutral_probability', 0):.1f}% ({probabilities.get('neutral_signals', 0)} signals)
-            - Sentiment: {sentiment}
-            
-            PRICE TARGETS:
-            {json.dumps(targets, indent=2, default=str)[:1000]}
-            
-            Provide specific trading recommendations with:
-            1. Positioning (Long/Short/Neutral) based on probabilities
-            2. Entry strategy
-            3. Profit-taking plan with the given price targets
-            4. Risk management
-            
-            IMPORTANT:
-            - Interpret probabilities correctly
-            - Use actual price targets from the data
-            - Be consistent with the sentiment
-            """
-            else:
-                prompt = f"""
-            Analysiere diese Wahrscheinlichkeiten für eine Trading-Strategie.
-            
-            WAHRSCHEINLICHKEITEN:
-            - Bullisch: {probabilities.get('bullish_probability', 0):.1f}% ({probabilities.get('bullish_signals', 0)} Signale)
-            - Bearisch: {probabilities.get('bearish_probability', 0):.1f}% ({probabilities.get('bearish_signals', 0)} Signale)
-            - Neutral: {probabilities.get('neutral_probability', 0):.1f}% ({probabilities.get('neutral_signals', 0)} Signale)
-            - Sentiment: {sentiment}
-            
-            KURSZIELE:
-            {json.dumps(targets, indent=2, default=str)[:1000]}
-            
-            Gib konkrete Handelsempfehlungen mit:
-            1. Positionierung (Long/Short/Neutral) basierend auf den Wahrscheinlichkeiten
-            2. Einstiegsstrategie
-            3. Gewinnmitnahme-Plan mit den gegebenen Kurszielen
-            4. Risikomanagement
-            
-            WICHTIG:
-            - Interpretiere die Wahrscheinlichkeiten korrekt
-            - Nutze die tatsächlichen Kursziele aus den Daten
-            - Sei konsistent mit dem Sentiment
-            """
-            
-            messages = [
-                {"role": "system", "content": "You are a risk analyst. Base your recommendations on the given probabilities." if language == 'en' else "Du bist ein Risikoanalyst. Basiere deine Empfehlungen auf den gegebenen Wahrscheinlichkeiten."},
-                {"role": "user", "content": prompt}
-            ]
+            messages = _analysis_messages(
+                'probability', language,
+                bullish=probabilities.get('bullish_probability', 0),
+                bullish_signals=probabilities.get('bullish_signals', 0),
+                bearish=probabilities.get('bearish_probability', 0),
+                bearish_signals=probabilities.get('bearish_signals', 0),
+                neutral=probabilities.get('neutral_probability', 0),
+                neutral_signals=probabilities.get('neutral_signals', 0),
+                sentiment=sentiment,
+                targets=_dumps(_truncate_for_prompt(targets), indent=False)
+            )
             
             return self._make_request(messages, temperature=0.3, max_tokens=max_tokens or 1200)
             
@@ -942,94 +1653,64 @@ Bitte prüfen Sie die Charts und Indikatoren-Tabs für Details.
 
     def _interpret_probabilities(self, bullish: float, bearish: float, neutral: float) -> str:
         """Interpretiert Wahrscheinlichkeiten"""
-        if neutral > 50:
-            return "Die hohe Neutralität deutet auf eine Konsolidierungsphase hin. Der Markt zeigt keine klare Richtung."
-        elif bullish > bearish * 1.5:
-            return "Bullische Signale dominieren deutlich. Der Markt zeigt Aufwärtspotential."
-        elif bearish > bullish * 1.5:
-            return "Bearische Signale dominieren. Vorsicht ist geboten."
-        else:
-            return "Die Signale sind ausgewogen. Keine klare Tendenz erkennbar."
+        codes = _classify_probabilities(np.array([bullish], dtype=np.float64),
+                                        np.array([bearish], dtype=np.float64),
+                                        np.array([neutral], dtype=np.float64))
+        return _PROBABILITY_INTERPRETATIONS[codes[0]]
 
     def _get_probability_recommendation(self, bullish: float, bearish: float, neutral: float) -> str:
         """Gibt Empfehlung basierend auf Wahrscheinlichkeiten"""
-        if neutral > 50:
-            return "**ABWARTEN** und beobachten"
-        elif bullish > 60:
-            return "**KAUFEN** - Bullische Signale überwiegen"
-        elif bearish > 60:
-            return "**VERKAUFEN** - Bearische Signale überwiegen"
-        else:
-            return "**VORSICHTIG AGIEREN** - Keine eindeutige Richtung"
+        codes = _recommend_probabilities(np.array([bullish], dtype=np.float64),
+                                         np.array([bearish], dtype=np.float64),
+                                         np.array([neutral], dtype=np.float64))
+        return _PROBABILITY_RECOMMENDATIONS[codes[0]]
 
     def analyze_fibonacci_support_resistance(self, fibonacci_levels: Dict, support_resistance: Dict, max_tokens: int = None, language: str = 'de') -> str:
         """Analysiert Fibonacci Levels und Support/Resistance mit LLM"""
         try:
             current_price = support_resistance.get('current_price', 0)
             
-            if language == 'en':
-                prompt = f"""
-            Analyze these technical levels for precise trading.
-            
-            Current Price: ${current_price:.2f}
-            
-            FIBONACCI LEVELS:
-            {json.dumps(fibonacci_levels, indent=2, default=str)[:800]}
-            
-            SUPPORT & RESISTANCE:
-            Support: {support_resistance.get('support', [])[:5]}
-            Resistance: {support_resistance.get('resistance', [])[:5]}
-            
-            Identify:
-            1. Critical Support/Resistance zones with exact prices from the data
-            2. Confluence areas (where multiple levels converge)
-            3. Trading strategies for each zone
-            4. Entry/Exit/Stop-Loss points with specific prices
-            5. Breakout/Breakdown scenarios
-            
-            IMPORTANT:
-            - Use ONLY the given levels
-            - No invented prices
-            - Format as $X,XXX.XX
-            - Reference actual Support/Resistance from the data
-            """
-            else:
-                prompt = f"""
-            Analysiere diese technischen Level für präzises Trading.
-            
-            Aktueller Kurs: ${current_price:.2f}
-            
-            FIBONACCI LEVELS:
-            {json.dumps(fibonacci_levels, indent=2, default=str)[:800]}
-            
-            SUPPORT & RESISTANCE:
-            Support: {support_resistance.get('support', [])[:5]}
-            Resistance: {support_resistance.get('resistance', [])[:5]}
-            
-            Identifiziere:
-            1. Kritische Support/Resistance Zonen mit exakten Preisen aus den Daten
-            2. Confluence-Bereiche (wo mehrere Level zusammentreffen)
-            3. Trading-Strategien für jede Zone
-            4. Entry/Exit/Stop-Loss Punkte mit konkreten Preisen
-            5. Breakout/Breakdown Szenarien
-            
-            WICHTIG:
-            - Verwende NUR die gegebenen Level
-            - Keine erfundenen Preise
-            - Formatiere als $X,XXX.XX
-            - Beziehe dich auf die tatsächlichen Support/Resistance aus den Daten
-            """
-            
-            messages = [
-                {"role": "system", "content": "You are a technical analyst specialized in Fibonacci and Support/Resistance. ALWAYS use the exact levels from the data." if language == 'en' else "Du bist ein technischer Analyst spezialisiert auf Fibonacci und Support/Resistance. Verwende IMMER die exakten Level aus den Daten."},
-                {"role": "user", "content": prompt}
-            ]
+            messages = _analysis_messages(
+                'levels', language,
+                current_price=current_price,
+                fibonacci=_dumps(_truncate_for_prompt(fibonacci_levels), indent=False),
+                support=_format_levels(support_resistance.get('support')),
+                resistance=_format_levels(support_resistance.get('resistance'))
+            )
             
             return self._make_request(messages, temperature=0.3, max_tokens=max_tokens or 1800)
             
         except Exception as e:
             return f"⚠️ Fibonacci/SR-Analyse-Fehler: {str(e)}"
 
+    def analyze_all(self, indicators: Dict, data_summary: Dict, probabilities: Dict = None, targets: Dict = None,
+                    sentiment: str = "Neutral", fibonacci_levels: Dict = None, support_resistance: Dict = None,
+                    max_tokens: Dict[str, int] = None, language: str = 'de') -> Dict[str, str]:
+        """
+        Führt Indikator-, Wahrscheinlichkeits- und Fibonacci/SR-Analyse parallel aus
+        
+        Die Wahrscheinlichkeitsanalyse läuft nur mit Wahrscheinlichkeiten und Kurszielen,
+        die Fibonacci/SR-Analyse nur mit mindestens einer der beiden Level-Quellen.
+        
+        Returns:
+            Dict mit den Schlüsseln 'indicators' sowie ggf. 'probabilities' und 'fibonacci'
+        """
+        max_tokens = max_tokens or {}
+        jobs = {
+            'indicators': (self.analyze_indicators, (indicators, data_summary, max_tokens.get('indicators'), language))
+        }
+        if probabilities and targets:
+            jobs['probabilities'] = (self.analyze_probabilities,
+                                     (probabilities, targets, sentiment, max_tokens.get('probabilities'), language))
+        if fibonacci_levels or support_resistance:
+            jobs['fibonacci'] = (self.analyze_fibonacci_support_resistance,
+                                 (fibonacci_levels or {}, support_resistance or {}, max_tokens.get('fibonacci'), language))
+        
+        # Die Anfragen sind unabhängig; der Server kann sie gemeinsam abarbeiten
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            futures = {name: executor.submit(func, *args) for name, (func, args) in jobs.items()}
+            return {name: future.result() for name, future in futures.items()}
+
     def generate_market_report(self, full_analysis: Dict, max_tokens: int = None, language: str = 'de') -> str:
         """Wrapper für Kompatibilität"""
         return self.generate_comprehensive_report(full_analysis, max_tokens, language)
@@ -1038,71 +1719,85 @@ Bitte prüfen Sie die Charts und Indikatoren-Tabs für Details.
         """Wrapper für Kompatibilität"""
         return self.generate_comprehensive_report(full_analysis, max_tokens, language)
     
+    def _question_messages(self, question: str, context: Dict, language: str = 'de') -> tuple:
+        """Baut die Nachrichten für eine Frage und den Schlüssel des zugehörigen Analyse-Kontexts"""
+        validated_context = self._prepare_data_for_json(context)
+        validated_indicators = _project(self._validate_indicators(validated_context.get('indicators', {})), 'question')
+        
+        patterns = validated_context.get('patterns')
+        pattern_statistics = patterns.get('statistics', {}) if patterns else None
+        messages = _analysis_messages(
+            'question', language,
+            indicators=_dumps(validated_indicators, indent=False),
+            probabilities=_dumps(validated_context.get('probabilities', {}), indent=False),
+            sentiment=validated_context.get('sentiment', 'Neutral'),
+            patterns=_dumps(pattern_statistics, indent=False) if patterns else _NO_DATA.get(language, _NO_DATA['de']),
+            question=question
+        )
+        
+        # Schlüssel über exakt die Daten, die der Prompt enthält (ohne die Frage)
+        context_key = hashlib.blake2b(_dumps_bytes([
+            language,
+            validated_indicators,
+            validated_context.get('probabilities', {}),
+            validated_context.get('sentiment', 'Neutral'),
+            pattern_statistics
+        ]), digest_size=16).digest()
+        
+        return messages, context_key
+
     def answer_question(self, question: str, context: Dict, max_tokens: int = None, language: str = 'de') -> str:
         """Beantwortet Fragen basierend auf Analyse-Kontext mit LLM"""
         try:
-            validated_context = self._prepare_data_for_json(context)
-            validated_indicators = self._validate_indicators(validated_context.get('indicators', {}))
-            
-            if language == 'en':
-                prompt = f"""
-            Answer this question based on the technical analysis:
-            
-            QUESTION: {question}
-            
-            ANALYSIS CONTEXT:
-            
-            Indicators:
-            {json.dumps(validated_indicators, indent=2, default=str)[:1000]}
-            
-            Probabilities:
-            {json.dumps(validated_context.get('probabilities', {}), indent=2)}
-            
-            Sentiment:
-            {validated_context.get('sentiment', 'Neutral')}
+            messages, context_key = self._question_messages(question, context, language)
             
-            Patterns (if available):
-            {json.dumps(validated_context.get('patterns', {}).get('statistics', {}), indent=2) if validated_context.get('patterns') else 'None'}
+            # Ähnlich formulierte Fragen zu exakt denselben Daten aus dem semantischen Cache beantworten
+            embedding = self._embed_question(question)
+            if embedding is not None:
+                cached = self._lookup_similar_answer(context_key, embedding)
+                if cached is not None:
+                    return cached
             
-            INSTRUCTIONS:
-            - Give a brief, precise answer based on the data
-            - Use actual values from the analysis
-            - Be honest if the data doesn't allow a clear answer
-            - Format prices as $X,XXX.XX
-            """
-            else:
-                prompt = f"""
-            Beantworte diese Frage basierend auf der technischen Analyse:
-            
-            FRAGE: {question}
-            
-            KONTEXT DER ANALYSE:
-            
-            Indikatoren:
-            {json.dumps(validated_indicators, indent=2, default=str)[:1000]}
-            
-            Wahrscheinlichkeiten:
-            {json.dumps(validated_context.get('probabilities', {}), indent=2)}
-            
-            Sentiment:
-            {validated_context.get('sentiment', 'Neutral')}
-            
-            Patterns (falls vorhanden):
-            {json.dumps(validated_context.get('patterns', {}).get('statistics', {}), indent=2) if validated_context.get('patterns') else 'Keine'}
+            answer = self._make_request(messages, temperature=0.5, max_tokens=max_tokens or 800)
             
-            ANWEISUNGEN:
-            - Gib eine kurze, präzise Antwort basierend auf den Daten
-            - Verwende die tatsächlichen Werte aus der Analyse
-            - Sei ehrlich wenn die Daten keine klare Antwort erlauben
-            - Formatiere Preise als $X,XXX.XX
-            """
-            
-            messages = [
-                {"role": "system", "content": "You are a helpful trading assistant. Answer questions based on the technical data." if language == 'en' else "Du bist ein hilfreicher Trading-Assistent. Beantworte Fragen basierend auf den technischen Daten."},
-                {"role": "user", "content": prompt}
-            ]
-            
-            return self._make_request(messages, temperature=0.5, max_tokens=max_tokens or 800)
+            if embedding is not None and answer and answer != self._generate_fallback_report():
+                self._store_answer(context_key, embedding, answer)
+            return answer
             
         except Exception as e:
             return f"Fehler bei der Antwort: {str(e)}"
+
+    def answer_question_stream(self, question: str, context: Dict, max_tokens: int = None,
+                               language: str = 'de') -> Iterator[str]:
+        """Wie answer_question, liefert die Antwort aber stückweise (z.B. für st.write_stream)"""
+        try:
+            messages, context_key = self._question_messages(question, context, language)
+        except Exception as e:
+            yield f"Fehler bei der Antwort: {str(e)}"
+            return
+        
+        # Dieselben Caches wie answer_question: exakt gleiche Anfrage, dann ähnlich formulierte Frage
+        max_tokens = min(max_tokens or 800, 25000)
+        cache_key = self._cache_key(messages, 0.5, max_tokens) if self.is_available else None
+        cached = self._cached_response(cache_key) if cache_key is not None else None
+        embedding = None
+        if cached is None:
+            embedding = self._embed_question(question)
+            if embedding is not None:
+                cached = self._lookup_similar_answer(context_key, embedding)
+        if cached is not None:
+            yield cached
+            return
+        
+        # Stückweise weitergeben und die vollständige Antwort nach dem Stream speichern
+        chunks = []
+        for chunk in self._make_request_stream(messages, temperature=0.5, max_tokens=max_tokens):
+            chunks.append(chunk)
+            yield chunk
+        answer = ''.join(chunks)
+        if not answer or answer == self._generate_fallback_report():
+            return
+        if cache_key is not None:
+            self._store_response(cache_key, answer)
+        if embedding is not None:
+            self._store_answer(context_key, embedding, answer)
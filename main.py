@@ -13,7 +13,38 @@ import json
 import time
 import numpy as np
 import os
+from pathlib import Path
+import re
+import functools
 from typing import Dict  # ⬅️ NEU HINZUGEFÜGT
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from tsdownsample import MinMaxLTTBDownsampler
+    TSDOWNSAMPLE_AVAILABLE = True
+except ImportError:
+    TSDOWNSAMPLE_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Ersatz ohne numba: gibt die Funktion unverändert zurück"""
+        def decorator(func):
+            return func
+        return decorator
+
+# Fragmente (Streamlit >= 1.33) führen bei Interaktionen nur ihren eigenen Bereich neu aus
+st_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', lambda func: func)
+
 from config import *
 from translations import get_text
 from analysis import TechnicalAnalysis
@@ -43,8 +74,9 @@ def load_settings():
     """Lädt gespeicherte Einstellungen"""
     if os.path.exists(SETTINGS_FILE):
         try:
-            with open(SETTINGS_FILE, 'r') as f:
-                return json.load(f)
+            with open(SETTINGS_FILE, 'rb') as f:
+                raw = f.read()
+            return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
         except:
             return {}
     return {}
@@ -52,58 +84,49 @@ def load_settings():
 def save_settings(settings):
     """Speichert Einstellungen in Datei"""
     try:
-        with open(SETTINGS_FILE, 'w') as f:
-            json.dump(settings, f, indent=2)
+        if ORJSON_AVAILABLE:
+            raw = orjson.dumps(settings, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        else:
+            raw = json.dumps(settings, indent=2).encode('utf-8')
+        with open(SETTINGS_FILE, 'wb') as f:
+            f.write(raw)
         return True
     except:
         return False
 
-# Lade gespeicherte Einstellungen beim Start
-saved_settings = load_settings()
+# Gespeicherte Einstellungen: Session-State-Schlüssel -> (Schlüssel in der Datei, Standardwert)
+SAVED_SETTINGS_MAP = {
+    'saved_index': ('index', 0),
+    'saved_ticker': ('ticker', '^GSPC'),
+    'saved_use_custom': ('use_custom', False),
+    'saved_interval': ('interval', '1d'),
+    'saved_use_llm': ('use_llm', True),
+    'saved_llm_temp': ('llm_temp', LLM_TEMPERATURE),
+    'saved_max_tokens': ('max_tokens', 5000),
+    'language': ('language', 'de'),
+    'show_vwap': ('show_vwap', False),
+    # Erweiterte Token-Einstellungen
+    'saved_tokens_indicators': ('tokens_indicators', 1500),
+    'saved_tokens_probabilities': ('tokens_probabilities', 1200),
+    'saved_tokens_fibonacci': ('tokens_fibonacci', 1800),
+    'saved_tokens_questions': ('tokens_questions', 800)
+}
 
-# Initialisiere Session State mit gespeicherten Werten
-if 'settings_loaded' not in st.session_state:
+def parse_saved_date(value, default):
+    """Liest ein gespeichertes ISO-Datum, bei fehlendem oder ungültigem Wert den Standard"""
+    try:
+        return datetime.fromisoformat(value).date() if value else default
+    except (TypeError, ValueError):
+        return default
+
+# Initialisiere Session State einmalig mit gespeicherten Werten (Datei nur beim ersten Lauf lesen)
+if not st.session_state.get('settings_loaded'):
     st.session_state.settings_loaded = True
-    if saved_settings:
-        st.session_state.saved_index = saved_settings.get('index', 0)
-        st.session_state.saved_ticker = saved_settings.get('ticker', '^GSPC')
-        st.session_state.saved_use_custom = saved_settings.get('use_custom', False)
-        
-        # Datumswerte laden
-        if 'start_date' in saved_settings:
-            try:
-                st.session_state.start_date = datetime.fromisoformat(saved_settings['start_date']).date()
-            except:
-                st.session_state.start_date = datetime.now().date() - timedelta(days=365)
-        if 'end_date' in saved_settings:
-            try:
-                st.session_state.end_date = datetime.fromisoformat(saved_settings['end_date']).date()
-            except:
-                st.session_state.end_date = datetime.now().date()
-                
-        st.session_state.saved_interval = saved_settings.get('interval', '1d')
-        st.session_state.saved_use_llm = saved_settings.get('use_llm', True)
-        st.session_state.saved_llm_temp = saved_settings.get('llm_temp', LLM_TEMPERATURE)
-        st.session_state.saved_max_tokens = saved_settings.get('max_tokens', 5000)
-        st.session_state.language = saved_settings.get('language', 'de')
-        st.session_state.show_vwap = saved_settings.get('show_vwap', False)
-        # Lade erweiterte Token-Einstellungen
-        st.session_state.saved_tokens_indicators = saved_settings.get('tokens_indicators', 1500)
-        st.session_state.saved_tokens_probabilities = saved_settings.get('tokens_probabilities', 1200)
-        st.session_state.saved_tokens_fibonacci = saved_settings.get('tokens_fibonacci', 1800)
-        st.session_state.saved_tokens_questions = saved_settings.get('tokens_questions', 800)
-    else:
-        # Standard-Werte wenn keine Einstellungen vorhanden
-        st.session_state.saved_index = 0
-        st.session_state.saved_ticker = '^GSPC'
-        st.session_state.saved_use_custom = False
-        st.session_state.start_date = datetime.now().date() - timedelta(days=365)
-        st.session_state.end_date = datetime.now().date()
-        st.session_state.saved_interval = '1d'
-        st.session_state.saved_use_llm = True
-        st.session_state.saved_llm_temp = LLM_TEMPERATURE
-        st.session_state.saved_max_tokens = 5000
-        st.session_state.show_vwap = False
+    saved_settings = load_settings()
+    st.session_state.update({key: saved_settings.get(name, default) for key, (name, default) in SAVED_SETTINGS_MAP.items()})
+    # Datumswerte laden
+    st.session_state.start_date = parse_saved_date(saved_settings.get('start_date'), datetime.now().date() - timedelta(days=365))
+    st.session_state.end_date = parse_saved_date(saved_settings.get('end_date'), datetime.now().date())
 
 # Seitenkonfiguration
 st.set_page_config(
@@ -176,41 +199,190 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# Session State initialisieren
-if 'analysis_data' not in st.session_state:
-    st.session_state.analysis_data = None
-if 'llm_analysis' not in st.session_state:
-    st.session_state.llm_analysis = None
-if 'candlestick_patterns' not in st.session_state:
-    st.session_state.candlestick_patterns = None
-if 'use_llm' not in st.session_state:
-    st.session_state.use_llm = True
-if 'current_interval' not in st.session_state:
-    st.session_state.current_interval = '1d'
-if 'show_vwap' not in st.session_state:
-    st.session_state.show_vwap = False
-if 'start_date' not in st.session_state:
-    st.session_state.start_date = datetime.now().date() - timedelta(days=365)
-if 'end_date' not in st.session_state:
-    st.session_state.end_date = datetime.now().date()
-# Token-Limits pro Abschnitt initialisieren
-if 'tokens_indicators' not in st.session_state:
-    st.session_state.tokens_indicators = 1500
-if 'tokens_probabilities' not in st.session_state:
-    st.session_state.tokens_probabilities = 1200
-if 'tokens_fibonacci' not in st.session_state:
-    st.session_state.tokens_fibonacci = 1800
-if 'tokens_questions' not in st.session_state:
-    st.session_state.tokens_questions = 800
+# Session State initialisieren (fehlende Schlüssel mit Standardwerten belegen)
+SESSION_DEFAULTS = {
+    'analysis_data': None,
+    'llm_analysis': None,
+    'candlestick_patterns': None,
+    'use_llm': True,
+    'current_interval': '1d',
+    'show_vwap': False,
+    # Token-Limits pro Abschnitt
+    'tokens_indicators': 1500,
+    'tokens_probabilities': 1200,
+    'tokens_fibonacci': 1800,
+    'tokens_questions': 800
+}
+for key, default in SESSION_DEFAULTS.items():
+    st.session_state.setdefault(key, default)
+
+# Index-Namen für die Auswahl (einmal beim Import)
+INDEX_LIST = list(POPULAR_INDICES)
+
+# Ergebnis-Bereiche in Anzeigereihenfolge (Übersetzungsschlüssel)
+RESULT_TABS = ['tab_overview', 'tab_charts', 'tab_indicators', 'tab_patterns', 'tab_ai_analysis']
+
+# Plotly-Konfiguration für kleine, nicht interaktive Übersichtsdiagramme (ohne Modebar und Event-Handler)
+SUMMARY_CHART_CONFIG = {'displayModeBar': False, 'staticPlot': True}
+
+# Ab dieser Kerzenanzahl wird der Candlestick-Chart auf DOWNSAMPLED_CANDLES Gruppen verdichtet
+MAX_CANDLES = 5000
+DOWNSAMPLED_CANDLES = 3000
+
+# Ab dieser Punktanzahl werden Linien-Traces mit WebGL (Scattergl) gezeichnet
+WEBGL_THRESHOLD = 2000
+
+# Intervalle, deren Datumsangaben eine Uhrzeit brauchen
+INTRADAY_INTERVALS = frozenset(['1m', '5m', '15m', '30m', '1h'])
+
+# Rangfolge und Kurzformen für die Pattern-Marker im Candlestick-Chart
+PATTERN_RELIABILITY_ORDER = {'Very High': 4, 'High': 3, 'Medium': 2, 'Low': 1}
+PATTERN_RELIABILITY_MARKERS = {'Very High': '***', 'High': '**', 'Medium': '*'}
+PATTERN_SHORT_NAMES = {
+    'Three White Soldiers': '3WS',
+    'Three Black Crows': '3BC',
+    'Bullish Engulfing': 'B.Eng',
+    'Bearish Engulfing': 'B.Eng',
+    'Morning Star': 'M.Star',
+    'Evening Star': 'E.Star',
+    'Shooting Star': 'S.Star',
+    'Hammer': 'Ham',
+    'Inverted Hammer': 'I.Ham',
+    'Hanging Man': 'H.Man',
+    'Doji': 'Doji',
+    'Spinning Top': 'Spin',
+    'Marubozu': 'Maru',
+    'Harami': 'Har',
+    'Piercing Line': 'Pierc.',
+    'Dark Cloud Cover': 'D.Cloud',
+    'Dragonfly Doji': 'D.Doji',
+    'Gravestone Doji': 'G.Doji',
+    'Long-Legged Doji': 'LL.Doji',
+    'Tweezer Top': 'Tw.Top',
+    'Tweezer Bottom': 'Tw.Bot'
+}
+
+@functools.lru_cache(maxsize=256)
+def shorten_pattern_name(pattern_name, reliability='Medium'):
+    """
+    Kürzt einen Pattern-Namen für die Chart-Marker und hängt den Zuverlässigkeits-Marker an
+    Gecacht, da sich dieselben Namen über viele Kerzen wiederholen
+    """
+    # Kürze den Namen wenn er zu lang ist
+    for long_name, short_name in PATTERN_SHORT_NAMES.items():
+        if long_name in pattern_name:
+            pattern_name = pattern_name.replace(long_name, short_name)
+            break
+    if len(pattern_name) > 8:
+        pattern_name = pattern_name[:8]
+    
+    return pattern_name + PATTERN_RELIABILITY_MARKERS.get(reliability, '')
+
+@njit(cache=True)
+def pattern_geometry(signals, indices, lows, highs):
+    """
+    Berechnet y-Position und Pfeil-Versatz der Pattern-Marker
+    signals: 1 = bullisch (unter dem Tief), -1 = bearisch (über dem Hoch), 0 = neutral (Kerzenmitte)
+    """
+    n = indices.shape[0]
+    y_positions = np.empty(n, dtype=np.float64)
+    arrow_offsets = np.empty(n, dtype=np.int64)
+    for i in range(n):
+        idx = indices[i]
+        if signals[i] == 1:
+            y_positions[i] = lows[idx] * 0.995
+            arrow_offsets[i] = 30
+        elif signals[i] == -1:
+            y_positions[i] = highs[idx] * 1.005
+            arrow_offsets[i] = -30
+        else:
+            y_positions[i] = (highs[idx] + lows[idx]) / 2
+            arrow_offsets[i] = 0
+    return y_positions, arrow_offsets
+
+# Farben der Volumenbalken nach Farb-ID (0 = fallend, 1 = steigend)
+VOLUME_COLORS = np.array(['red', 'green'])
+
+@njit(cache=True)
+def volume_color_ids(close, open_):
+    """
+    Farb-ID je Kerze für die Volumenbalken: 0 wenn Close < Open, sonst 1
+    """
+    n = close.shape[0]
+    ids = np.empty(n, dtype=np.int8)
+    for i in range(n):
+        ids[i] = 0 if close[i] < open_[i] else 1
+    return ids
+
+# Spalten, die in die Korrelations-Heatmap einfließen
+INDICATOR_COLUMN_PATTERN = re.compile(r'RSI|MACD|BB|SMA|EMA')
+
+@functools.lru_cache(maxsize=32)
+def correlation_columns(columns):
+    """Wählt die Indikator-Spalten für die Korrelations-Heatmap (gecacht pro Spalten-Tupel)"""
+    return [col for col in columns if INDICATOR_COLUMN_PATTERN.search(col)]
 
+def tail_values(series, n, dtype=np.float32):
+    """
+    Liefert die letzten n gültigen (nicht-NaN) Werte einer Serie als numpy-Array
+    Standardmäßig float32: für die Anzeige der Indikatoren genau genug, halbiert die an den Browser übertragenen Daten
+    """
+    values = series.to_numpy(dtype=np.float64)
+    return values[~np.isnan(values)][-n:].astype(dtype, copy=False)
+
+def downsample_ohlc(data_clean, max_bars=DOWNSAMPLED_CANDLES):
+    """
+    Fasst aufeinanderfolgende Kerzen zu höchstens max_bars Gruppen zusammen
+    (Open = erste, High = Maximum, Low = Minimum, Close = letzte, Volume = Summe)
+    Liefert die x-Position der ersten Kerze jeder Gruppe und die aggregierten Daten
+    """
+    bucket = -(-len(data_clean) // max_bars)
+    aggregations = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum', 'Date': 'first', 'DateStr': 'first'}
+    candles = data_clean.groupby(np.arange(len(data_clean)) // bucket).agg(
+        {col: how for col, how in aggregations.items() if col in data_clean.columns}
+    )
+    return candles.index.to_numpy() * bucket, candles
+
+def line_points(x_positions, values, max_points=DOWNSAMPLED_CANDLES):
+    """
+    Reduziert eine lange Linie per MinMaxLTTB auf max_points Punkte (Form und Extremwerte bleiben erhalten)
+    Ohne tsdownsample oder bei kurzen Linien unverändert
+    """
+    if not TSDOWNSAMPLE_AVAILABLE or len(values) <= max_points:
+        return x_positions, values
+    x = np.asarray(x_positions, dtype=np.int64)
+    keep = MinMaxLTTBDownsampler().downsample(x, values, n_out=max_points)
+    return x[keep], values[keep]
+
+def format_dates(dates, interval='1d'):
+    """
+    Formatiert eine Datumsspalte vektorisiert passend zum Intervall (Intraday mit Uhrzeit)
+    """
+    fmt = '%Y-%m-%d %H:%M' if interval in INTRADAY_INTERVALS else '%Y-%m-%d'
+    return dates.dt.strftime(fmt).to_numpy()
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def detect_candlestick_patterns(ohlc):
+    """
+    Erkennt Candlestick-Muster und berechnet deren Statistik
+    Gecacht über den Inhalt der OHLC-Daten: erneutes Analysieren mit gleichen Parametern überspringt die Erkennung
+    """
+    pattern_detector = CandlestickPatterns(ohlc)
+    return pattern_detector.detect_all_patterns(), pattern_detector.get_pattern_statistics()
+
+@st.cache_data(show_spinner=False, max_entries=8)
 def prepare_data_without_gaps(data, interval='1d'):
     """
     Entfernt Lücken (Wochenenden/Feiertage) aus den Daten für saubere Candlestick-Charts
+    Gecacht: Kerzen- und Indikator-Chart teilen sich das Ergebnis über Reruns hinweg
     """
-    # Erstelle einen neuen Index ohne Lücken
-    data_copy = data.copy()
-    data_copy['Date'] = data_copy.index
-    data_copy = data_copy.reset_index(drop=True)
+    # Erstelle einen neuen Index ohne Lücken, nur mit den Spalten, die die Charts daraus lesen
+    # (Indikatoren kommen direkt aus data, daher keine Kopie des gesamten DataFrames)
+    chart_columns = [col for col in ('Open', 'High', 'Low', 'Close', 'Volume') if col in data.columns]
+    data_copy = pd.DataFrame({col: data[col].to_numpy() for col in chart_columns}, copy=False)
+    data_copy['Date'] = data.index
+    # Datumstexte für Hover einmal hier formatieren; das Ergebnis ist gecacht und wird von allen Charts geteilt
+    data_copy['DateStr'] = format_dates(data_copy['Date'], interval)
     
     # Erstelle x-Achsen Labels für jeden n-ten Datenpunkt
     num_points = len(data_copy)
@@ -219,61 +391,57 @@ def prepare_data_without_gaps(data, interval='1d'):
     else:
         step = max(1, num_points // 10)
     
-    x_labels = []
-    x_ticks = []
-    
-    # Formatierung basierend auf Intervall
-    if interval in ['1m', '5m', '15m', '30m', '1h']:
-        # Für Minuten/Stunden-Intervalle: Zeige Datum + Uhrzeit
-        for i in range(0, num_points, step):
-            x_labels.append(data_copy['Date'].iloc[i].strftime('%d.%m %H:%M'))
-            x_ticks.append(i)
-    else:
-        # Für Tages-Intervalle und länger: Zeige nur Datum
-        for i in range(0, num_points, step):
-            x_labels.append(data_copy['Date'].iloc[i].strftime('%Y-%m-%d'))
-            x_ticks.append(i)
+    # Formatierung basierend auf Intervall: Minuten/Stunden mit Uhrzeit, sonst nur Datum
+    x_ticks = list(range(0, num_points, step))
+    label_format = '%d.%m %H:%M' if interval in INTRADAY_INTERVALS else '%Y-%m-%d'
+    x_labels = data_copy['Date'].iloc[x_ticks].dt.strftime(label_format).tolist()
     
     return data_copy, x_labels, x_ticks
 
+@st.cache_data(show_spinner=False, max_entries=4)
 def create_candlestick_chart(data, fibonacci_levels=None, support_resistance=None, patterns=None, language='de', interval='1d', show_vwap=False):
     """
     Erstellt einen separaten Candlestick-Chart für bessere Bedienung
     Mit professioneller X/Y-Achsen Skalierung wie bei Trading-Plattformen
+    Gecacht pro (Daten, Levels, Patterns, Sprache, Intervall, VWAP): Reruns ohne Änderung bauen die Figur nicht neu
     """
     # Daten ohne Lücken vorbereiten
     data_clean, x_labels, x_ticks = prepare_data_without_gaps(data, interval)
     x_range = list(range(len(data_clean)))
+    # Lange Linien per WebGL zeichnen, kurze weiter als SVG (geringerer Initialisierungsaufwand)
+    scatter = go.Scattergl if len(data_clean) > WEBGL_THRESHOLD else go.Scatter
+    # Übersetzungen der Sprache einmal auflösen
+    tr = TRANSLATIONS.get(language, TRANSLATIONS['de'])
     
-    # Candlestick Chart
-    fig = go.Figure()
-  
+    # Traces sammeln und gemeinsam in die Figur übernehmen statt einzelner add_trace-Aufrufe
+    traces = []
     
-    # Erstelle Hover-Text für jede Kerze
-    hover_texts = []
-    for i in range(len(data_clean)):
-        if interval in ['1m', '5m', '15m', '30m', '1h']:
-            date_str = data_clean['Date'].iloc[i].strftime('%Y-%m-%d %H:%M')
-        else:
-            date_str = data_clean['Date'].iloc[i].strftime('%Y-%m-%d')
-            
-        hover_text = (
-            f"Date: {date_str}<br>"
-            f"Open: {data_clean['Open'].iloc[i]:.2f}<br>"
-            f"High: {data_clean['High'].iloc[i]:.2f}<br>"
-            f"Low: {data_clean['Low'].iloc[i]:.2f}<br>"
-            f"Close: {data_clean['Close'].iloc[i]:.2f}<br>"
-            f"Volume: {data_clean['Volume'].iloc[i]:,.0f}"
-        )
-        hover_texts.append(hover_text)
+    # Bei sehr vielen Kerzen zu Gruppen zusammenfassen; Positionen bleiben auf der Original-Achse,
+    # damit Indikatoren und Pattern-Marker weiterhin passen
+    if len(data_clean) > MAX_CANDLES:
+        candle_x, candles = downsample_ohlc(data_clean)
+        line_limit = DOWNSAMPLED_CANDLES
+    else:
+        candle_x, candles = x_range, data_clean
+        line_limit = len(data_clean)
     
-    fig.add_trace(
+    # Erstelle Hover-Text für alle Kerzen auf einmal (spaltenweise statt Zeile für Zeile)
+    hover_texts = (
+        "Date: " + candles['DateStr'].to_numpy() +
+        "<br>Open: " + candles['Open'].map('{:.2f}'.format) +
+        "<br>High: " + candles['High'].map('{:.2f}'.format) +
+        "<br>Low: " + candles['Low'].map('{:.2f}'.format) +
+        "<br>Close: " + candles['Close'].map('{:.2f}'.format) +
+        "<br>Volume: " + candles['Volume'].map('{:,.0f}'.format)
+    ).tolist()
+    
+    traces.append(
         go.Candlestick(
-            x=x_range,
-            open=data_clean['Open'],
-            high=data_clean['High'],
-            low=data_clean['Low'],
-            close=data_clean['Close'],
+            x=candle_x,
+            open=candles['Open'],
+            high=candles['High'],
+            low=candles['Low'],
+            close=candles['Close'],
             name='OHLC',
             increasing_line_color=CHART_COLORS['bullish'],
             decreasing_line_color=CHART_COLORS['bearish'],
@@ -286,15 +454,15 @@ def create_candlestick_chart(data, fibonacci_levels=None, support_resistance=Non
     for period in [9, 21, 50, 200]:
         col_name = f'EMA_{period}'
         if col_name in data.columns:
-            ema_values = data[col_name].dropna()
-            if len(ema_values) > 0:
-                ema_clean = ema_values.iloc[-len(data_clean):].reset_index(drop=True)
+            ema_clean = tail_values(data[col_name], len(data_clean))
+            if len(ema_clean) > 0:
                 # Farben für verschiedene EMAs
                 colors = {9: 'orange', 21: 'yellow', 50: 'cyan', 200: 'magenta'}
-                fig.add_trace(
-                    go.Scatter(
-                        x=x_range[-len(ema_clean):],
-                        y=ema_clean,
+                ema_x, ema_y = line_points(x_range[-len(ema_clean):], ema_clean, line_limit)
+                traces.append(
+                    scatter(
+                        x=ema_x,
+                        y=ema_y,
                         name=col_name,
                         line=dict(width=1.5, color=colors.get(period, 'white')),
                         opacity=0.8
@@ -303,13 +471,13 @@ def create_candlestick_chart(data, fibonacci_levels=None, support_resistance=Non
     
     # VWAP - Volume Weighted Average Price
     if show_vwap and 'VWAP' in data.columns:
-        vwap_values = data['VWAP'].dropna()
-        if len(vwap_values) > 0:
-            vwap_clean = vwap_values.iloc[-len(data_clean):].reset_index(drop=True)
-            fig.add_trace(
-                go.Scatter(
-                    x=x_range[-len(vwap_clean):],
-                    y=vwap_clean,
+        vwap_clean = tail_values(data['VWAP'], len(data_clean))
+        if len(vwap_clean) > 0:
+            vwap_x, vwap_y = line_points(x_range[-len(vwap_clean):], vwap_clean, line_limit)
+            traces.append(
+                scatter(
+                    x=vwap_x,
+                    y=vwap_y,
                     name='VWAP',
                     line=dict(width=2, color='purple', dash='dot'),
                     opacity=0.9
@@ -318,11 +486,11 @@ def create_candlestick_chart(data, fibonacci_levels=None, support_resistance=Non
     
     # Bollinger Bands
     if 'BB_upper' in data.columns and 'BB_lower' in data.columns:
-        bb_upper = data['BB_upper'].iloc[-len(data_clean):].reset_index(drop=True)
-        bb_lower = data['BB_lower'].iloc[-len(data_clean):].reset_index(drop=True)
+        bb_upper = data['BB_upper'].to_numpy(dtype=np.float32)[-len(data_clean):]
+        bb_lower = data['BB_lower'].to_numpy(dtype=np.float32)[-len(data_clean):]
         
-        fig.add_trace(
-            go.Scatter(
+        traces.append(
+            scatter(
                 x=x_range,
                 y=bb_upper,
                 name='BB Upper',
@@ -330,8 +498,8 @@ def create_candlestick_chart(data, fibonacci_levels=None, support_resistance=Non
                 opacity=0.5
             )
         )
-        fig.add_trace(
-            go.Scatter(
+        traces.append(
+            scatter(
                 x=x_range,
                 y=bb_lower,
                 name='BB Lower',
@@ -342,118 +510,90 @@ def create_candlestick_chart(data, fibonacci_levels=None, support_resistance=Non
             )
         )
     
+    # Candlestick Chart
+    fig = go.Figure(data=traces)
+    
+    # Horizontale Linien für Fibonacci und Support/Resistance sammeln und einmal ins Layout übernehmen
+    level_shapes = []
+    level_annotations = []
+    
+    def add_level(y, color, opacity, text):
+        # Entspricht fig.add_hline mit Beschriftung oben rechts
+        level_shapes.append(dict(
+            type='line', xref='x domain', x0=0, x1=1, yref='y', y0=y, y1=y,
+            line=dict(color=color, dash='dash'), opacity=opacity
+        ))
+        level_annotations.append(dict(
+            xref='x domain', x=1, xanchor='right', yref='y', y=y, yanchor='bottom',
+            text=text, showarrow=False
+        ))
+    
     # Fibonacci Levels
     if fibonacci_levels:
         for level_name, price in fibonacci_levels.get('retracement', {}).items():
-            fig.add_hline(
-                y=price,
-                line_dash="dash",
-                line_color="yellow",
-                opacity=0.3,
-                annotation_text=f"Fib {level_name}"
-            )
+            add_level(price, 'yellow', 0.3, f"Fib {level_name}")
     
     # Support & Resistance
     if support_resistance:
+        support_label = tr.get('support', 'support')
+        resistance_label = tr.get('resistance', 'resistance')
         for support in support_resistance.get('support', []):
-            fig.add_hline(
-                y=support,
-                line_dash="dash",
-                line_color="green",
-                opacity=0.5,
-                annotation_text=get_text('support', language)
-            )
+            add_level(support, 'green', 0.5, support_label)
         for resistance in support_resistance.get('resistance', []):
-            fig.add_hline(
-                y=resistance,
-                line_dash="dash",
-                line_color="red",
-                opacity=0.5,
-                annotation_text=get_text('resistance', language)
-            )
+            add_level(resistance, 'red', 0.5, resistance_label)
+    
+    if level_shapes:
+        fig.update_layout(shapes=level_shapes, annotations=level_annotations)
     
     # Candlestick Patterns markieren - ERWEITERT
     if patterns:
-        # Gruppiere Patterns nach Index um Überlappungen zu vermeiden
-        pattern_groups = {}
-        for pattern in patterns:
-            idx = pattern.get('index', -1)
-            if idx >= 0 and idx < len(data_clean):
-                if idx not in pattern_groups:
-                    pattern_groups[idx] = []
-                pattern_groups[idx].append(pattern)
+        # Index und Zuverlässigkeit aller Patterns in einem Durchlauf als Arrays erfassen
+        pattern_indices = np.fromiter((p.get('index', -1) for p in patterns), dtype=np.int64, count=len(patterns))
+        reliabilities = np.fromiter(
+            (PATTERN_RELIABILITY_ORDER.get(p.get('reliability', 'Low'), 0) for p in patterns),
+            dtype=np.int8, count=len(patterns)
+        )
+        valid = np.flatnonzero((pattern_indices >= 0) & (pattern_indices < len(data_clean)))
+        
+        # Gruppiere nach Index; innerhalb eines Index das zuverlässigste Pattern zuerst (bei Gleichstand Originalreihenfolge)
+        order = valid[np.lexsort((valid, -reliabilities[valid], pattern_indices[valid]))]
+        unique_indices, first_positions, pattern_counts = np.unique(
+            pattern_indices[order], return_index=True, return_counts=True
+        )
         
         # Zeige die wichtigsten Patterns (max 30 für bessere Übersicht)
-        sorted_indices = sorted(pattern_groups.keys())[-30:]
+        sorted_indices = unique_indices[-30:].tolist()
+        pattern_counts = pattern_counts[-30:]
+        main_patterns = [patterns[i] for i in order[first_positions[-30:]]]
         
-        for idx in sorted_indices:
-            patterns_at_idx = pattern_groups[idx]
-            
-            # Wähle das wichtigste Pattern bei mehreren am gleichen Index
-            reliability_order = {'Very High': 4, 'High': 3, 'Medium': 2, 'Low': 1}
-            patterns_at_idx.sort(key=lambda p: reliability_order.get(p.get('reliability', 'Low'), 0), reverse=True)
-            main_pattern = patterns_at_idx[0]
-            
-            # Bestimme Farbe und Position
-            signal = main_pattern.get('signal', '')
-            if 'Bullish' in signal:
-                color = CHART_COLORS['bullish']
-                y_pos = data_clean['Low'].iloc[idx] * 0.995
-                ay = 30
-            elif 'Bearish' in signal:
-                color = CHART_COLORS['bearish']
-                y_pos = data_clean['High'].iloc[idx] * 1.005
-                ay = -30
-            else:
-                color = CHART_COLORS['neutral']
-                y_pos = (data_clean['High'].iloc[idx] + data_clean['Low'].iloc[idx]) / 2
-                ay = 0
-            
-            # Pattern Name kürzen
-            pattern_name = main_pattern.get('pattern', '')
-            short_names = {
-                'Three White Soldiers': '3WS',
-                'Three Black Crows': '3BC',
-                'Bullish Engulfing': 'B.Eng',
-                'Bearish Engulfing': 'B.Eng',
-                'Morning Star': 'M.Star',
-                'Evening Star': 'E.Star',
-                'Shooting Star': 'S.Star',
-                'Hammer': 'Ham',
-                'Inverted Hammer': 'I.Ham',
-                'Hanging Man': 'H.Man',
-                'Doji': 'Doji',
-                'Spinning Top': 'Spin',
-                'Marubozu': 'Maru',
-                'Harami': 'Har',
-                'Piercing Line': 'Pierc.',
-                'Dark Cloud Cover': 'D.Cloud',
-                'Dragonfly Doji': 'D.Doji',
-                'Gravestone Doji': 'G.Doji',
-                'Long-Legged Doji': 'LL.Doji',
-                'Tweezer Top': 'Tw.Top',
-                'Tweezer Bottom': 'Tw.Bot'
-            }
-            
-            # Kürze den Namen wenn er zu lang ist
-            for long_name, short_name in short_names.items():
-                if long_name in pattern_name:
-                    pattern_name = pattern_name.replace(long_name, short_name)
-                    break
-            if len(pattern_name) > 8:
-                pattern_name = pattern_name[:8]
+        # Farbe und Position aller Marker in einem Kernel-Aufruf bestimmen
+        signals = np.array([
+            1 if 'Bullish' in p.get('signal', '') else -1 if 'Bearish' in p.get('signal', '') else 0
+            for p in main_patterns
+        ], dtype=np.int8)
+        indices = np.array(sorted_indices, dtype=np.int64)
+        y_positions, arrow_offsets = pattern_geometry(
+            signals,
+            indices,
+            data_clean['Low'].to_numpy(dtype=np.float64),
+            data_clean['High'].to_numpy(dtype=np.float64)
+        )
+        signal_colors = {1: CHART_COLORS['bullish'], -1: CHART_COLORS['bearish'], 0: CHART_COLORS['neutral']}
+        
+        # Alle Marker sammeln und einmal ins Layout übernehmen statt einzelner add_annotation-Aufrufe
+        pattern_annotations = []
+        
+        for i, idx in enumerate(sorted_indices):
+            main_pattern = main_patterns[i]
+            color = signal_colors[int(signals[i])]
+            y_pos = float(y_positions[i])
+            ay = int(arrow_offsets[i])
             
-            # Füge Zuverlässigkeits-Marker hinzu
-            reliability = main_pattern.get('reliability', 'Medium')
-            if reliability == 'Very High':
-                pattern_name += '***'
-            elif reliability == 'High':
-                pattern_name += '**'
-            elif reliability == 'Medium':
-                pattern_name += '*'
+            # Pattern Name kürzen und Zuverlässigkeits-Marker anhängen
+            pattern_name = shorten_pattern_name(main_pattern.get('pattern', ''), main_pattern.get('reliability', 'Medium'))
             
             # Erstelle Annotation
-            fig.add_annotation(
+            pattern_annotations.append(dict(
                 x=idx,
                 y=y_pos,
                 text=pattern_name,
@@ -469,24 +609,27 @@ def create_candlestick_chart(data, fibonacci_levels=None, support_resistance=Non
                 borderwidth=1,
                 opacity=0.9,
                 font=dict(color='white', size=8, family='monospace')
-            )
+            ))
             
             # Zeige Anzahl weiterer Patterns
-            if len(patterns_at_idx) > 1:
-                fig.add_annotation(
+            if pattern_counts[i] > 1:
+                pattern_annotations.append(dict(
                     x=idx,
                     y=y_pos,
-                    text=f"+{len(patterns_at_idx)-1}",
+                    text=f"+{pattern_counts[i] - 1}",
                     showarrow=False,
                     bgcolor='rgba(255,255,255,0.3)',
                     font=dict(color='black', size=6),
                     xshift=25,
                     yshift=0
-                )
+                ))
+        
+        # Bestehende Annotationen (z.B. Support/Resistance-Beschriftungen) beibehalten
+        fig.update_layout(annotations=list(fig.layout.annotations) + pattern_annotations)
     
     # Layout mit professionellen Trading-Chart Einstellungen
     fig.update_layout(
-        title=get_text('technical_analysis', language),
+        title=tr.get('technical_analysis', 'technical_analysis'),
         template='plotly_dark',
         height=700,
         showlegend=True,
@@ -514,7 +657,7 @@ def create_candlestick_chart(data, fibonacci_levels=None, support_resistance=Non
             range=[max(0, len(x_range)-100), len(x_range)-1] if len(x_range) > 100 else None
         ),
         yaxis=dict(
-            title=get_text('price', language) if 'price' in TRANSLATIONS[language] else 'Price',
+            title=tr.get('price', 'Price'),
             side='right',
             autorange=True,
             fixedrange=False,
@@ -540,91 +683,95 @@ def create_candlestick_chart(data, fibonacci_levels=None, support_resistance=Non
     
     return fig
 
+@st.cache_data(show_spinner=False, max_entries=4)
 def create_indicator_charts(data, interval='1d', language='de'):
     """
     Erstellt separate Charts für RSI, MACD und Volumen mit korrekten Datumslabels
+    Gecacht pro (Daten, Intervall, Sprache)
     """
     # Bereite Daten mit Datum vor
     data_clean, x_labels, x_ticks = prepare_data_without_gaps(data, interval)
     x_range = list(range(len(data_clean)))
+    # Lange Linien per WebGL zeichnen, kurze weiter als SVG (geringerer Initialisierungsaufwand)
+    scatter = go.Scattergl if len(data_clean) > WEBGL_THRESHOLD else go.Scatter
+    # Übersetzungen der Sprache einmal auflösen
+    tr = TRANSLATIONS.get(language, TRANSLATIONS['de'])
+    # Datumstexte einmal formatieren, die Indikatoren verwenden jeweils das Ende davon
+    date_texts = data_clean['DateStr'].to_numpy()
+    
+    # Traces mit Zielzeile sammeln und in einem Aufruf hinzufügen
+    traces = []
+    rows = []
     
     # Erstelle Subplots für Indikatoren
     fig = make_subplots(
         rows=3, cols=1,
         shared_xaxes=True,
         vertical_spacing=0.05,
-        subplot_titles=('RSI', 'MACD', get_text('volume', language))
+        subplot_titles=('RSI', 'MACD', tr.get('volume', 'volume'))
     )
     
     # RSI
     if 'RSI' in data.columns:
-        rsi_values = data['RSI'].dropna()
-        if len(rsi_values) > 0:
-            # Passe RSI an die gleiche Länge an
-            rsi_clean = rsi_values.iloc[-len(data_clean):].reset_index(drop=True)
+        rsi_clean = tail_values(data['RSI'], len(data_clean))
+        if len(rsi_clean) > 0:
             x_range_rsi = x_range[-len(rsi_clean):]
             
-            fig.add_trace(
-                go.Scatter(
+            traces.append(
+                scatter(
                     x=x_range_rsi,
                     y=rsi_clean,
                     name='RSI',
                     line=dict(color='orange', width=2),
                     hovertemplate='RSI: %{y:.2f}<br>%{text}',
-                    text=[data_clean['Date'].iloc[i].strftime('%Y-%m-%d %H:%M' if interval in ['1m', '5m', '15m', '30m', '1h'] else '%Y-%m-%d') 
-                          for i in x_range_rsi]
-                ),
-                row=1, col=1
+                    text=date_texts[-len(x_range_rsi):]
+                )
             )
+            rows.append(1)
         fig.add_hline(y=70, line_dash="dash", line_color="red", opacity=0.3, row=1, col=1)
         fig.add_hline(y=30, line_dash="dash", line_color="green", opacity=0.3, row=1, col=1)
     
     # MACD
     if 'MACD' in data.columns:
-        macd_values = data['MACD'].dropna()
-        if len(macd_values) > 0:
-            macd_clean = macd_values.iloc[-len(data_clean):].reset_index(drop=True)
+        macd_clean = tail_values(data['MACD'], len(data_clean))
+        if len(macd_clean) > 0:
             x_range_macd = x_range[-len(macd_clean):]
             
-            fig.add_trace(
-                go.Scatter(
+            traces.append(
+                scatter(
                     x=x_range_macd,
                     y=macd_clean,
                     name='MACD',
                     line=dict(color='blue', width=2),
                     hovertemplate='MACD: %{y:.2f}<br>%{text}',
-                    text=[data_clean['Date'].iloc[i].strftime('%Y-%m-%d %H:%M' if interval in ['1m', '5m', '15m', '30m', '1h'] else '%Y-%m-%d')
-                          for i in x_range_macd]
-                ),
-                row=2, col=1
+                    text=date_texts[-len(x_range_macd):]
+                )
             )
+            rows.append(2)
             
         if 'MACD_signal' in data.columns:
-            signal_values = data['MACD_signal'].dropna()
-            if len(signal_values) > 0:
-                signal_clean = signal_values.iloc[-len(data_clean):].reset_index(drop=True)
+            signal_clean = tail_values(data['MACD_signal'], len(data_clean))
+            if len(signal_clean) > 0:
                 x_range_signal = x_range[-len(signal_clean):]
                 
-                fig.add_trace(
-                    go.Scatter(
+                traces.append(
+                    scatter(
                         x=x_range_signal,
                         y=signal_clean,
                         name='Signal',
                         line=dict(color='red', width=2),
                         hovertemplate='Signal: %{y:.2f}<br>%{text}',
-                        text=[data_clean['Date'].iloc[i].strftime('%Y-%m-%d %H:%M' if interval in ['1m', '5m', '15m', '30m', '1h'] else '%Y-%m-%d')
-                              for i in x_range_signal]
-                    ),
-                    row=2, col=1
+                        text=date_texts[-len(x_range_signal):]
+                    )
                 )
+                rows.append(2)
                 
         if 'MACD_diff' in data.columns:
-            diff_values = data['MACD_diff'].dropna()
-            if len(diff_values) > 0:
-                diff_clean = diff_values.iloc[-len(data_clean):].reset_index(drop=True)
+            diff_clean = tail_values(data['MACD_diff'], len(data_clean))
+            if len(diff_clean) > 0:
                 x_range_diff = x_range[-len(diff_clean):]
                 
-                fig.add_trace(
+                traces.append(
                     go.Bar(
                         x=x_range_diff,
                         y=diff_clean,
@@ -632,37 +779,35 @@ def create_indicator_charts(data, interval='1d', language='de'):
                         marker_color='gray',
                         opacity=0.3,
                         hovertemplate='Histogram: %{y:.2f}<br>%{text}',
-                        text=[data_clean['Date'].iloc[i].strftime('%Y-%m-%d %H:%M' if interval in ['1m', '5m', '15m', '30m', '1h'] else '%Y-%m-%d')
-                              for i in x_range_diff]
-                    ),
-                    row=2, col=1
+                        text=date_texts[-len(x_range_diff):]
+                    )
                 )
+                rows.append(2)
     
     # Volumen
     if 'Volume' in data_clean.columns and 'Close' in data_clean.columns and 'Open' in data_clean.columns:
-        colors = ['red' if data_clean['Close'].iloc[i] < data_clean['Open'].iloc[i] else 'green' 
-                  for i in range(len(data_clean))]
+        colors = VOLUME_COLORS[volume_color_ids(
+            data_clean['Close'].to_numpy(dtype=np.float64),
+            data_clean['Open'].to_numpy(dtype=np.float64)
+        )]
         
-        hover_texts = []
-        for i in range(len(data_clean)):
-            if interval in ['1m', '5m', '15m', '30m', '1h']:
-                date_str = data_clean['Date'].iloc[i].strftime('%Y-%m-%d %H:%M')
-            else:
-                date_str = data_clean['Date'].iloc[i].strftime('%Y-%m-%d')
-            hover_texts.append(f"Volume: {data_clean['Volume'].iloc[i]:,.0f}<br>{date_str}")
+        hover_texts = ("Volume: " + data_clean['Volume'].map('{:,.0f}'.format) + "<br>" + date_texts).tolist()
         
-        fig.add_trace(
+        traces.append(
             go.Bar(
                 x=x_range,
                 y=data_clean['Volume'],
-                name=get_text('volume', language),
+                name=tr.get('volume', 'volume'),
                 marker_color=colors,
                 opacity=0.5,
                 hovertemplate='%{text}',
                 text=hover_texts
-            ),
-            row=3, col=1
+            )
         )
+        rows.append(3)
+    
+    if traces:
+        fig.add_traces(traces, rows=rows, cols=[1] * len(rows))
     
     # Update layout
     fig.update_layout(
@@ -686,21 +831,114 @@ def create_indicator_charts(data, interval='1d', language='de'):
     
     return fig
 
+@st.cache_data(show_spinner=False, max_entries=8)
+def create_correlation_chart(indicators, language='de'):
+    """
+    Erstellt die Korrelations-Heatmap der Indikatoren (None, wenn zu wenige Daten)
+    Gecacht pro Indikator-Daten und Sprache, da sie sich nur mit einer neuen Analyse ändert
+    """
+    # Pearson-Korrelation direkt mit NumPy auf den vollständigen Zeilen (ohne DataFrame-Umweg)
+    values = indicators.to_numpy(dtype=np.float64)
+    has_data = ~np.isnan(values).all(axis=0)
+    values = values[:, has_data]
+    indicator_cols = [col for col, keep in zip(indicators.columns, has_data) if keep]
+    values = values[~np.isnan(values).any(axis=1)]
+    if len(indicator_cols) < 2 or len(values) < 2:
+        return None
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr_matrix = np.corrcoef(values, rowvar=False)
+    fig = go.Figure(data=go.Heatmap(
+        z=corr_matrix.astype(np.float32),
+        x=indicator_cols,
+        y=indicator_cols,
+        colorscale='RdBu',
+        zmid=0
+    ))
+    fig.update_layout(
+        template='plotly_dark',
+        height=400,
+        title=get_text('correlation_matrix', language)
+    )
+    return fig
+
+def rolling_mean(values, window):
+    """
+    Gleitender Durchschnitt als NumPy-Fensteransicht (NaN für die ersten window-1 Werte wie bei pandas rolling)
+    """
+    result = np.full(len(values), np.nan, dtype=np.float64)
+    if len(values) >= window:
+        result[window - 1:] = np.lib.stride_tricks.sliding_window_view(values, window).mean(axis=1)
+    return result
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def create_volume_chart(volume, language='de'):
+    """
+    Erstellt den Volumen-Chart mit 20-Tage-Durchschnitt
+    Gecacht pro Volumenreihe und Sprache: der Durchschnitt wird nur bei neuen Daten berechnet
+    """
+    dates = volume.index
+    values = volume.to_numpy(dtype=np.float64)
+    # An Plotly gehen float32-Arrays (halbe Nutzlast)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=dates,
+        y=rolling_mean(values, 20).astype(np.float32),
+        name=get_text('20_day_average', language),
+        line=dict(color='yellow', width=2)
+    ))
+    fig.add_trace(go.Bar(
+        x=dates,
+        y=values.astype(np.float32),
+        name=get_text('volume', language),
+        marker_color='rgba(100,100,100,0.3)'
+    ))
+    fig.update_layout(
+        template='plotly_dark',
+        height=400,
+        title=get_text('volume_trend', language, default='Volume Trend')
+    )
+    return fig
+
+# Sentiment-Übersetzungen je Zielsprache (en: Deutsch -> Englisch, de: Englisch -> Deutsch)
+SENTIMENT_TRANSLATIONS = {
+    'en': {
+        'SEHR BULLISCH': 'VERY BULLISH',
+        'BULLISCH': 'BULLISH',
+        'NEUTRAL': 'NEUTRAL',
+        'BEARISCH': 'BEARISH',
+        'SEHR BEARISCH': 'VERY BEARISH',
+        'STARK BULLISCH': 'STRONG BULLISH',
+        'STARK BEARISCH': 'STRONG BEARISH'
+    },
+    'de': {
+        'VERY BULLISH': 'SEHR BULLISCH',
+        'STRONG BULLISH': 'STARK BULLISCH',
+        'BULLISH': 'BULLISCH',
+        'NEUTRAL': 'NEUTRAL',
+        'BEARISH': 'BEARISCH',
+        'STRONG BEARISH': 'STARK BEARISCH',
+        'VERY BEARISH': 'SEHR BEARISCH'
+    }
+}
+
+# Ein vorkompiliertes Muster je Sprache, längere Phrasen zuerst (z.B. "SEHR BULLISCH" vor "BULLISCH")
+SENTIMENT_PATTERNS = {
+    lang: re.compile('|'.join(re.escape(key) for key in sorted(table, key=len, reverse=True)))
+    for lang, table in SENTIMENT_TRANSLATIONS.items()
+}
+
+# Emojis, die vom Sentiment abgetrennt und am Ende wieder angehängt werden
+SENTIMENT_EMOJIS = ('🚀', '📈', '➡️', '📉', '🔻')
+
+@functools.lru_cache(maxsize=128)
 def translate_sentiment(sentiment, language='de'):
     """
     Übersetzt Sentiment-Werte in die gewählte Sprache
     """
     # Extrahiere Emoji wenn vorhanden
-    emoji_map = {
-        '🚀': '🚀',  # Rakete
-        '📈': '📈',  # Chart up
-        '➡️': '➡️',  # Pfeil rechts
-        '📉': '📉',  # Chart down
-        '🔻': '🔻'   # Roter Pfeil nach unten
-    }
-    
     emoji = ''
-    for e in emoji_map.keys():
+    for e in SENTIMENT_EMOJIS:
         if e in sentiment:
             emoji = e
             sentiment = sentiment.replace(e, '').strip()
@@ -709,38 +947,12 @@ def translate_sentiment(sentiment, language='de'):
     # Normalisiere das Sentiment (uppercase und trimmed)
     sentiment_normalized = sentiment.strip().upper()
     
-    # Definiere Übersetzungen (beide Richtungen)
-    if language == 'en':
-        # Deutsch -> Englisch
-        translations = {
-            'SEHR BULLISCH': 'VERY BULLISH',
-            'BULLISCH': 'BULLISH',
-            'NEUTRAL': 'NEUTRAL',
-            'BEARISCH': 'BEARISH',
-            'SEHR BEARISCH': 'VERY BEARISH',
-            'STARK BULLISCH': 'STRONG BULLISH',
-            'STARK BEARISCH': 'STRONG BEARISH'
-        }
-    else:
-        # Englisch -> Deutsch (falls nötig)
-        translations = {
-            'VERY BULLISH': 'SEHR BULLISCH',
-            'STRONG BULLISH': 'STARK BULLISCH',
-            'BULLISH': 'BULLISCH',
-            'NEUTRAL': 'NEUTRAL',
-            'BEARISH': 'BEARISCH',
-            'STRONG BEARISH': 'STARK BEARISCH',
-            'VERY BEARISH': 'SEHR BEARISCH'
-        }
-    
-    # Prüfe zuerst längere Phrasen (z.B. "SEHR BULLISCH" vor "BULLISCH")
-    sorted_keys = sorted(translations.keys(), key=len, reverse=True)
-    
+    lang = 'en' if language == 'en' else 'de'
     translated = sentiment_normalized
-    for key in sorted_keys:
-        if key in sentiment_normalized:
-            translated = sentiment_normalized.replace(key, translations[key])
-            break
+    match = SENTIMENT_PATTERNS[lang].search(sentiment_normalized)
+    if match:
+        key = match.group()
+        translated = sentiment_normalized.replace(key, SENTIMENT_TRANSLATIONS[lang][key])
     
     # Füge Emoji wieder hinzu wenn vorhanden
     if emoji:
@@ -748,15 +960,33 @@ def translate_sentiment(sentiment, language='de'):
     
     return translated
 
-def display_metrics(analysis, language='de'):
+def last_bar_metrics(df):
+    """
+    Liest die Werte der letzten Kerze einmal aus den Arrays
+    (statt wiederholter iloc- und vollständiger pct_change-Aufrufe pro Rerun)
+    """
+    if df.empty:
+        return {'price': 0, 'change_1d': 0, 'volume': 0, 'high': 0, 'low': 0, 'date': 'N/A'}
+    close = df['Close'].to_numpy()
+    return {
+        'price': close[-1],
+        'change_1d': (close[-1] / close[-2] - 1) * 100 if len(close) > 1 else np.nan,
+        'volume': df['Volume'].iat[-1],
+        'high': df['High'].iat[-1],
+        'low': df['Low'].iat[-1],
+        'date': df.index[-1].strftime('%Y-%m-%d')
+    }
+
+def display_metrics(analysis, last_bar, language='de'):
     """
     Zeigt die wichtigsten Metriken in einer übersichtlichen Form
+    last_bar: bereits berechnete Werte der letzten Kerze (siehe last_bar_metrics)
     """
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        current_price = analysis.data['Close'].iloc[-1]
-        price_change = analysis.data['Close'].pct_change().iloc[-1] * 100
+        current_price = last_bar['price']
+        price_change = last_bar['change_1d']
         st.metric(
             get_text('current_price', language),
             f"${current_price:.2f}",
@@ -802,13 +1032,36 @@ def display_metrics(analysis, language='de'):
     with col4:
         if analysis.indicators.get('ATR'):
             atr_value = analysis.indicators['ATR']
-            volatility = get_text('high', language) if atr_value > analysis.data['Close'].iloc[-1] * 0.02 else get_text('normal', language)
+            volatility = get_text('high', language) if atr_value > last_bar['price'] * 0.02 else get_text('normal', language)
             st.metric(
                 get_text('volatility', language),
                 f"{atr_value:.2f}",
                 volatility
             )
 
+@st.cache_data(show_spinner=False, max_entries=16)
+def create_probability_chart(bullish_prob, neutral_prob, bearish_prob, language='de'):
+    """
+    Erstellt den gestapelten Wahrscheinlichkeits-Balken
+    Gecacht pro (Wahrscheinlichkeiten, Sprache), da er bei jedem Rerun unverändert ist
+    """
+    label = get_text('probability', language)
+    fig = go.Figure(data=[
+        go.Bar(name=get_text('bullish', language), x=[label], y=[bullish_prob],
+               marker_color=CHART_COLORS['bullish']),
+        go.Bar(name=get_text('neutral', language), x=[label], y=[neutral_prob],
+               marker_color=CHART_COLORS['neutral']),
+        go.Bar(name=get_text('bearish', language), x=[label], y=[bearish_prob],
+               marker_color=CHART_COLORS['bearish'])
+    ])
+    fig.update_layout(
+        barmode='stack',
+        template='plotly_dark',
+        height=300,
+        showlegend=True
+    )
+    return fig
+
 def display_probabilities(probabilities, targets, language='de'):
     """
     Zeigt Wahrscheinlichkeiten und Kursziele an
@@ -823,21 +1076,8 @@ def display_probabilities(probabilities, targets, language='de'):
         bearish_prob = probabilities.get('bearish_probability', 33.33)
         neutral_prob = probabilities.get('neutral_probability', 33.34)
         
-        fig = go.Figure(data=[
-            go.Bar(name=get_text('bullish', language), x=[get_text('probability', language)], y=[bullish_prob], 
-                   marker_color=CHART_COLORS['bullish']),
-            go.Bar(name=get_text('neutral', language), x=[get_text('probability', language)], y=[neutral_prob],
-                   marker_color=CHART_COLORS['neutral']),
-            go.Bar(name=get_text('bearish', language), x=[get_text('probability', language)], y=[bearish_prob],
-                   marker_color=CHART_COLORS['bearish'])
-        ])
-        fig.update_layout(
-            barmode='stack',
-            template='plotly_dark',
-            height=300,
-            showlegend=True
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        fig = create_probability_chart(bullish_prob, neutral_prob, bearish_prob, language)
+        st.plotly_chart(fig, use_container_width=True, config=SUMMARY_CHART_CONFIG)
         
         # Signal-Übersicht mit neutral und Erklärung
         total = probabilities.get('total_signals', 0)
@@ -870,15 +1110,27 @@ def display_probabilities(probabilities, targets, language='de'):
         
         # Bullische Ziele
         if targets['bullish']:
-            st.markdown(f"**{get_text('bullish_targets', language)}:**")
-            for target in targets['bullish'][:3]:
-                st.markdown(f"- {target['level']}: ${target['price']:.2f} ({target['distance']:+.2f}%)")
+            # Überschrift und Ziele als eine Nachricht ans Frontend
+            st.markdown(f"**{get_text('bullish_targets', language)}:**\n" + '\n'.join(
+                f"- {target['level']}: ${target['price']:.2f} ({target['distance']:+.2f}%)"
+                for target in targets['bullish'][:3]
+            ))
         
         # Bearische Ziele
         if targets['bearish']:
-            st.markdown(f"**{get_text('bearish_targets', language)}:**")
-            for target in targets['bearish'][:3]:
-                st.markdown(f"- {target['level']}: ${target['price']:.2f} ({target['distance']:.2f}%)")
+            st.markdown(f"**{get_text('bearish_targets', language)}:**\n" + '\n'.join(
+                f"- {target['level']}: ${target['price']:.2f} ({target['distance']:.2f}%)"
+                for target in targets['bearish'][:3]
+            ))
+
+@st.cache_resource(show_spinner=False)
+def get_llm_client():
+    """
+    Liefert einen prozessweit geteilten LLM-Client
+    Verbindungspool und Antwort-Cache bleiben so über Reruns hinweg erhalten;
+    das Embedding-Modell des semantischen Caches (LLM_SEMANTIC_CACHE) wird nur hier einmal geladen
+    """
+    return LLMClient()
 
 def display_premium_report(full_analysis: Dict, patterns_data: Dict, language: str = 'de'):
     """Zeigt den verbesserten Premium-Bericht an"""
@@ -909,6 +1161,27 @@ def display_premium_report(full_analysis: Dict, patterns_data: Dict, language: s
         st.error(f"Fehler bei der Berichterstellung: {str(e)}")
 
 
+@st.cache_data(show_spinner=False, max_entries=16)
+def create_pattern_types_chart(pattern_types, language='de'):
+    """
+    Erstellt das Balkendiagramm der Muster-Verteilung
+    Gecacht pro (Verteilung, Sprache), da es bei jedem Rerun unverändert ist
+    """
+    fig = go.Figure(data=[
+        go.Bar(
+            x=np.fromiter(pattern_types.keys(), dtype=object, count=len(pattern_types)),
+            y=np.fromiter(pattern_types.values(), dtype=np.int64, count=len(pattern_types)),
+            marker_color='rgba(0, 204, 136, 0.6)'
+        )
+    ])
+    fig.update_layout(
+        template='plotly_dark',
+        height=300,
+        xaxis_title=get_text('pattern', language),
+        yaxis_title='Count'
+    )
+    return fig
+
 def display_candlestick_patterns(patterns, statistics, language='de'):
     """
     Zeigt erkannte Candlestick-Muster an
@@ -919,39 +1192,34 @@ def display_candlestick_patterns(patterns, statistics, language='de'):
         st.info(f"Keine {get_text('patterns_found', language).lower()}")
         return
     
-    # Statistiken
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric(get_text('total_patterns', language), statistics['total_patterns'])
-    
-    with col2:
-        st.metric(get_text('bullish', language), statistics['bullish_patterns'])
-    
-    with col3:
-        st.metric(get_text('bearish', language), statistics['bearish_patterns'])
-    
-    with col4:
-        st.metric(get_text('neutral', language), statistics['neutral_patterns'])
+    # Statistiken als eine Tabellenzeile (ein Element statt vier Metriken)
+    st.dataframe(
+        pd.DataFrame({
+            get_text('total_patterns', language): [statistics['total_patterns']],
+            get_text('bullish', language): [statistics['bullish_patterns']],
+            get_text('bearish', language): [statistics['bearish_patterns']],
+            get_text('neutral', language): [statistics['neutral_patterns']]
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
     
     # Aktuelle Muster in Tabelle
     st.markdown(f"#### {get_text('recent_patterns', language)}")
     
-    pattern_df = pd.DataFrame(statistics['recent_patterns'])
-    if not pattern_df.empty:
-        # Formatiere die Tabelle
-        pattern_df['formatted_date'] = pd.to_datetime(pattern_df['date']).dt.strftime('%Y-%m-%d')
-        pattern_df['formatted_price'] = pattern_df['price'].apply(lambda x: f"${x:.2f}")
-        
-        # Zeige die Tabelle
-        display_df = pattern_df[['formatted_date', 'pattern', 'signal', 'reliability', 'formatted_price']]
-        display_df.columns = [
-            get_text('date', language) if 'date' in TRANSLATIONS[language] else 'Date',
-            get_text('pattern', language),
-            get_text('signal', language),
-            get_text('reliability', language),
-            get_text('price', language) if 'price' in TRANSLATIONS[language] else 'Price'
-        ]
+    recent_patterns = statistics['recent_patterns']
+    if recent_patterns:
+        # Formatiere die Tabelle in einem Durchgang direkt aus den benötigten Spalten
+        pattern_df = pd.DataFrame(recent_patterns, columns=['date', 'pattern', 'signal', 'reliability', 'price'])
+        display_df = pd.DataFrame({
+            get_text('date', language, default='Date'):
+                pd.to_datetime(pattern_df['date']).dt.strftime('%Y-%m-%d'),
+            get_text('pattern', language): pattern_df['pattern'],
+            get_text('signal', language): pattern_df['signal'],
+            get_text('reliability', language): pattern_df['reliability'],
+            get_text('price', language, default='Price'):
+                np.char.mod('$%.2f', pattern_df['price'].to_numpy(dtype=np.float64))
+        })
         
         st.dataframe(
             display_df,
@@ -963,26 +1231,420 @@ def display_candlestick_patterns(patterns, statistics, language='de'):
     if statistics['pattern_types']:
         st.markdown(f"#### {get_text('pattern_statistics', language)}")
         
-        fig = go.Figure(data=[
-            go.Bar(
-                x=list(statistics['pattern_types'].keys()),
-                y=list(statistics['pattern_types'].values()),
-                marker_color='rgba(0, 204, 136, 0.6)'
-            )
-        ])
-        fig.update_layout(
-            template='plotly_dark',
-            height=300,
-            xaxis_title=get_text('pattern', language),
-            yaxis_title='Count'
+        fig = create_pattern_types_chart(statistics['pattern_types'], language)
+        st.plotly_chart(fig, use_container_width=True, config=SUMMARY_CHART_CONFIG)
+
+@st_fragment
+def render_results(lang):
+    """
+    Zeigt die Analyse-Ergebnisse mit Tab-Auswahl an
+    Als Fragment: ein Tab-Wechsel führt nur diesen Bereich neu aus, nicht die Sidebar
+    """
+    data = st.session_state.analysis_data
+    # Kennzahlen der letzten Kerze einmal pro Rerun für alle Tabs
+    last_bar = last_bar_metrics(data['data'])
+    patterns_data = st.session_state.candlestick_patterns
+    
+    # Tab-Auswahl: anders als st.tabs wird nur der sichtbare Bereich ausgeführt
+    active_tab = st.radio(
+        get_text('result_view', lang),
+        options=RESULT_TABS,
+        format_func=lambda tab: get_text(tab, lang),
+        horizontal=True,
+        key='active_tab',
+        label_visibility='collapsed'
+    )
+    
+    if active_tab == 'tab_overview':
+        st.markdown(f"## {data['ticker']} Analysis")
+        if 'analysis_date' in data:
+            st.caption(f"{get_text('analysis_from', lang)}: {data['analysis_date']}")
+        
+        # Metriken anzeigen
+        analysis_obj = TechnicalAnalysis(data['ticker'])
+        analysis_obj.data = data['data']
+        analysis_obj.indicators = data['indicators']
+        analysis_obj.fibonacci_levels = data['fibonacci']
+        analysis_obj.support_resistance = data['support_resistance']
+        
+        display_metrics(analysis_obj, last_bar, lang)
+        
+        st.markdown("---")
+        
+        # Wahrscheinlichkeiten und Ziele
+        if data.get('probabilities') and data.get('targets'):
+            display_probabilities(data['probabilities'], data['targets'], lang)
+    
+    if active_tab == 'tab_charts':
+        st.markdown(f"## {get_text('tab_charts', lang)}")
+        
+        # HAUPTCHART: Separater Candlestick Chart für bessere Bedienung
+        st.markdown("📊 **Candlestick Chart**")
+        
+        # Bedienungshinweise
+        with st.expander(f"💡 {get_text('chart_controls_legend', lang)}", expanded=False):
+            if lang == 'de':
+                st.markdown("""
+                **Zoom & Navigation:**
+                - 🔍 **Zoom:** Klicken und ziehen Sie mit der Maus über den Bereich, den Sie vergrößern möchten
+                - 🌐 **X/Y-Achsen Zoom:** Ziehen Sie horizontal für Zeit-Zoom, vertikal für Preis-Zoom, diagonal für beides
+                - 🔄 **Reset:** Doppelklick auf den Chart setzt die Ansicht zurück
+                - 👆 **Pan:** Wählen Sie das Pan-Tool in der Toolbar (Handsymbol) und ziehen Sie den Chart
+                - 📏 **Range Slider:** Nutzen Sie den Slider unter dem Chart für schnelle Navigation
+                - 📅 **Zeiträume:** Nutzen Sie die Buttons (1D, 1W, 1M, etc.) für vordefinierte Zeiträume
+                - 💾 **Screenshot:** Nutzen Sie das Kamera-Symbol in der Toolbar für einen Screenshot
+                
+                **Candlestick Pattern Legende:**
+                
+                🟢 **Bullische Patterns** (Kaufsignale):
+                - **Ham** = Hammer - Umkehrsignal nach Abwärtstrend
+                - **B.Eng** = Bullish Engulfing - Starkes Kaufsignal
+                - **M.Star** = Morning Star - Sehr starkes Umkehrsignal
+                - **3WS** = Three White Soldiers - Starker Aufwärtstrend
+                - **Pierc.** = Piercing Line - Bullische Umkehr
+                
+                🔴 **Bearische Patterns** (Verkaufssignale):
+                - **H.Man** = Hanging Man - Warnung am Top
+                - **B.Eng** = Bearish Engulfing - Starkes Verkaufssignal
+                - **E.Star** = Evening Star - Sehr starkes Umkehrsignal
+                - **3BC** = Three Black Crows - Starker Abwärtstrend
+                - **S.Star** = Shooting Star - Umkehr nach oben
+                
+                🟡 **Neutrale Patterns** (Unentschlossenheit):
+                - **Doji** = Markt-Unentschlossenheit
+                - **Spin** = Spinning Top - Konsolidierung
+                - **Har** = Harami - Mögliche Trendwende
+                
+                **⭐ Zuverlässigkeitssystem:**
+                - ⭐⭐⭐ oder *** = Sehr hohe Zuverlässigkeit (Very High)
+                - ⭐⭐ oder ** = Hohe Zuverlässigkeit (High)
+                - ⭐ oder * = Mittlere Zuverlässigkeit (Medium)
+                - (kein Stern) = Niedrige Zuverlässigkeit (Low)
+                
+                **Hinweis:** Je mehr Sterne, desto verlässlicher das Signal!
+                """)
+            else:
+                st.markdown("""
+                **Zoom & Navigation:**
+                - 🔍 **Zoom:** Click and drag to zoom into a specific area
+                - 🌐 **X/Y-Axis Zoom:** Drag horizontally for time zoom, vertically for price zoom, diagonally for both
+                - 🔄 **Reset:** Double-click on chart to reset view
+                - 👆 **Pan:** Select pan tool (hand icon) and drag the chart
+                - 📏 **Range Slider:** Use slider below chart for quick navigation
+                - 📅 **Time Periods:** Use buttons (1D, 1W, 1M, etc.) for predefined periods
+                - 💾 **Screenshot:** Use camera icon in toolbar to save image
+                
+                **Candlestick Pattern Legend:**
+                
+                🟢 **Bullish Patterns** (Buy Signals):
+                - **Ham** = Hammer - Reversal signal after downtrend
+                - **B.Eng** = Bullish Engulfing - Strong buy signal
+                - **M.Star** = Morning Star - Very strong reversal signal
+                - **3WS** = Three White Soldiers - Strong uptrend
+                - **Pierc.** = Piercing Line - Bullish reversal
+                
+                🔴 **Bearish Patterns** (Sell Signals):
+                - **H.Man** = Hanging Man - Warning at top
+                - **B.Eng** = Bearish Engulfing - Strong sell signal
+                - **E.Star** = Evening Star - Very strong reversal signal
+                - **3BC** = Three Black Crows - Strong downtrend
+                - **S.Star** = Shooting Star - Reversal after uptrend
+                
+                🟡 **Neutral Patterns** (Indecision):
+                - **Doji** = Market indecision
+                - **Spin** = Spinning Top - Consolidation
+                - **Har** = Harami - Possible trend change
+                
+                **⭐ Reliability System:**
+                - ⭐⭐⭐ or *** = Very High reliability
+                - ⭐⭐ or ** = High reliability
+                - ⭐ or * = Medium reliability
+                - (no star) = Low reliability
+                
+                **Note:** More stars mean more reliable signals!
+                """)
+        
+        fig_candles = create_candlestick_chart(
+            data['data'],
+            data.get('fibonacci'),
+            data.get('support_resistance'),
+            patterns_data.get('patterns') if patterns_data else None,
+            lang,
+            data.get('interval', '1d'),  # Verwende gespeichertes Intervall
+            show_vwap=st.session_state.get('show_vwap', False)  # Übergebe VWAP-Flag
         )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig_candles, use_container_width=True)
+        
+        # INDIKATOREN: Separate Charts
+        st.markdown(f"### 📈 {get_text('technical_indicators_chart', lang)}")
+        fig_indicators = create_indicator_charts(
+            data['data'], 
+            data.get('interval', '1d'),  # Verwende gespeichertes Intervall
+            lang
+        )
+        st.plotly_chart(fig_indicators, use_container_width=True)
+        
+        # Zusätzliche Charts
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Heatmap der Korrelationen
+            st.markdown(f"### {get_text('correlation_matrix', lang)}")
+            df = data['data']
+            indicator_cols = correlation_columns(tuple(df.columns))
+            fig_corr = create_correlation_chart(df[indicator_cols], lang) if len(indicator_cols) > 1 else None
+            if fig_corr is not None:
+                st.plotly_chart(fig_corr, use_container_width=True)
+        
+        with col2:
+            # Volumen-Analyse
+            st.markdown(f"### {get_text('volume_analysis', lang)}")
+            df = data['data']
+            if 'Volume' in df.columns:
+                fig_vol = create_volume_chart(df['Volume'], lang)
+                st.plotly_chart(fig_vol, use_container_width=True)
+    
+    if active_tab == 'tab_indicators':
+        st.markdown(f"## {get_text('tab_indicators', lang)}")
+        
+        if data.get('indicators'):
+            # Indikatoren in Kategorien anzeigen
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                st.markdown(f"### {get_text('trend_indicators', lang)}")
+                if 'moving_averages' in data['indicators']:
+                    # Nur EMAs anzeigen (keine SMAs mehr)
+                    st.markdown("**Exponential Moving Averages:**")
+                    for period, value in data['indicators']['moving_averages']['ema'].items():
+                        if value:
+                            st.markdown(f"- EMA {period}: ${value:.2f}")
+                
+                if data['indicators'].get('ADX'):
+                    adx = data['indicators']['ADX']
+                    if adx.get('adx'):
+                        st.markdown(f"**ADX:** {adx['adx']:.2f}")
+                        if adx.get('di_plus'):
+                            st.markdown(f"- DI+: {adx['di_plus']:.2f}")
+                        if adx.get('di_minus'):
+                            st.markdown(f"- DI-: {adx['di_minus']:.2f}")
+            
+            with col2:
+                st.markdown(f"### {get_text('momentum_indicators', lang)}")
+                indicators_to_show = ['RSI', 'MACD', 'Stochastic', 'Williams_R', 'ROC', 'CCI']
+                for ind in indicators_to_show:
+                    if data['indicators'].get(ind):
+                        value = data['indicators'][ind]
+                        if isinstance(value, dict):
+                            st.markdown(f"**{ind}:**")
+                            for k, v in value.items():
+                                if v is not None:
+                                    st.markdown(f"- {k}: {v:.2f}")
+                        elif value is not None:
+                            st.markdown(f"**{ind}:** {value:.2f}")
+            
+            with col3:
+                st.markdown(f"### {get_text('volume_indicators', lang)}")
+                volume_indicators = ['OBV', 'VWAP', 'MFI', 'CMF']
+                for ind in volume_indicators:
+                    if data['indicators'].get(ind):
+                        value = data['indicators'][ind]
+                        if value is not None:
+                            st.markdown(f"**{ind}:** {value:.2f}")
+                
+                st.markdown(f"### {get_text('pivot_points', lang)}")
+                if data['indicators'].get('Pivots'):
+                    pivots = data['indicators']['Pivots']
+                    if pivots.get('pivot'):
+                        st.markdown(f"**Pivot:** ${pivots['pivot']:.2f}")
+                    if pivots.get('r1') and pivots.get('r2'):
+                        st.markdown(f"**{get_text('resistance', lang)}:** R1: ${pivots['r1']:.2f}, R2: ${pivots['r2']:.2f}")
+                    if pivots.get('s1') and pivots.get('s2'):
+                        st.markdown(f"**{get_text('support', lang)}:** S1: ${pivots['s1']:.2f}, S2: ${pivots['s2']:.2f}")
+        else:
+            st.info(get_text('no_indicators_calculated', lang))
+    
+    if active_tab == 'tab_patterns':
+        st.markdown(f"## {get_text('tab_patterns', lang)}")
+        
+        if patterns_data and patterns_data.get('patterns'):
+            display_candlestick_patterns(
+                patterns_data['patterns'],
+                patterns_data['statistics'],
+                lang
+            )
+        else:
+            st.info(get_text('patterns_found', lang).lower() if lang == 'de' else get_text('patterns_found', lang).capitalize())
+    
+    if active_tab == 'tab_ai_analysis':
+        st.markdown(f"## {get_text('ai_analysis', lang)}")
+        
+        if st.session_state.use_llm and LLMClient is not None:
+            try:
+                # Geteilten LLM Client holen
+                llm_client = get_llm_client()
+                
+                # Verschiedene Analysen durchführen
+                col1, col2 = st.columns([2, 1])
+                
+                with col1:
+                    with st.spinner(get_text('ai_thinking', lang)):
+                        # Hauptanalyse
+                        st.markdown(f"### {get_text('technical_analysis_ai', lang)}")
+                        
+                        # Füge Candlestick-Muster zur Analyse hinzu
+                        analysis_context = {
+                            'ticker': data['ticker'],
+                            'current_price': last_bar['price'],
+                            'price_change_1d': last_bar['change_1d'],
+                            'volume': last_bar['volume'],
+                            'sentiment': data.get('sentiment'),
+                            'candlestick_patterns': patterns_data.get('statistics') if patterns_data else None,
+                            'analysis_date': data.get('analysis_date', datetime.now().strftime('%Y-%m-%d')),
+                            'data_date': last_bar['date']
+                        }
+                        
+                        # Indikator-, Szenario- und Fibonacci/SR-Analyse parallel anfragen
+                        analyses = llm_client.analyze_all(
+                            data['indicators'],
+                            analysis_context,
+                            probabilities=data.get('probabilities'),
+                            targets=data.get('targets'),
+                            sentiment=data['sentiment'][0] if data.get('sentiment') else "Neutral",
+                            fibonacci_levels=data.get('fibonacci'),
+                            support_resistance=data.get('support_resistance'),
+                            max_tokens={
+                                'indicators': st.session_state.get('tokens_indicators', 1500),
+                                'probabilities': st.session_state.get('tokens_probabilities', 1200),
+                                'fibonacci': st.session_state.get('tokens_fibonacci', 1800)
+                            },
+                            language=lang
+                        )
+                        st.markdown(analyses['indicators'])
+                        
+                        st.markdown("---")
+                        
+                        # Wahrscheinlichkeitsanalyse
+                        if 'probabilities' in analyses:
+                            st.markdown(f"### {get_text('scenario_analysis', lang)}")
+                            st.markdown(analyses['probabilities'])
+                        
+                        st.markdown("---")
+                        
+                        # Fibonacci & Support/Resistance
+                        if 'fibonacci' in analyses:
+                            st.markdown(f"### {get_text('fibonacci_sr_analysis', lang)}")
+                            st.markdown(analyses['fibonacci'])
+                        
+                        st.markdown("---")
+                        
+                        # Umfassender Marktbericht generieren
+                        st.markdown(f"### {get_text('market_report', lang)}")
+                        
+                        # Zeige aktuelle Token-Einstellung
+                        current_max_tokens = st.session_state.get('max_tokens', 3000)
+                        st.info(f"{get_text('max_tokens_for_reports', lang)}: {current_max_tokens}")
+                        
+                        if st.button(get_text('generate_report', lang)):
+                            try:
+                                with st.spinner(get_text('generating_report', lang)):
+                                    # Vollständige Analyse für Bericht vorbereiten
+                                    full_analysis = {
+                                        'ticker': data['ticker'],
+                                        'data': data['data'],  # Vollständige Daten für Berechnungen
+                                        'current_price': last_bar['price'],
+                                        'current_metrics': {
+                                            'price': last_bar['price'],
+                                            'change_1d': last_bar['change_1d'],
+                                            'volume': last_bar['volume'],
+                                            'high': last_bar['high'],
+                                            'low': last_bar['low']
+                                        },
+                                        'indicators': data['indicators'],
+                                        'fibonacci_levels': data.get('fibonacci'),  # Korrekter Key
+                                        'support_resistance': data.get('support_resistance'),
+                                        'probabilities': data.get('probabilities'),
+                                        'price_targets': data.get('targets'),  # Korrekter Key
+                                        'sentiment': data.get('sentiment'),
+                                        'candlestick_patterns': patterns_data if patterns_data else None
+                                    }
+                                    
+                                    # Übergebe max_tokens und language an die Funktion
+                                    current_tokens = st.session_state.get('max_tokens', 5000)
+                                    report = llm_client.generate_complete_report(
+                                        full_analysis, 
+                                        max_tokens=current_tokens,
+                                        language=lang
+                                    )
+                                    
+                                    # Bericht anzeigen
+                                    st.markdown(report)
+                                    
+                                    # Speichere Bericht in Session State für Export
+                                    st.session_state.generated_report = report
+                                    st.session_state.report_ticker = data['ticker']
+                                    
+                            except Exception as e:
+                                st.error(f"Fehler bei der Berichterstellung: {str(e)}")
+                        
+                        # Export-Button wenn Bericht vorhanden
+                        if 'generated_report' in st.session_state:
+                            st.markdown("---")
+                            col1, col2, col3 = st.columns([1, 2, 1])
+                            with col2:
+                                st.download_button(
+                                    label=f"💾 {get_text('download_report', lang)}",
+                                    data=st.session_state.generated_report,
+                                    file_name=f"{st.session_state.report_ticker}_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md",
+                                    mime="text/markdown",
+                                    use_container_width=True
+                                )
+                
+                with col2:
+                    st.markdown(f"### {get_text('ask_ai', lang)}")
+                    user_question = st.text_area(
+                        label="Frage eingeben",  # Füge ein Label hinzu
+                        placeholder=get_text('question_placeholder', lang),
+                        label_visibility="collapsed"  # Verstecke das Label
+                    )
+                    
+                    if st.button(get_text('ask_question', lang)):
+                        if user_question:
+                            st.markdown(f"### {get_text('answer', lang)}:")
+                            # Antwort während der Generierung anzeigen
+                            st.write_stream(
+                                llm_client.answer_question_stream(
+                                    user_question,
+                                    {
+                                        'indicators': data['indicators'],
+                                        'probabilities': data.get('probabilities'),
+                                        'targets': data.get('targets'),
+                                        'sentiment': data.get('sentiment'),
+                                        'patterns': patterns_data if patterns_data else None
+                                    },
+                                    max_tokens=st.session_state.get('tokens_questions', 800),
+                                    language=lang
+                                )
+                            )
+            except Exception as e:
+                st.error(f"KI-Analyse Fehler: {str(e)}")
+                st.info("Stellen Sie sicher, dass das lokale LLM läuft (http://127.0.0.1:1234)")
+        elif LLMClient is None:
+            st.warning("LLM Client konnte nicht geladen werden. Bitte prüfen Sie die Installation.")
+            st.info("Installieren Sie ggf. fehlende Abhängigkeiten mit: pip install openai httpx")
+        else:
+            st.info(get_text('ai_disabled', lang))
 
 def main():
     """
     Hauptfunktion der Streamlit App
     """
     lang = st.session_state.language
+    # Datum einmal pro Durchlauf bestimmen statt in jedem Default-Ausdruck
+    today = datetime.now().date()
+    year_ago = today - timedelta(days=365)
+    # Gespeicherte Einstellungen einmal auslesen; Standardwerte kommen zentral aus SAVED_SETTINGS_MAP
+    saved = {key: st.session_state.get(key, default) for key, (_, default) in SAVED_SETTINGS_MAP.items()}
     
     # Header
     st.markdown(f"<h1>{get_text('app_title', lang)}</h1>", unsafe_allow_html=True)
@@ -1005,23 +1667,23 @@ def main():
             st.rerun()
         
         # Index Auswahl
-        index_list = list(POPULAR_INDICES.keys())
+        index_list = INDEX_LIST
         index_choice = st.selectbox(
             get_text('select_index', lang),
             options=index_list,
-            index=st.session_state.get('saved_index', 0) if st.session_state.get('saved_index', 0) < len(index_list) else 0
+            index=saved['saved_index'] if saved['saved_index'] < len(index_list) else 0
         )
         ticker_symbol = POPULAR_INDICES[index_choice]
         
         # Custom Ticker Option
         use_custom = st.checkbox(
             get_text('custom_symbol', lang),
-            value=st.session_state.get('saved_use_custom', False)
+            value=saved['saved_use_custom']
         )
         if use_custom:
             ticker_symbol = st.text_input(
                 get_text('ticker_symbol', lang), 
-                value=st.session_state.get('saved_ticker', '^GSPC')
+                value=saved['saved_ticker']
             )
         
         # Zeitraum mit Kalender-Auswahl
@@ -1033,8 +1695,8 @@ def main():
         with col_start:
             start_date = st.date_input(
                 get_text('from_date', lang),
-                value=st.session_state.get('start_date', datetime.now().date() - timedelta(days=365)),
-                max_value=datetime.now().date(),
+                value=st.session_state.get('start_date', year_ago),
+                max_value=today,
                 format="DD.MM.YYYY",
                 key="start_date_input"
             )
@@ -1043,9 +1705,9 @@ def main():
         with col_end:
             end_date = st.date_input(
                 get_text('to_date', lang),
-                value=st.session_state.get('end_date', datetime.now().date()),
+                value=st.session_state.get('end_date', today),
                 min_value=start_date,
-                max_value=datetime.now().date(),
+                max_value=today,
                 format="DD.MM.YYYY",
                 key="end_date_input"
             )
@@ -1059,18 +1721,18 @@ def main():
         col1, col2, col3 = st.columns(3)
         with col1:
             if st.button(get_text('one_week', lang), use_container_width=True):
-                start_date = datetime.now().date() - timedelta(days=7)
-                end_date = datetime.now().date()
+                start_date = today - timedelta(days=7)
+                end_date = today
                 st.rerun()
         with col2:
             if st.button(get_text('one_month', lang), use_container_width=True):
-                start_date = datetime.now().date() - timedelta(days=30)
-                end_date = datetime.now().date()
+                start_date = today - timedelta(days=30)
+                end_date = today
                 st.rerun()
         with col3:
             if st.button(get_text('one_year', lang), use_container_width=True):
-                start_date = datetime.now().date() - timedelta(days=365)
-                end_date = datetime.now().date()
+                start_date = year_ago
+                end_date = today
                 st.rerun()
         
         # Intervall
@@ -1078,8 +1740,8 @@ def main():
         interval = st.selectbox(
             get_text('interval', lang),
             options=interval_options,
-            index=interval_options.index(st.session_state.get('saved_interval', '1d'))
-                  if st.session_state.get('saved_interval', '1d') in interval_options else 5
+            index=interval_options.index(saved['saved_interval'])
+                  if saved['saved_interval'] in interval_options else 5
         )
         st.session_state.current_interval = interval  # Speichere das Intervall
         
@@ -1091,7 +1753,7 @@ def main():
         # VWAP Toggle
         show_vwap = st.checkbox(
             get_text('show_vwap', lang),
-            value=st.session_state.get('show_vwap', False),
+            value=saved['show_vwap'],
             help=get_text('vwap_help', lang)
         )
         st.session_state.show_vwap = show_vwap
@@ -1102,7 +1764,7 @@ def main():
         st.markdown(f"## {get_text('ai_settings', lang)}")
         use_llm = st.checkbox(
             get_text('enable_ai', lang), 
-            value=st.session_state.get('saved_use_llm', True)
+            value=saved['saved_use_llm']
         )
         st.session_state.use_llm = use_llm
         
@@ -1110,72 +1772,76 @@ def main():
         max_tokens = 5000
         
         if use_llm:
-            llm_temp = st.slider(
-                get_text('creativity', lang), 
-                0.0, 1.0, 
-                st.session_state.get('saved_llm_temp', LLM_TEMPERATURE), 
-                0.1
-            )
-            # Erhöhe max_tokens für vollständige Berichte - bis zu 15000
-            max_tokens = st.slider(
-                get_text('max_tokens', lang), 
-                min_value=500, 
-                max_value=25000, 
-                value=st.session_state.get('saved_max_tokens', 5000), 
-                step=500,
-                help="Erhöhen Sie diesen Wert für längere, detailliertere Berichte. Hinweis: Sehr hohe Werte (>10000) können die Generierung verlangsamen."
-            )
-            st.session_state.max_tokens = max_tokens  # Speichere in Session State
+            # Als Formular: Slider-Änderungen lösen erst beim Übernehmen einen Rerun aus
+            with st.form('llm_settings'):
+                llm_temp = st.slider(
+                    get_text('creativity', lang), 
+                    0.0, 1.0, 
+                    saved['saved_llm_temp'], 
+                    0.1
+                )
+                # Erhöhe max_tokens für vollständige Berichte - bis zu 15000
+                max_tokens = st.slider(
+                    get_text('max_tokens', lang), 
+                    min_value=500, 
+                    max_value=25000, 
+                    value=saved['saved_max_tokens'], 
+                    step=500,
+                    help="Erhöhen Sie diesen Wert für längere, detailliertere Berichte. Hinweis: Sehr hohe Werte (>10000) können die Generierung verlangsamen."
+                )
+                st.session_state.max_tokens = max_tokens  # Speichere in Session State
             
-            # Zeige Warnung bei sehr hohen Token-Werten
-            if max_tokens > 10000:
-                st.warning(f"{get_text('token_warning', lang)}. {get_text('token_warning_llm', lang)}.")
+                # Zeige Warnung bei sehr hohen Token-Werten
+                if max_tokens > 10000:
+                    st.warning(f"{get_text('token_warning', lang)}. {get_text('token_warning_llm', lang)}.")
             
-            # Erweiterte Einstellungen für Token-Limits pro Abschnitt
-            with st.expander(get_text('advanced_settings', lang), expanded=False):
-                st.markdown(f"### {get_text('section_tokens', lang)}")
-                st.caption(get_text('tokens_help', lang))
+                # Erweiterte Einstellungen für Token-Limits pro Abschnitt
+                with st.expander(get_text('advanced_settings', lang), expanded=False):
+                    st.markdown(f"### {get_text('section_tokens', lang)}")
+                    st.caption(get_text('tokens_help', lang))
                 
-                # Token-Limits für verschiedene Abschnitte
-                tokens_indicators = st.slider(
-                    get_text('tokens_indicators', lang),
-                    min_value=200,
-                    max_value=5000,
-                    value=st.session_state.get('saved_tokens_indicators', 1500),
-                    step=100,
-                    key='tokens_indicators_slider'
-                )
-                st.session_state.tokens_indicators = tokens_indicators
+                    # Token-Limits für verschiedene Abschnitte
+                    tokens_indicators = st.slider(
+                        get_text('tokens_indicators', lang),
+                        min_value=200,
+                        max_value=5000,
+                        value=saved['saved_tokens_indicators'],
+                        step=100,
+                        key='tokens_indicators_slider'
+                    )
+                    st.session_state.tokens_indicators = tokens_indicators
                 
-                tokens_probabilities = st.slider(
-                    get_text('tokens_probabilities', lang),
-                    min_value=200,
-                    max_value=5000,
-                    value=st.session_state.get('saved_tokens_probabilities', 1200),
-                    step=100,
-                    key='tokens_probabilities_slider'
-                )
-                st.session_state.tokens_probabilities = tokens_probabilities
+                    tokens_probabilities = st.slider(
+                        get_text('tokens_probabilities', lang),
+                        min_value=200,
+                        max_value=5000,
+                        value=saved['saved_tokens_probabilities'],
+                        step=100,
+                        key='tokens_probabilities_slider'
+                    )
+                    st.session_state.tokens_probabilities = tokens_probabilities
                 
-                tokens_fibonacci = st.slider(
-                    get_text('tokens_fibonacci', lang),
-                    min_value=200,
-                    max_value=5000,
-                    value=st.session_state.get('saved_tokens_fibonacci', 1800),
-                    step=100,
-                    key='tokens_fibonacci_slider'
-                )
-                st.session_state.tokens_fibonacci = tokens_fibonacci
+                    tokens_fibonacci = st.slider(
+                        get_text('tokens_fibonacci', lang),
+                        min_value=200,
+                        max_value=5000,
+                        value=saved['saved_tokens_fibonacci'],
+                        step=100,
+                        key='tokens_fibonacci_slider'
+                    )
+                    st.session_state.tokens_fibonacci = tokens_fibonacci
                 
-                tokens_questions = st.slider(
-                    get_text('tokens_questions', lang),
-                    min_value=200,
-                    max_value=3000,
-                    value=st.session_state.get('saved_tokens_questions', 800),
-                    step=100,
-                    key='tokens_questions_slider'
-                )
-                st.session_state.tokens_questions = tokens_questions
+                    tokens_questions = st.slider(
+                        get_text('tokens_questions', lang),
+                        min_value=200,
+                        max_value=3000,
+                        value=saved['saved_tokens_questions'],
+                        step=100,
+                        key='tokens_questions_slider'
+                    )
+                    st.session_state.tokens_questions = tokens_questions
+                
+                st.form_submit_button(get_text('apply_settings', lang), use_container_width=True)
         
         st.markdown("---")
         
@@ -1229,29 +1895,17 @@ def main():
         with col2:
             if st.button(get_text('reset_settings', lang), use_container_width=True):
                 # Lösche gespeicherte Einstellungen
-                if os.path.exists(SETTINGS_FILE):
-                    try:
-                        os.remove(SETTINGS_FILE)
-                        # Reset Session State
-                        st.session_state.saved_index = 0
-                        st.session_state.saved_ticker = '^GSPC'
-                        st.session_state.saved_use_custom = False
-                        st.session_state.start_date = datetime.now().date() - timedelta(days=365)
-                        st.session_state.end_date = datetime.now().date()
-                        st.session_state.saved_interval = '1d'
-                        st.session_state.saved_use_llm = True
-                        st.session_state.saved_llm_temp = LLM_TEMPERATURE
-                        st.session_state.saved_max_tokens = 5000
-                        st.session_state.show_vwap = False
-                        # Reset erweiterte Token-Einstellungen
-                        st.session_state.saved_tokens_indicators = 1500
-                        st.session_state.saved_tokens_probabilities = 1200
-                        st.session_state.saved_tokens_fibonacci = 1800
-                        st.session_state.saved_tokens_questions = 800
-                        st.success(get_text('settings_reset', lang))
-                        st.rerun()
-                    except:
-                        st.error(get_text('settings_reset_failed', lang))
+                try:
+                    Path(SETTINGS_FILE).unlink(missing_ok=True)
+                except OSError:
+                    st.error(get_text('settings_reset_failed', lang))
+                else:
+                    # Reset Session State auf die Standardwerte (Sprache bleibt erhalten)
+                    st.session_state.update({key: default for key, (_, default) in SAVED_SETTINGS_MAP.items() if key != 'language'})
+                    st.session_state.start_date = year_ago
+                    st.session_state.end_date = today
+                    st.success(get_text('settings_reset', lang))
+                    st.rerun()
         
         # Analyse Button
         analyze_button = st.button(get_text('start_analysis', lang), use_container_width=True)
@@ -1290,9 +1944,9 @@ def main():
                 analysis.identify_support_resistance()
                 
                 # Candlestick Patterns erkennen
-                pattern_detector = CandlestickPatterns(analysis.data)
-                patterns = pattern_detector.detect_all_patterns()
-                pattern_stats = pattern_detector.get_pattern_statistics()
+                patterns, pattern_stats = detect_candlestick_patterns(
+                    analysis.data[['Open', 'High', 'Low', 'Close']]
+                )
                 
                 # Wahrscheinlichkeiten und Ziele
                 probabilities = analysis.calculate_probabilities()
@@ -1301,7 +1955,7 @@ def main():
                 # Speichern in Session State
                 st.session_state.analysis_data = {
                     'ticker': ticker_symbol,
-                    'data': analysis.data.to_dict(),
+                    'data': analysis.data,  # DataFrame direkt speichern statt als dict (kein Serialisieren/Neuaufbau pro Rerun)
                     'indicators': analysis.indicators,
                     'fibonacci': analysis.fibonacci_levels,
                     'support_resistance': analysis.support_resistance,
@@ -1324,436 +1978,13 @@ def main():
                 
                 st.success(get_text('analysis_complete', lang))
             except Exception as e:
-                error_msg = get_text('analysis_error', lang) if 'analysis_error' in TRANSLATIONS[lang] else f"Error during analysis: {str(e)}"
+                error_msg = get_text('analysis_error', lang, default=f"Error during analysis: {str(e)}")
                 st.error(error_msg)
-                st.error(get_text('try_different', lang) if 'try_different' in TRANSLATIONS[lang] else "Please try a different symbol or time period.")
+                st.error(get_text('try_different', lang, default="Please try a different symbol or time period."))
     
     # Ergebnisse anzeigen
     if st.session_state.analysis_data is not None:
-        data = st.session_state.analysis_data
-        patterns_data = st.session_state.candlestick_patterns
-        
-        # Tabs erstellen
-        tab1, tab2, tab3, tab4, tab5 = st.tabs([
-            get_text('tab_overview', lang),
-            get_text('tab_charts', lang),
-            get_text('tab_indicators', lang),
-            get_text('tab_patterns', lang),
-            get_text('tab_ai_analysis', lang)
-        ])
-        
-        with tab1:
-            st.markdown(f"## {data['ticker']} Analysis")
-            if 'analysis_date' in data:
-                st.caption(f"{get_text('analysis_from', lang)}: {data['analysis_date']}")
-            
-            # Metriken anzeigen
-            analysis_obj = TechnicalAnalysis(data['ticker'])
-            analysis_obj.data = pd.DataFrame(data['data'])
-            analysis_obj.indicators = data['indicators']
-            analysis_obj.fibonacci_levels = data['fibonacci']
-            analysis_obj.support_resistance = data['support_resistance']
-            
-            display_metrics(analysis_obj, lang)
-            
-            st.markdown("---")
-            
-            # Wahrscheinlichkeiten und Ziele
-            if data.get('probabilities') and data.get('targets'):
-                display_probabilities(data['probabilities'], data['targets'], lang)
-        
-        with tab2:
-            st.markdown(f"## {get_text('tab_charts', lang)}")
-            
-            # HAUPTCHART: Separater Candlestick Chart für bessere Bedienung
-            st.markdown("📊 **Candlestick Chart**")
-            
-            # Bedienungshinweise
-            with st.expander(f"💡 {get_text('chart_controls_legend', lang)}", expanded=False):
-                if lang == 'de':
-                    st.markdown("""
-                    **Zoom & Navigation:**
-                    - 🔍 **Zoom:** Klicken und ziehen Sie mit der Maus über den Bereich, den Sie vergrößern möchten
-                    - 🌐 **X/Y-Achsen Zoom:** Ziehen Sie horizontal für Zeit-Zoom, vertikal für Preis-Zoom, diagonal für beides
-                    - 🔄 **Reset:** Doppelklick auf den Chart setzt die Ansicht zurück
-                    - 👆 **Pan:** Wählen Sie das Pan-Tool in der Toolbar (Handsymbol) und ziehen Sie den Chart
-                    - 📏 **Range Slider:** Nutzen Sie den Slider unter dem Chart für schnelle Navigation
-                    - 📅 **Zeiträume:** Nutzen Sie die Buttons (1D, 1W, 1M, etc.) für vordefinierte Zeiträume
-                    - 💾 **Screenshot:** Nutzen Sie das Kamera-Symbol in der Toolbar für einen Screenshot
-                    
-                    **Candlestick Pattern Legende:**
-                    
-                    🟢 **Bullische Patterns** (Kaufsignale):
-                    - **Ham** = Hammer - Umkehrsignal nach Abwärtstrend
-                    - **B.Eng** = Bullish Engulfing - Starkes Kaufsignal
-                    - **M.Star** = Morning Star - Sehr starkes Umkehrsignal
-                    - **3WS** = Three White Soldiers - Starker Aufwärtstrend
-                    - **Pierc.** = Piercing Line - Bullische Umkehr
-                    
-                    🔴 **Bearische Patterns** (Verkaufssignale):
-                    - **H.Man** = Hanging Man - Warnung am Top
-                    - **B.Eng** = Bearish Engulfing - Starkes Verkaufssignal
-                    - **E.Star** = Evening Star - Sehr starkes Umkehrsignal
-                    - **3BC** = Three Black Crows - Starker Abwärtstrend
-                    - **S.Star** = Shooting Star - Umkehr nach oben
-                    
-                    🟡 **Neutrale Patterns** (Unentschlossenheit):
-                    - **Doji** = Markt-Unentschlossenheit
-                    - **Spin** = Spinning Top - Konsolidierung
-                    - **Har** = Harami - Mögliche Trendwende
-                    
-                    **⭐ Zuverlässigkeitssystem:**
-                    - ⭐⭐⭐ oder *** = Sehr hohe Zuverlässigkeit (Very High)
-                    - ⭐⭐ oder ** = Hohe Zuverlässigkeit (High)
-                    - ⭐ oder * = Mittlere Zuverlässigkeit (Medium)
-                    - (kein Stern) = Niedrige Zuverlässigkeit (Low)
-                    
-                    **Hinweis:** Je mehr Sterne, desto verlässlicher das Signal!
-                    """)
-                else:
-                    st.markdown("""
-                    **Zoom & Navigation:**
-                    - 🔍 **Zoom:** Click and drag to zoom into a specific area
-                    - 🌐 **X/Y-Axis Zoom:** Drag horizontally for time zoom, vertically for price zoom, diagonally for both
-                    - 🔄 **Reset:** Double-click on chart to reset view
-                    - 👆 **Pan:** Select pan tool (hand icon) and drag the chart
-                    - 📏 **Range Slider:** Use slider below chart for quick navigation
-                    - 📅 **Time Periods:** Use buttons (1D, 1W, 1M, etc.) for predefined periods
-                    - 💾 **Screenshot:** Use camera icon in toolbar to save image
-                    
-                    **Candlestick Pattern Legend:**
-                    
-                    🟢 **Bullish Patterns** (Buy Signals):
-                    - **Ham** = Hammer - Reversal signal after downtrend
-                    - **B.Eng** = Bullish Engulfing - Strong buy signal
-                    - **M.Star** = Morning Star - Very strong reversal signal
-                    - **3WS** = Three White Soldiers - Strong uptrend
-                    - **Pierc.** = Piercing Line - Bullish reversal
-                    
-                    🔴 **Bearish Patterns** (Sell Signals):
-                    - **H.Man** = Hanging Man - Warning at top
-                    - **B.Eng** = Bearish Engulfing - Strong sell signal
-                    - **E.Star** = Evening Star - Very strong reversal signal
-                    - **3BC** = Three Black Crows - Strong downtrend
-                    - **S.Star** = Shooting Star - Reversal after uptrend
-                    
-                    🟡 **Neutral Patterns** (Indecision):
-                    - **Doji** = Market indecision
-                    - **Spin** = Spinning Top - Consolidation
-                    - **Har** = Harami - Possible trend change
-                    
-                    **⭐ Reliability System:**
-                    - ⭐⭐⭐ or *** = Very High reliability
-                    - ⭐⭐ or ** = High reliability
-                    - ⭐ or * = Medium reliability
-                    - (no star) = Low reliability
-                    
-                    **Note:** More stars mean more reliable signals!
-                    """)
-            
-            fig_candles = create_candlestick_chart(
-                pd.DataFrame(data['data']),
-                data.get('fibonacci'),
-                data.get('support_resistance'),
-                patterns_data.get('patterns') if patterns_data else None,
-                lang,
-                data.get('interval', '1d'),  # Verwende gespeichertes Intervall
-                show_vwap=st.session_state.get('show_vwap', False)  # Übergebe VWAP-Flag
-            )
-            st.plotly_chart(fig_candles, use_container_width=True)
-            
-            # INDIKATOREN: Separate Charts
-            st.markdown(f"### 📈 {get_text('technical_indicators_chart', lang)}")
-            fig_indicators = create_indicator_charts(
-                pd.DataFrame(data['data']), 
-                data.get('interval', '1d'),  # Verwende gespeichertes Intervall
-                lang
-            )
-            st.plotly_chart(fig_indicators, use_container_width=True)
-            
-            # Zusätzliche Charts
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Heatmap der Korrelationen
-                st.markdown(f"### {get_text('correlation_matrix', lang)}")
-                df = pd.DataFrame(data['data'])
-                indicator_cols = [col for col in df.columns if any(ind in col for ind in ['RSI', 'MACD', 'BB', 'SMA', 'EMA'])]
-                if len(indicator_cols) > 1:
-                    corr_matrix = df[indicator_cols].corr()
-                    fig_corr = go.Figure(data=go.Heatmap(
-                        z=corr_matrix.values,
-                        x=corr_matrix.columns,
-                        y=corr_matrix.columns,
-                        colorscale='RdBu',
-                        zmid=0
-                    ))
-                    fig_corr.update_layout(
-                        template='plotly_dark',
-                        height=400,
-                        title=get_text('correlation_matrix', lang)
-                    )
-                    st.plotly_chart(fig_corr, use_container_width=True)
-            
-            with col2:
-                # Volumen-Analyse
-                st.markdown(f"### {get_text('volume_analysis', lang)}")
-                df = pd.DataFrame(data['data'])
-                if 'Volume' in df.columns:
-                    fig_vol = go.Figure()
-                    fig_vol.add_trace(go.Scatter(
-                        x=df.index,
-                        y=df['Volume'].rolling(window=20).mean(),
-                        name=get_text('20_day_average', lang),
-                        line=dict(color='yellow', width=2)
-                    ))
-                    fig_vol.add_trace(go.Bar(
-                        x=df.index,
-                        y=df['Volume'],
-                        name=get_text('volume', lang),
-                        marker_color='rgba(100,100,100,0.3)'
-                    ))
-                    fig_vol.update_layout(
-                        template='plotly_dark',
-                        height=400,
-                        title=get_text('volume_trend', lang) if 'volume_trend' in TRANSLATIONS[lang] else 'Volume Trend'
-                    )
-                    st.plotly_chart(fig_vol, use_container_width=True)
-        
-        with tab3:
-            st.markdown(f"## {get_text('tab_indicators', lang)}")
-            
-            if data.get('indicators'):
-                # Indikatoren in Kategorien anzeigen
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    st.markdown(f"### {get_text('trend_indicators', lang)}")
-                    if 'moving_averages' in data['indicators']:
-                        # Nur EMAs anzeigen (keine SMAs mehr)
-                        st.markdown("**Exponential Moving Averages:**")
-                        for period, value in data['indicators']['moving_averages']['ema'].items():
-                            if value:
-                                st.markdown(f"- EMA {period}: ${value:.2f}")
-                    
-                    if data['indicators'].get('ADX'):
-                        adx = data['indicators']['ADX']
-                        if adx.get('adx'):
-                            st.markdown(f"**ADX:** {adx['adx']:.2f}")
-                            if adx.get('di_plus'):
-                                st.markdown(f"- DI+: {adx['di_plus']:.2f}")
-                            if adx.get('di_minus'):
-                                st.markdown(f"- DI-: {adx['di_minus']:.2f}")
-                
-                with col2:
-                    st.markdown(f"### {get_text('momentum_indicators', lang)}")
-                    indicators_to_show = ['RSI', 'MACD', 'Stochastic', 'Williams_R', 'ROC', 'CCI']
-                    for ind in indicators_to_show:
-                        if data['indicators'].get(ind):
-                            value = data['indicators'][ind]
-                            if isinstance(value, dict):
-                                st.markdown(f"**{ind}:**")
-                                for k, v in value.items():
-                                    if v is not None:
-                                        st.markdown(f"- {k}: {v:.2f}")
-                            elif value is not None:
-                                st.markdown(f"**{ind}:** {value:.2f}")
-                
-                with col3:
-                    st.markdown(f"### {get_text('volume_indicators', lang)}")
-                    volume_indicators = ['OBV', 'VWAP', 'MFI', 'CMF']
-                    for ind in volume_indicators:
-                        if data['indicators'].get(ind):
-                            value = data['indicators'][ind]
-                            if value is not None:
-                                st.markdown(f"**{ind}:** {value:.2f}")
-                    
-                    st.markdown(f"### {get_text('pivot_points', lang)}")
-                    if data['indicators'].get('Pivots'):
-                        pivots = data['indicators']['Pivots']
-                        if pivots.get('pivot'):
-                            st.markdown(f"**Pivot:** ${pivots['pivot']:.2f}")
-                        if pivots.get('r1') and pivots.get('r2'):
-                            st.markdown(f"**{get_text('resistance', lang)}:** R1: ${pivots['r1']:.2f}, R2: ${pivots['r2']:.2f}")
-                        if pivots.get('s1') and pivots.get('s2'):
-                            st.markdown(f"**{get_text('support', lang)}:** S1: ${pivots['s1']:.2f}, S2: ${pivots['s2']:.2f}")
-            else:
-                st.info(get_text('no_indicators_calculated', lang))
-        
-        with tab4:
-            st.markdown(f"## {get_text('tab_patterns', lang)}")
-            
-            if patterns_data and patterns_data.get('patterns'):
-                display_candlestick_patterns(
-                    patterns_data['patterns'],
-                    patterns_data['statistics'],
-                    lang
-                )
-            else:
-                st.info(get_text('patterns_found', lang).lower() if lang == 'de' else get_text('patterns_found', lang).capitalize())
-        
-        with tab5:
-            st.markdown(f"## {get_text('ai_analysis', lang)}")
-            
-            if st.session_state.use_llm and LLMClient is not None:
-                try:
-                    # LLM Client initialisieren
-                    llm_client = LLMClient()
-                    
-                    # Verschiedene Analysen durchführen
-                    col1, col2 = st.columns([2, 1])
-                    
-                    with col1:
-                        with st.spinner(get_text('ai_thinking', lang)):
-                            # Hauptanalyse
-                            st.markdown(f"### {get_text('technical_analysis_ai', lang)}")
-                            
-                            # Füge Candlestick-Muster zur Analyse hinzu
-                            df_data = pd.DataFrame(data['data'])
-                            analysis_context = {
-                                'ticker': data['ticker'],
-                                'current_price': df_data['Close'].iloc[-1] if not df_data.empty else 0,
-                                'price_change_1d': df_data['Close'].pct_change().iloc[-1] * 100 if not df_data.empty else 0,
-                                'volume': df_data['Volume'].iloc[-1] if not df_data.empty else 0,
-                                'sentiment': data.get('sentiment'),
-                                'candlestick_patterns': patterns_data.get('statistics') if patterns_data else None,
-                                'analysis_date': data.get('analysis_date', datetime.now().strftime('%Y-%m-%d')),
-                                'data_date': df_data.index[-1].strftime('%Y-%m-%d') if not df_data.empty else 'N/A'
-                            }
-                            
-                            main_analysis = llm_client.analyze_indicators(
-                                data['indicators'],
-                                analysis_context,
-                                max_tokens=st.session_state.get('tokens_indicators', 1500),
-                                language=lang
-                            )
-                            st.markdown(main_analysis)
-                            
-                            st.markdown("---")
-                            
-                            # Wahrscheinlichkeitsanalyse
-                            if data.get('probabilities') and data.get('targets'):
-                                st.markdown(f"### {get_text('scenario_analysis', lang)}")
-                                prob_analysis = llm_client.analyze_probabilities(
-                                    data['probabilities'],
-                                    data['targets'],
-                                    data['sentiment'][0] if data.get('sentiment') else "Neutral",
-                                    max_tokens=st.session_state.get('tokens_probabilities', 1200),
-                                    language=lang
-                                )
-                                st.markdown(prob_analysis)
-                            
-                            st.markdown("---")
-                            
-                            # Fibonacci & Support/Resistance
-                            if data.get('fibonacci') or data.get('support_resistance'):
-                                st.markdown(f"### {get_text('fibonacci_sr_analysis', lang)}")
-                                fib_analysis = llm_client.analyze_fibonacci_support_resistance(
-                                    data.get('fibonacci', {}),
-                                    data.get('support_resistance', {}),
-                                    max_tokens=st.session_state.get('tokens_fibonacci', 1800),
-                                    language=lang
-                                )
-                                st.markdown(fib_analysis)
-                            
-                            st.markdown("---")
-                            
-                            # Umfassender Marktbericht generieren
-                            st.markdown(f"### {get_text('market_report', lang)}")
-                            
-                            # Zeige aktuelle Token-Einstellung
-                            current_max_tokens = st.session_state.get('max_tokens', 3000)
-                            st.info(f"{get_text('max_tokens_for_reports', lang)}: {current_max_tokens}")
-                            
-                            if st.button(get_text('generate_report', lang)):
-                                try:
-                                    with st.spinner(get_text('generating_report', lang)):
-                                        # Vollständige Analyse für Bericht vorbereiten
-                                        df_data = pd.DataFrame(data['data'])
-                                        full_analysis = {
-                                            'ticker': data['ticker'],
-                                            'data': data['data'],  # Vollständige Daten für Berechnungen
-                                            'current_price': df_data['Close'].iloc[-1] if not df_data.empty else 0,
-                                            'current_metrics': {
-                                                'price': df_data['Close'].iloc[-1] if not df_data.empty else 0,
-                                                'change_1d': df_data['Close'].pct_change().iloc[-1] * 100 if not df_data.empty else 0,
-                                                'volume': df_data['Volume'].iloc[-1] if not df_data.empty else 0,
-                                                'high': df_data['High'].iloc[-1] if not df_data.empty else 0,
-                                                'low': df_data['Low'].iloc[-1] if not df_data.empty else 0
-                                            },
-                                            'indicators': data['indicators'],
-                                            'fibonacci_levels': data.get('fibonacci'),  # Korrekter Key
-                                            'support_resistance': data.get('support_resistance'),
-                                            'probabilities': data.get('probabilities'),
-                                            'price_targets': data.get('targets'),  # Korrekter Key
-                                            'sentiment': data.get('sentiment'),
-                                            'candlestick_patterns': patterns_data if patterns_data else None
-                                        }
-                                        
-                                        # Übergebe max_tokens und language an die Funktion
-                                        current_tokens = st.session_state.get('max_tokens', 5000)
-                                        report = llm_client.generate_complete_report(
-                                            full_analysis, 
-                                            max_tokens=current_tokens,
-                                            language=lang
-                                        )
-                                        
-                                        # Bericht anzeigen
-                                        st.markdown(report)
-                                        
-                                        # Speichere Bericht in Session State für Export
-                                        st.session_state.generated_report = report
-                                        st.session_state.report_ticker = data['ticker']
-                                        
-                                except Exception as e:
-                                    st.error(f"Fehler bei der Berichterstellung: {str(e)}")
-                            
-                            # Export-Button wenn Bericht vorhanden
-                            if 'generated_report' in st.session_state:
-                                st.markdown("---")
-                                col1, col2, col3 = st.columns([1, 2, 1])
-                                with col2:
-                                    st.download_button(
-                                        label=f"💾 {get_text('download_report', lang)}",
-                                        data=st.session_state.generated_report,
-                                        file_name=f"{st.session_state.report_ticker}_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md",
-                                        mime="text/markdown",
-                                        use_container_width=True
-                                    )
-                    
-                    with col2:
-                        st.markdown(f"### {get_text('ask_ai', lang)}")
-                        user_question = st.text_area(
-                            label="Frage eingeben",  # Füge ein Label hinzu
-                            placeholder=get_text('question_placeholder', lang),
-                            label_visibility="collapsed"  # Verstecke das Label
-                        )
-                        
-                        if st.button(get_text('ask_question', lang)):
-                            if user_question:
-                                with st.spinner(get_text('ai_thinking', lang)):
-                                    answer = llm_client.answer_question(
-                                        user_question,
-                                        {
-                                            'indicators': data['indicators'],
-                                            'probabilities': data.get('probabilities'),
-                                            'targets': data.get('targets'),
-                                            'sentiment': data.get('sentiment'),
-                                            'patterns': patterns_data if patterns_data else None
-                                        },
-                                        max_tokens=st.session_state.get('tokens_questions', 800),
-                                        language=lang
-                                    )
-                                    st.markdown(f"### {get_text('answer', lang)}:")
-                                    st.markdown(answer)
-                except Exception as e:
-                    st.error(f"KI-Analyse Fehler: {str(e)}")
-                    st.info("Stellen Sie sicher, dass das lokale LLM läuft (http://127.0.0.1:1234)")
-            elif LLMClient is None:
-                st.warning("LLM Client konnte nicht geladen werden. Bitte prüfen Sie die Installation.")
-                st.info("Installieren Sie ggf. fehlende Abhängigkeiten mit: pip install openai httpx")
-            else:
-                st.info(get_text('ai_disabled', lang))
+        render_results(lang)
     else:
         # Zeige Willkommensnachricht wenn keine Daten vorhanden
         st.info(f"👈 {get_text('start_analysis', lang)}")
@@ -2,6 +2,8 @@
 Language translations for the Index Analyser
 """
 
+from functools import lru_cache
+
 TRANSLATIONS = {
     'de': {
         # Main UI
@@ -45,6 +47,7 @@ TRANSLATIONS = {
         'start_analysis': '🔍 Analyse starten',
         'language': '🌐 Sprache',
         'save_settings': '💾 Einstellungen speichern',
+        'apply_settings': '✅ Übernehmen',
         'reset_settings': '🔄 Einstellungen zurücksetzen',
         'settings_saved': '✓ Einstellungen gespeichert!',
         'settings_reset': '✓ Einstellungen zurückgesetzt!',
@@ -59,6 +62,7 @@ TRANSLATIONS = {
         'generating_report': '📝 Generiere professionellen Marktbericht...',
         
         # Tabs
+        'result_view': 'Ansicht',
         'tab_overview': '📊 Übersicht',
         'tab_charts': '📈 Charts',
         'tab_indicators': '🔍 Indikatoren',
@@ -212,6 +216,7 @@ TRANSLATIONS = {
         'start_analysis': '🔍 Start Analysis',
         'language': '🌐 Language',
         'save_settings': '💾 Save Settings',
+        'apply_settings': '✅ Apply',
         'reset_settings': '🔄 Reset Settings',
         'settings_saved': '✓ Settings saved!',
         'settings_reset': '✓ Settings reset!',
@@ -226,6 +231,7 @@ TRANSLATIONS = {
         'generating_report': '📝 Generating professional market report...',
         
         # Tabs
+        'result_view': 'View',
         'tab_overview': '📊 Overview',
         'tab_charts': '📈 Charts',
         'tab_indicators': '🔍 Indicators',
@@ -338,18 +344,20 @@ TRANSLATIONS = {
     }
 }
 
-def get_text(key: str, lang: str = 'de') -> str:
+@lru_cache(maxsize=4096)
+def get_text(key: str, lang: str = 'de', default: str = None) -> str:
     """
     Gibt den übersetzten Text für einen Schlüssel zurück
     
     Args:
         key: Der Übersetzungsschlüssel
         lang: Die Sprache ('de' oder 'en')
+        default: Ersatztext wenn der Schlüssel fehlt (Standard: der Schlüssel selbst)
     
     Returns:
-        Der übersetzte Text oder der Schlüssel wenn nicht gefunden
+        Der übersetzte Text oder der Ersatztext wenn nicht gefunden
     """
     if lang not in TRANSLATIONS:
         lang = 'de'
     
-    return TRANSLATIONS[lang].get(key, key)
+    return TRANSLATIONS[lang].get(key, key if default is None else default)